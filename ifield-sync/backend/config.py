@@ -5,6 +5,19 @@ from typing import List
 class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./ifield_sync.db"
+    database_profile: str = "auto"  # "auto", "sqlite", "postgresql" or "default" (see engine_profiles.py)
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # bytes
+    sqlite_cache_size: int = -64 * 1024  # negative = KiB
+    sqlite_busy_timeout: int = 5000  # ms
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # seconds
+    db_pool_recycle: int = 1800  # seconds
+    db_pool_pre_ping: bool = True
+    postgres_statement_timeout: int = 30000  # ms, 0 = no limit
+    postgres_prepare_threshold: int = 5  # psycopg 3 only, 0 = never prepare
 
     # Email Configuration
     smtp_host: str = "smtp.gmail.com"
@@ -1,13 +1,12 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 from config import settings
+from engine_profiles import create_profiled_engine
 
-# Create database engine
-engine = create_engine(
-    settings.database_url, connect_args={"check_same_thread": False}
-)
+# Create database engine (tuned by settings.database_profile)
+engine = create_profiled_engine(settings.database_url)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
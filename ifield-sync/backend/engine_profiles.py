@@ -0,0 +1,72 @@
+"""Database engine profiles, selected by settings.database_profile.
+
+- "sqlite": WAL journal (readers don't block the writer), synchronous=NORMAL,
+  mmap_size, cache_size and busy_timeout on every new connection
+- "postgresql": sized QueuePool with pre-ping, statement_timeout and
+  server-side prepared statements (psycopg 3 only, postgresql+psycopg://)
+- "default": SQLAlchemy defaults
+- "auto" (default): picked from the database URL
+"""
+from typing import Dict, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from config import settings
+
+PROFILES = ["auto", "default", "sqlite", "postgresql"]
+
+
+def resolve_profile(database_url: str, profile: Optional[str] = None) -> str:
+    """Profile name for database_url"""
+    profile = profile or settings.database_profile
+    if profile not in PROFILES:
+        raise ValueError(f"database_profile must be one of: {', '.join(PROFILES)}")
+    backend = make_url(database_url).get_backend_name()
+    if profile == "auto":
+        return backend if backend in ("sqlite", "postgresql") else "default"
+    if profile != "default" and profile != backend:
+        raise ValueError(f"database_profile {profile!r} does not apply to a {backend} database")
+    return profile
+
+
+def engine_options(database_url: str, profile: Optional[str] = None) -> Dict:
+    """Keyword arguments for create_engine under the profile"""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+    if resolve_profile(database_url, profile) != "postgresql":
+        return {}
+
+    connect_args = {}
+    if settings.postgres_statement_timeout:
+        connect_args["options"] = f"-c statement_timeout={settings.postgres_statement_timeout}"
+    if url.get_driver_name() == "psycopg":
+        connect_args["prepare_threshold"] = settings.postgres_prepare_threshold or None
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+def create_profiled_engine(database_url: str, profile: Optional[str] = None) -> Engine:
+    """create_engine(database_url) tuned by the profile"""
+    engine = create_engine(database_url, **engine_options(database_url, profile))
+    if resolve_profile(database_url, profile) == "sqlite":
+        pragmas = [
+            ("journal_mode", settings.sqlite_journal_mode),
+            ("synchronous", settings.sqlite_synchronous),
+            ("mmap_size", settings.sqlite_mmap_size),
+            ("cache_size", settings.sqlite_cache_size),
+            ("busy_timeout", settings.sqlite_busy_timeout),
+        ]
+
+        @event.listens_for(engine, "connect")
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+    return engine
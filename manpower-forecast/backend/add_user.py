@@ -7,22 +7,15 @@ Usage:
 You will be prompted for email, password, and role interactively.
 """
 import getpass
-import bcrypt
 from database import SessionLocal, engine
 import models
+import services.principal_cache  # Committed user changes invalidate cached logins in the API workers
+from services.passwords import hash_password
 
 # Create tables if they don't exist
 models.Base.metadata.create_all(bind=engine)
 
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return bcrypt.hashpw(
-        password.encode('utf-8'),
-        bcrypt.gensalt()
-    ).decode('utf-8')
-
-
 def add_user():
     """Add a new user to the database."""
     print("\n" + "=" * 50)
@@ -0,0 +1,51 @@
+"""Add phase_daily_load table
+
+Revision ID: d4e5f6g7h8i9
+Revises: c3d4e5f6g7h8
+Create Date: 2026-10-17 09:00:00.000000
+
+Run `python rebuild_daily_load.py` after upgrading to populate the table
+for existing schedules (until then FORECAST_SOURCE=materialized falls back
+to the live engine).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6g7h8i9'
+down_revision: Union[str, None] = 'c3d4e5f6g7h8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('phase_daily_load',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('phase_id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('crew_type_id', sa.Integer(), nullable=True),
+        sa.Column('work_date', sa.Date(), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('man_hours_cents', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['phase_id'], ['schedule_phases.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_phase_daily_load_id'), 'phase_daily_load', ['id'], unique=False)
+    op.create_index(op.f('ix_phase_daily_load_phase_id'), 'phase_daily_load', ['phase_id'], unique=False)
+    op.create_index(op.f('ix_phase_daily_load_project_id'), 'phase_daily_load', ['project_id'], unique=False)
+    op.create_index(op.f('ix_phase_daily_load_crew_type_id'), 'phase_daily_load', ['crew_type_id'], unique=False)
+    op.create_index(op.f('ix_phase_daily_load_work_date'), 'phase_daily_load', ['work_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_phase_daily_load_work_date'), table_name='phase_daily_load')
+    op.drop_index(op.f('ix_phase_daily_load_crew_type_id'), table_name='phase_daily_load')
+    op.drop_index(op.f('ix_phase_daily_load_project_id'), table_name='phase_daily_load')
+    op.drop_index(op.f('ix_phase_daily_load_phase_id'), table_name='phase_daily_load')
+    op.drop_index(op.f('ix_phase_daily_load_id'), table_name='phase_daily_load')
+    op.drop_table('phase_daily_load')
@@ -0,0 +1,34 @@
+"""Add calendar_days table
+
+Revision ID: e5f6g7h8i9j0
+Revises: d4e5f6g7h8i9
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6g7h8i9j0'
+down_revision: Union[str, None] = 'd4e5f6g7h8i9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('calendar_days',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('ordinal', sa.Integer(), nullable=False),
+        sa.Column('is_working_day', sa.Integer(), nullable=False),
+        sa.Column('working_day_index', sa.Integer(), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.PrimaryKeyConstraint('day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('calendar_days')
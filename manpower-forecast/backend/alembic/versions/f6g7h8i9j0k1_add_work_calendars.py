@@ -0,0 +1,91 @@
+"""Add work calendars and holidays, key calendar_days by calendar
+
+Revision ID: f6g7h8i9j0k1
+Revises: e5f6g7h8i9j0
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6g7h8i9j0k1'
+down_revision: Union[str, None] = 'e5f6g7h8i9j0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('work_calendars',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('weekmask', sa.String(length=7), nullable=False, server_default='1111100'),
+        sa.Column('include_company_holidays', sa.Boolean(), nullable=True, server_default=sa.true()),
+        sa.Column('is_default', sa.Boolean(), nullable=True, server_default=sa.false()),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_work_calendars_id'), 'work_calendars', ['id'], unique=False)
+
+    op.create_table('calendar_holidays',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('calendar_id', sa.Integer(), nullable=True),
+        sa.Column('holiday_date', sa.Date(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['calendar_id'], ['work_calendars.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_calendar_holidays_id'), 'calendar_holidays', ['id'], unique=False)
+    op.create_index(op.f('ix_calendar_holidays_calendar_id'), 'calendar_holidays', ['calendar_id'], unique=False)
+    op.create_index(op.f('ix_calendar_holidays_holiday_date'), 'calendar_holidays', ['holiday_date'], unique=False)
+
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.add_column(sa.Column('work_calendar_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_projects_work_calendar_id', 'work_calendars', ['work_calendar_id'], ['id'], ondelete='SET NULL'
+        )
+        batch_op.create_index(op.f('ix_projects_work_calendar_id'), ['work_calendar_id'], unique=False)
+
+    # calendar_days is derived data: recreate it keyed by (calendar_id, day)
+    op.drop_table('calendar_days')
+    op.create_table('calendar_days',
+        sa.Column('calendar_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('ordinal', sa.Integer(), nullable=False),
+        sa.Column('is_working_day', sa.Integer(), nullable=False),
+        sa.Column('working_day_index', sa.Integer(), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.PrimaryKeyConstraint('calendar_id', 'day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('calendar_days')
+    op.create_table('calendar_days',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('ordinal', sa.Integer(), nullable=False),
+        sa.Column('is_working_day', sa.Integer(), nullable=False),
+        sa.Column('working_day_index', sa.Integer(), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.PrimaryKeyConstraint('day')
+    )
+
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_index(op.f('ix_projects_work_calendar_id'))
+        batch_op.drop_constraint('fk_projects_work_calendar_id', type_='foreignkey')
+        batch_op.drop_column('work_calendar_id')
+
+    op.drop_index(op.f('ix_calendar_holidays_holiday_date'), table_name='calendar_holidays')
+    op.drop_index(op.f('ix_calendar_holidays_calendar_id'), table_name='calendar_holidays')
+    op.drop_index(op.f('ix_calendar_holidays_id'), table_name='calendar_holidays')
+    op.drop_table('calendar_holidays')
+    op.drop_index(op.f('ix_work_calendars_id'), table_name='work_calendars')
+    op.drop_table('work_calendars')
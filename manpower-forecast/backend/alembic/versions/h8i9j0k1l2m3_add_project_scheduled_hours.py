@@ -0,0 +1,30 @@
+"""Add scheduled_hours to projects
+
+Revision ID: h8i9j0k1l2m3
+Revises: g7h8i9j0k1l2
+Create Date: 2026-10-17 15:00:00.000000
+
+Run `python backfill_scheduled_hours.py` after upgrading to populate the
+column for existing projects.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'h8i9j0k1l2m3'
+down_revision: Union[str, None] = 'g7h8i9j0k1l2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('scheduled_hours', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_column('scheduled_hours')
@@ -3,20 +3,24 @@ from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
-import bcrypt
 from pydantic import BaseModel
 
-from database import get_db
+from database import get_async_db
 from config import settings
 from constants import TOKEN_EXPIRE_MINUTES, UserRole
+import crud_async
 import models
+import logger
+from services.principal_cache import Principal, principal_cache
+from services.passwords import PasswordQueueTimeout, check_password, hash_password, password_hasher
 
 # Configuration
 SECRET_KEY = settings.secret_key
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = TOKEN_EXPIRE_MINUTES
+LOGIN_RETRY_AFTER_SECONDS = 2  # Retry-After sent with 503 when every hashing thread is busy
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
@@ -54,28 +58,44 @@ class UserCreate(BaseModel):
 
 # Helper functions
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash."""
-    return bcrypt.checkpw(
-        plain_password.encode('utf-8'),
-        hashed_password.encode('utf-8')
-    )
+    """Verify a password against a hash (blocking; async endpoints use password_hasher)."""
+    return check_password(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    return bcrypt.hashpw(
-        password.encode('utf-8'),
-        bcrypt.gensalt()
-    ).decode('utf-8')
+    """Hash a password (blocking; async endpoints use password_hasher)."""
+    return hash_password(password)
+
+
+def _hashing_busy(e: PasswordQueueTimeout) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": str(LOGIN_RETRY_AFTER_SECONDS)}
+    )
+
 
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[models.User]:
+    """
+    Authenticate a user by email and password.
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[models.User]:
-    """Authenticate a user by email and password."""
-    user = db.query(models.User).filter(models.User.email == email).first()
+    The bcrypt check runs on the password hashing pool; a password stored
+    with another work factor than settings.bcrypt_rounds is re-hashed.
+    """
+    user = await crud_async.get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
-        return None
+    try:
+        if not await password_hasher.verify(password, user.hashed_password):
+            return None
+    except PasswordQueueTimeout as e:
+        raise _hashing_busy(e)
+    if password_hasher.needs_rehash(user.hashed_password):
+        try:
+            await crud_async.update_password_hash(db, user, await password_hasher.hash(password))
+        except Exception as e:
+            # The login stands; the password is re-hashed at a later login
+            logger.warning(f"Could not re-hash password of {user.email}: {e}")
     return user
 
 
@@ -93,9 +113,19 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> models.User:
-    """Get the current authenticated user from token."""
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """
+    Get the current authenticated user from token.
+
+    Served from the principal cache when the token was seen recently (no
+    JWT decode, no SQL); otherwise the user is loaded and cached.
+    """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    generation = principal_cache.generation
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -110,15 +140,17 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
+    user = await crud_async.get_user_by_email(db, token_data.email)
     if user is None:
         raise credentials_exception
-    return user
+    principal = Principal.from_user(user, payload)
+    principal_cache.put(token, principal, generation)
+    return principal
 
 
 async def get_current_active_user(
-    current_user: models.User = Depends(get_current_user)
-) -> models.User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Get the current active user."""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -129,10 +161,10 @@ async def get_current_active_user(
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login endpoint - returns JWT token."""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -148,7 +180,7 @@ async def login_for_access_token(
 
 @router.get("/me", response_model=UserOut)
 async def read_users_me(
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Get current logged-in user info."""
     return current_user
@@ -157,12 +189,12 @@ async def read_users_me(
 @router.post("/users", response_model=UserOut)
 async def create_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Create a new user (requires admin role)."""
     # Only admins can create users
-    if getattr(current_user, 'role', UserRole.VIEWER) != UserRole.ADMIN:
+    if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required to create users"
@@ -176,7 +208,7 @@ async def create_user(
         )
 
     # Check if email already exists
-    existing = db.query(models.User).filter(models.User.email == user_data.email).first()
+    existing = await crud_async.get_user_by_email(db, user_data.email)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -184,28 +216,29 @@ async def create_user(
         )
 
     # Create new user
+    try:
+        hashed_password = await password_hasher.hash(user_data.password)
+    except PasswordQueueTimeout as e:
+        raise _hashing_busy(e)
     new_user = models.User(
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=hashed_password,
         full_name=user_data.full_name,
         role=user_data.role or UserRole.VIEWER,
         is_active=True
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    return await crud_async.create_user(db, new_user)
 
 
 @router.get("/users", response_model=list[UserOut])
 async def list_users(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """List all users (requires admin role)."""
-    if getattr(current_user, 'role', UserRole.VIEWER) != UserRole.ADMIN:
+    if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required to list users"
         )
-    return db.query(models.User).all()
+    return await crud_async.get_users(db)
@@ -3,26 +3,49 @@ Professional Construction Schedule PDF Export
 Generates GC-style Gantt chart PDFs matching industry standard construction schedules
 """
 
-from fastapi import APIRouter, Depends, Query, Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
-from datetime import date, datetime, timedelta
-from typing import Optional, List
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import date, datetime
+from functools import lru_cache
+from typing import BinaryIO, Callable, Iterator, Optional, List, Tuple, Union
 import io
+import json
+import time
+import tempfile
+from config import settings
+from constants import RenderJobKind, RenderJobStatus
 from database import get_db
 from api.auth import get_current_active_user
-import crud
+from services.principal_cache import Principal
+from api.subcontractor_reports import VALID_SUBCONTRACTORS, parse_subcontractor_names
+from api.projects import etag_matches
 import models
+import schemas
+from services.work_calendar import CalendarSet, STANDARD_CALENDARS, load_calendars
+from services.render_jobs import RenderJobQueue, RenderQueueFull
+from services.pdf_cache import pdf_cache, pdf_cache_key
+from services.export import iter_file, iter_zip
+from services import gantt_layout, subcontractor_report, subcontractor_utilization, text_layout
+from services.subcontractor_utilization import DEFAULT_HORIZON_WEEKS, MAX_HORIZON_WEEKS
 
 from reportlab.lib.pagesizes import letter, landscape
 from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor, white
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
 import math
 import os
 
 router = APIRouter(prefix="/api/export", tags=["export"])
 
+LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'frontend', 'bfpe_logo.png')
+MAX_JOB_WAIT_SECONDS = 30  # Longest long-poll on GET /jobs/{id}
+RETRY_AFTER_SECONDS = 5  # Retry-After sent with 429 when the render queue is full
+
 # Professional color scheme matching GC schedules
 COLORS = {
     'header_bg': HexColor('#1a365d'),          # Dark blue header
@@ -44,12 +67,26 @@ COLORS = {
 }
 
 
+@lru_cache(maxsize=4)
+def load_logo(logo_path: Optional[str] = LOGO_PATH) -> Optional[ImageReader]:
+    """Logo image, read once per process (None if missing or unreadable)."""
+    if not logo_path or not os.path.exists(logo_path):
+        return None
+    try:
+        logo = ImageReader(logo_path)
+        logo.getSize()
+        return logo
+    except Exception:
+        return None
+
+
 class GanttChartPDF:
     """Professional GC-style Gantt Chart PDF Generator"""
 
-    def __init__(self, page_size=landscape(letter)):
+    def __init__(self, page_size=landscape(letter), output: Optional[BinaryIO] = None):
         self.page_size = page_size
         self.width, self.height = page_size
+        self.output = output  # File to write (default: an in-memory buffer)
         self.margin_left = 0.5 * inch
         self.margin_right = 0.5 * inch
         self.margin_top = 0.6 * inch
@@ -67,6 +104,7 @@ class GanttChartPDF:
             'finish': 0.7 * inch,
         }
         self.show_bfpe = False  # Will be set in generate()
+        self.as_of = datetime.now()  # Run date and today-line (set in generate())
         self._update_table_width()
 
     def _update_table_width(self):
@@ -82,27 +120,28 @@ class GanttChartPDF:
         # Row configuration
         self.row_height = 18
 
-        self.buffer = io.BytesIO()
-        self.canvas = canvas.Canvas(self.buffer, pagesize=self.page_size)
+        self.buffer = self.output if self.output is not None else io.BytesIO()
+        # Invariant: no creation timestamp or random document ID, so equal inputs give equal bytes
+        self.canvas = canvas.Canvas(self.buffer, pagesize=self.page_size, invariant=True, pageCompression=1)
         self.page_number = 0
         self.total_pages = 1
 
     def draw_header(self, project_name: str, run_date: str, logo_path: str = None,
                      subcontractor_name: str = None):
-        """Draw the page header with project info and logo"""
+        """Draw the page header with project info and logo (page numbers: draw_page_info)"""
         c = self.canvas
         y = self.height - self.margin_top + 20
 
         # Draw logo if available
         logo_width = 0
-        if logo_path and os.path.exists(logo_path):
+        logo = load_logo(logo_path)
+        if logo is not None:
             try:
                 logo_height = 30
-                img = ImageReader(logo_path)
-                img_width, img_height = img.getSize()
+                img_width, img_height = logo.getSize()
                 aspect = img_width / img_height
                 logo_width = logo_height * aspect
-                c.drawImage(logo_path, self.margin_left, y - 15,
+                c.drawImage(logo, self.margin_left, y - 15,
                            width=logo_width, height=logo_height, preserveAspectRatio=True)
                 logo_width += 10  # Add spacing after logo
             except Exception:
@@ -114,23 +153,19 @@ class GanttChartPDF:
         c.drawString(self.margin_left + logo_width, y, project_name)
 
         # Subcontractor/Company name box (yellow highlight)
-        title_width = c.stringWidth(project_name, "Helvetica-Bold", 14)
+        title_width = text_layout.string_width(project_name, "Helvetica-Bold", 14)
         box_x = self.margin_left + logo_width + title_width + 10
         display_name = subcontractor_name if subcontractor_name else "BFPE"
         c.setFillColor(HexColor('#fef08a'))  # Yellow background
-        name_width = c.stringWidth(display_name, "Helvetica-Bold", 12) + 16
+        name_width = text_layout.string_width(display_name, "Helvetica-Bold", 12) + 16
         c.rect(box_x, y - 5, name_width, 20, fill=1, stroke=0)
         c.setFillColor(COLORS['text_primary'])
         c.setFont("Helvetica-Bold", 12)
         c.drawString(box_x + 8, y, display_name)
 
-        # Page info on the right
+        # Run date on the right, under the page info
         c.setFont("Helvetica", 9)
         c.setFillColor(COLORS['text_secondary'])
-        page_info = f"Page {self.page_number} of {self.total_pages}"
-        c.drawRightString(self.width - self.margin_right, y, page_info)
-
-        # Run date
         c.drawRightString(self.width - self.margin_right, y - 12, f"Run Date {run_date}")
 
         # Horizontal line under header
@@ -138,8 +173,58 @@ class GanttChartPDF:
         c.setLineWidth(1)
         c.line(self.margin_left, y - 20, self.width - self.margin_right, y - 20)
 
-    def draw_column_headers(self, y_pos: float, min_date: date, max_date: date):
-        """Draw two-tier header: column labels + year/month timeline"""
+    def draw_page_info(self):
+        """Draw "Page N of M" in the header (the only per-page part of it)"""
+        c = self.canvas
+        c.setFont("Helvetica", 9)
+        c.setFillColor(COLORS['text_secondary'])
+        page_info = f"Page {self.page_number} of {self.total_pages}"
+        c.drawRightString(self.width - self.margin_right, self.height - self.margin_top + 20, page_info)
+
+    def timeline_geometry(self, min_date: date, max_date: date) -> dict:
+        """
+        x positions of the timeline, computed once per document.
+
+        Returns a dict with total_days, years [(year, x_start, x_end)],
+        months [(month_start, x_start, x_end)], month_lines [(x, month number)]
+        for the grid and today_x (None when today is outside the range).
+        """
+        total_days = (max_date - min_date).days
+        if total_days <= 0:
+            total_days = 30
+        gantt_right = self.gantt_start_x + self.gantt_width
+
+        def x_at(day: date) -> float:
+            return self.gantt_start_x + ((day - min_date).days / total_days) * self.gantt_width
+
+        years = []
+        for year_val in range(min_date.year, max_date.year + 1):
+            x_start = max(x_at(max(date(year_val, 1, 1), min_date)), self.gantt_start_x)
+            x_end = min(x_at(min(date(year_val, 12, 31), max_date)), gantt_right)
+            years.append((year_val, x_start, x_end))
+
+        months = []
+        month_lines = []
+        current = date(min_date.year, min_date.month, 1)
+        while current <= max_date:
+            next_month = date(current.year + 1, 1, 1) if current.month == 12 else date(current.year, current.month + 1, 1)
+            x_start = x_at(current)
+            months.append((current, max(x_start, self.gantt_start_x), min(x_at(min(next_month, max_date)), gantt_right)))
+            if current >= min_date and self.gantt_start_x <= x_start <= gantt_right:
+                month_lines.append((x_start, current.month))
+            current = next_month
+
+        today = self.as_of.date()
+        return {
+            'total_days': total_days,
+            'years': years,
+            'months': months,
+            'month_lines': month_lines,
+            'today_x': x_at(today) if min_date <= today <= max_date else None,
+        }
+
+    def draw_column_headers(self, y_pos: float, timeline: dict):
+        """Draw two-tier header: column labels + year/month timeline (see timeline_geometry)"""
         c = self.canvas
         year_row_height = 18
         month_row_height = 14
@@ -180,30 +265,13 @@ class GanttChartPDF:
             x += width
 
         # === Two-tier Gantt timeline ===
-        total_days = (max_date - min_date).days
-        if total_days <= 0:
-            total_days = 30
-
         gantt_right = self.gantt_start_x + self.gantt_width
         year_top = y_pos
         year_bottom = y_pos - year_row_height
         month_bottom = year_bottom - month_row_height
 
         # --- Top tier: Year labels (dark background, white text) ---
-        years = []
-        yr = min_date.year
-        while yr <= max_date.year:
-            display_start = max(date(yr, 1, 1), min_date)
-            display_end = min(date(yr, 12, 31), max_date)
-            years.append((yr, display_start, display_end))
-            yr += 1
-
-        for year_val, y_start_date, y_end_date in years:
-            x_start = self.gantt_start_x + ((y_start_date - min_date).days / total_days) * self.gantt_width
-            x_end = self.gantt_start_x + ((y_end_date - min_date).days / total_days) * self.gantt_width
-            x_start = max(x_start, self.gantt_start_x)
-            x_end = min(x_end, gantt_right)
-
+        for year_val, x_start, x_end in timeline['years']:
             # Alternating year backgrounds
             c.setFillColor(COLORS['header_bg'] if year_val % 2 == 0 else HexColor('#1e3a5f'))
             c.rect(x_start, year_bottom, x_end - x_start, year_row_height, fill=1, stroke=0)
@@ -211,7 +279,7 @@ class GanttChartPDF:
             # Year label
             c.setFillColor(COLORS['header_text'])
             c.setFont("Helvetica-Bold", 10)
-            label_w = c.stringWidth(str(year_val), "Helvetica-Bold", 10)
+            label_w = text_layout.string_width(str(year_val), "Helvetica-Bold", 10)
             if x_end - x_start > label_w + 4:
                 c.drawString((x_start + x_end) / 2 - label_w / 2, year_bottom + 5, str(year_val))
 
@@ -225,23 +293,10 @@ class GanttChartPDF:
         c.setFillColor(HexColor('#edf2f7'))  # Light gray background
         c.rect(self.gantt_start_x, month_bottom, self.gantt_width, month_row_height, fill=1, stroke=0)
 
-        # Generate months
-        months = []
-        current = date(min_date.year, min_date.month, 1)
-        while current <= max_date:
-            next_month = date(current.year + 1, 1, 1) if current.month == 12 else date(current.year, current.month + 1, 1)
-            if current >= min_date or (current.month == min_date.month and current.year == min_date.year):
-                months.append((current, next_month))
-            current = next_month
-
         month_labels_short = ['J', 'F', 'M', 'A', 'M', 'J', 'J', 'A', 'S', 'O', 'N', 'D']
         month_labels_long = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
-        for month_start, month_end in months:
-            x_start = self.gantt_start_x + ((month_start - min_date).days / total_days) * self.gantt_width
-            x_end = self.gantt_start_x + ((min(month_end, max_date) - min_date).days / total_days) * self.gantt_width
-            x_start = max(x_start, self.gantt_start_x)
-            x_end = min(x_end, gantt_right)
+        for month_start, x_start, x_end in timeline['months']:
             cell_width = x_end - x_start
 
             # Draw month cell divider
@@ -267,7 +322,7 @@ class GanttChartPDF:
                 label = month_labels_short[month_start.month - 1]
             else:
                 continue
-            label_w = c.stringWidth(label, c._fontname, 7)
+            label_w = text_layout.string_width(label, c._fontname, 7)
             c.drawString(x_start + (cell_width - label_w) / 2, month_bottom + 3, label)
 
         # Horizontal line between year and month tiers
@@ -320,27 +375,19 @@ class GanttChartPDF:
         available_width = col_width - 8  # Usable width after padding
 
         # Build list of tags for this project
-        tags = []
-        if activity.get('is_aws'):
-            tags.append(('AWS', '#7c3aed'))   # Purple
-        if activity.get('is_mechanical'):
-            tags.append(('M', '#2563eb'))      # Blue
-        if activity.get('is_electrical'):
-            tags.append(('E', '#d97706'))      # Amber
-        if activity.get('is_vesda'):
-            tags.append(('V', '#db2777'))      # Pink
+        tags = [(label, color) for flag, label, color in gantt_layout.TRADE_TAGS if activity.get(flag)]
 
         # Calculate total pixel width needed for all tags
         tag_total_width = 0
         if tags:
             for tag_text, _ in tags:
-                tag_total_width += c.stringWidth(tag_text, "Helvetica-Bold", 5) + 6
+                tag_total_width += text_layout.string_width(tag_text, "Helvetica-Bold", 5) + 6
             tag_total_width += 1  # Initial gap before first tag
 
         def draw_tags(tag_x, tag_y):
             """Draw small colored tag badges"""
             for tag_text, tag_color in tags:
-                tag_w = c.stringWidth(tag_text, "Helvetica-Bold", 5) + 4
+                tag_w = text_layout.string_width(tag_text, "Helvetica-Bold", 5) + 4
                 c.setFillColor(HexColor(tag_color))
                 c.roundRect(tag_x, tag_y - 1, tag_w, 8, 2, fill=1, stroke=0)
                 c.setFillColor(white)
@@ -348,15 +395,7 @@ class GanttChartPDF:
                 c.drawString(tag_x + 2, tag_y + 0.5, tag_text)
                 tag_x += tag_w + 2
 
-        def truncate_to_fit(text, font, size, max_w):
-            """Truncate text with '..' to fit within max_w pixels"""
-            if c.stringWidth(text, font, size) <= max_w:
-                return text
-            while len(text) > 1 and c.stringWidth(text + '..', font, size) > max_w:
-                text = text[:-1]
-            return text + '..'
-
-        name_w = c.stringWidth(name, name_font, 8)
+        name_w = text_layout.string_width(name, name_font, 8)
 
         if name_w + tag_total_width <= available_width:
             # Case 1: Name + tags fit on a single line
@@ -372,23 +411,14 @@ class GanttChartPDF:
         else:
             # Case 3: Name needs wrapping to two lines, tags after line 2
             font_size = 7
-            words = name.split()
-            line1 = ""
-            line2_words = []
-            for word in words:
-                test = (line1 + " " + word) if line1 else word
-                if c.stringWidth(test, name_font, font_size) <= available_width:
-                    line1 = test
-                else:
-                    line2_words.append(word)
-            line2 = " ".join(line2_words)
+            line1, line2 = text_layout.wrap_two_lines(name, name_font, font_size, available_width)
 
             # Truncate line2 to leave room for tags
             if tags and line2:
                 max_line2_w = available_width - tag_total_width - 3
-                line2 = truncate_to_fit(line2, name_font, font_size, max(max_line2_w, 20))
+                line2 = text_layout.truncate(line2, name_font, font_size, max(max_line2_w, 20))
             elif line2:
-                line2 = truncate_to_fit(line2, name_font, font_size, available_width)
+                line2 = text_layout.truncate(line2, name_font, font_size, available_width)
 
             c.setFont(name_font, font_size)
             c.drawString(x, text_y + 4, line1)
@@ -396,10 +426,10 @@ class GanttChartPDF:
                 c.drawString(x, text_y - 4, line2)
             if tags:
                 if line2:
-                    tag_start_x = x + c.stringWidth(line2, name_font, font_size) + 3
+                    tag_start_x = x + text_layout.string_width(line2, name_font, font_size) + 3
                     draw_tags(tag_start_x, text_y - 4)
                 else:
-                    tag_start_x = x + c.stringWidth(line1, name_font, font_size) + 3
+                    tag_start_x = x + text_layout.string_width(line1, name_font, font_size) + 3
                     draw_tags(tag_start_x, text_y + 4)
 
         c.setFont("Helvetica", 8)  # Reset font
@@ -436,7 +466,7 @@ class GanttChartPDF:
                 proj_start = activity.get('start_date')
                 # Use parentheses for prospective OR active projects that haven't started yet
                 use_parens = (proj_status == 'prospective' or
-                             (proj_status == 'active' and proj_start and proj_start > date.today()))
+                             (proj_status == 'active' and proj_start and proj_start > self.as_of.date()))
 
                 # Try parentheses format first: "Name (5)"
                 match = re.match(r'^(.+?)\s*\((\d+)\)$', sub_text)
@@ -654,9 +684,9 @@ class GanttChartPDF:
 
         # Tag legends
         x += 110
-        tag_legends = [('AWS', '#7c3aed'), ('M', '#2563eb'), ('E', '#d97706'), ('V', '#db2777')]
+        tag_legends = [(label, color) for _, label, color in gantt_layout.TRADE_TAGS]
         for tag_text, tag_color in tag_legends:
-            tag_w = c.stringWidth(tag_text, "Helvetica-Bold", 6) + 4
+            tag_w = text_layout.string_width(tag_text, "Helvetica-Bold", 6) + 4
             c.setFillColor(HexColor(tag_color))
             c.roundRect(x, y + 1, tag_w, 8, 2, fill=1, stroke=0)
             c.setFillColor(white)
@@ -679,128 +709,60 @@ class GanttChartPDF:
         c.setFillColor(COLORS['text_secondary'])
         c.drawCentredString(self.width / 2, y, "BFPE International - Project Schedule")
 
-    def generate(self, projects: list, phases: list,
+    def generate(self, projects: list, phases: Optional[list] = None,
                  project_name: str = "Project Schedule",
                  company_name: str = "",
                  subcontractor_filter: str = None,
-                 project_subcontractors: dict = None):
+                 project_subcontractors: dict = None,
+                 as_of: Optional[datetime] = None,
+                 spans: Optional[dict] = None):
         """Generate the complete PDF
 
         Args:
-            projects: List of project objects
-            phases: List of phase objects
+            projects: List of project dicts (see gantt_layout.gantt_project)
+            phases: List of {'project_id', 'start_date', 'end_date'} dicts (when spans is not given)
             project_name: Title for the PDF
             company_name: Company name
             subcontractor_filter: Name of subcontractor being filtered (for header)
             project_subcontractors: Dict mapping project_id to list of {name, headcount} dicts
+            as_of: Run date and today-line (default now)
+            spans: Dict mapping project_id to (first phase start, last phase end) (see gantt_layout)
         """
-        if project_subcontractors is None:
-            project_subcontractors = {}
-
-        # Sort projects alphabetically by name
-        projects = sorted(projects, key=lambda p: p.name.lower())
+        if as_of is not None:
+            self.as_of = as_of
 
         # Show BFPE columns only on full company report (no subcontractor filter)
         self.show_bfpe = (subcontractor_filter is None)
         self._update_table_width()
 
-        # Prepare activity data
-        activities = []
-        all_dates = []
-
-        for project in projects:
-            # Add project as summary
-            project_phases = [p for p in phases if p.schedule.project_id == project.id]
-
-            if project_phases:
-                project_start = min(p.start_date for p in project_phases if p.start_date)
-                project_end = max(p.end_date for p in project_phases if p.end_date)
-            else:
-                project_start = project.start_date
-                project_end = project.end_date
-
-            # Get subcontractor info for this project, separated by labor type
-            subs_info = project_subcontractors.get(project.id, [])
-
-            # Build separate sub info for each labor type
-            sprinkler_subs = [s for s in subs_info if s.get('labor_type') == 'sprinkler']
-            vesda_subs = [s for s in subs_info if s.get('labor_type') == 'vesda']
-            electrical_subs = [s for s in subs_info if s.get('labor_type') == 'electrical']
-
-            # Format: "Name (HC)" for prospective or not-yet-started active, "Name HC" for active on-site
-            def format_sub(subs, project_status, project_start_date):
-                if not subs:
-                    return ''
-                # Use parentheses for prospective OR active projects that haven't started yet
-                use_parens = (project_status == 'prospective' or
-                             (project_status == 'active' and project_start_date and project_start_date > date.today()))
-                parts = []
-                for s in subs:
-                    name = s['name']
-                    hc = s.get('headcount', 0)
-                    if hc:
-                        if use_parens:
-                            parts.append(f"{name} ({hc})")  # Parentheses for future manpower
-                        else:
-                            parts.append(f"{name} {hc}")    # Plain number for active on-site
-                    else:
-                        parts.append(name)
-                return ', '.join(parts)
-
-            sprinkler_sub = format_sub(sprinkler_subs, project.status, project_start)
-            vesda_sub = format_sub(vesda_subs, project.status, project_start)
-            electrical_sub = format_sub(electrical_subs, project.status, project_start)
-
-            # Only add project-level row with single Gantt bar
-            if project_start and project_end:
-                # For prospective projects, append manpower estimate to name
-                display_name = project.name
-                req_manpower = getattr(project, 'required_manpower', 0) or 0
-                if project.status == 'prospective' and req_manpower > 0:
-                    display_name = f"{project.name} ({req_manpower})"
-
-                activities.append({
-                    'activity_id': f'PROJ-{project.id}',
-                    'name': display_name,
-                    'project_number': project.project_number,
-                    'project_status': project.status,  # For headcount formatting
-                    'bfpe_sprinkler_headcount': getattr(project, 'bfpe_sprinkler_headcount', 0) or 0,
-                    'bfpe_vesda_headcount': getattr(project, 'bfpe_vesda_headcount', 0) or 0,
-                    'bfpe_electrical_headcount': getattr(project, 'bfpe_electrical_headcount', 0) or 0,
-                    'sprinkler_sub': sprinkler_sub,
-                    'vesda_sub': vesda_sub,
-                    'electrical_sub': electrical_sub,
-                    'duration': (project_end - project_start).days,
-                    'start_date': project_start,
-                    'end_date': project_end,
-                    'bar_type': 'remaining',
-                    'indent_level': 0,
-                    'is_summary': False,
-                    'is_aws': getattr(project, 'is_aws', False) or False,
-                    'is_mechanical': getattr(project, 'is_mechanical', False) or False,
-                    'is_electrical': getattr(project, 'is_electrical', False) or False,
-                    'is_vesda': getattr(project, 'is_vesda', False) or False,
-                    'is_out_of_town': getattr(project, 'is_out_of_town', False) or False,
-                })
-                all_dates.extend([project_start, project_end])
-
-        if not all_dates:
-            all_dates = [date.today(), date.today() + timedelta(days=30)]
-
-        min_date = min(all_dates)
-        max_date = max(all_dates)
-
-        # Add buffer to date range
-        date_buffer = timedelta(days=7)
-        min_date = min_date - date_buffer
-        max_date = max_date + date_buffer
+        # One row per project, sorted by name (shared with GET /api/gantt)
+        if spans is None:
+            spans = gantt_layout.phase_spans(phases or [])
+        activities = gantt_layout.build_rows(projects, spans, project_subcontractors, self.as_of.date())
+        min_date, max_date = gantt_layout.timeline_range(activities, self.as_of.date())
 
         # Calculate pagination
         usable_height = self.height - self.margin_top - self.margin_bottom - 95  # Header + legend space
         rows_per_page = int(usable_height / self.row_height)
         self.total_pages = max(1, math.ceil(len(activities) / rows_per_page))
 
-        run_date = datetime.now().strftime('%d-%b-%y %H:%M')
+        run_date = self.as_of.strftime('%d-%b-%y %H:%M')
+        timeline = self.timeline_geometry(min_date, max_date)
+
+        # Page furniture is drawn once as form XObjects and referenced by every page
+        c = self.canvas
+        c.beginForm('gantt_page_header')
+        # Header with logo and subcontractor name, then unified column headers with timeline
+        self.draw_header(project_name, run_date, LOGO_PATH, subcontractor_filter)
+        rows_top = self.draw_column_headers(self.height - self.margin_top - 25, timeline)
+        c.endForm()
+
+        c.beginForm('gantt_page_footer')
+        self.draw_legend(self.margin_bottom + 20)
+        self.draw_footer()
+        c.endForm()
+
+        grid_forms = set()
 
         # Generate pages
         activity_index = 0
@@ -808,27 +770,21 @@ class GanttChartPDF:
             self.page_number = page + 1
 
             if page > 0:
-                self.canvas.showPage()
-
-            # Get logo path
-            logo_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                                    'frontend', 'bfpe_logo.png')
-
-            # Draw header with logo and subcontractor name
-            self.draw_header(project_name, run_date, logo_path, subcontractor_filter)
-
-            # Starting Y position
-            y_pos = self.height - self.margin_top - 25
-
-            # Draw unified column headers with timeline
-            y_pos = self.draw_column_headers(y_pos, min_date, max_date)
-
-            # Count actual rows for this page
-            remaining = len(activities) - activity_index
-            actual_rows = min(remaining, rows_per_page)
-
-            # Draw vertical grid lines only for actual rows
-            self.draw_gantt_grid(y_pos, min_date, max_date, actual_rows)
+                c.showPage()
+
+            c.doForm('gantt_page_header')
+            self.draw_page_info()
+            y_pos = rows_top
+
+            # Vertical grid lines only for actual rows (a full page or the last page's rows)
+            actual_rows = min(len(activities) - activity_index, rows_per_page)
+            grid_form = f'gantt_grid_{actual_rows}'
+            if grid_form not in grid_forms:
+                c.beginForm(grid_form)
+                self.draw_gantt_grid(y_pos, timeline, actual_rows)
+                c.endForm()
+                grid_forms.add(grid_form)
+            c.doForm(grid_form)
 
             # Draw activity rows
             row_count = 0
@@ -842,59 +798,38 @@ class GanttChartPDF:
                 activity_index += 1
                 row_count += 1
 
-            # Draw legend
-            self.draw_legend(self.margin_bottom + 20)
-
-            # Draw footer
-            self.draw_footer()
+            # Legend and footer
+            c.doForm('gantt_page_footer')
 
         self.canvas.save()
         self.buffer.seek(0)
         return self.buffer
 
-    def draw_gantt_grid(self, y_start: float, min_date: date, max_date: date, num_rows: int):
-        """Draw vertical grid lines with quarter and year emphasis"""
+    def draw_gantt_grid(self, y_start: float, timeline: dict, num_rows: int):
+        """Draw vertical grid lines with quarter and year emphasis (see timeline_geometry)"""
         c = self.canvas
 
-        total_days = (max_date - min_date).days
-        if total_days <= 0:
-            total_days = 30
-
         y_end = y_start - (num_rows * self.row_height)
 
-        # Generate list of first-of-month dates within range
-        current = date(min_date.year, min_date.month, 1)
-        while current <= max_date:
-            if current >= min_date:
-                days_from_start = (current - min_date).days
-                x = self.gantt_start_x + (days_from_start / total_days) * self.gantt_width
-
-                if x >= self.gantt_start_x and x <= self.gantt_start_x + self.gantt_width:
-                    if current.month == 1:
-                        # Year divider - bold dark line
-                        c.setStrokeColor(HexColor('#94a3b8'))
-                        c.setLineWidth(1.2)
-                    elif current.month in (4, 7, 10):
-                        # Quarter divider - medium line
-                        c.setStrokeColor(HexColor('#cbd5e1'))
-                        c.setLineWidth(0.8)
-                    else:
-                        # Regular month - light line
-                        c.setStrokeColor(COLORS['grid_line'])
-                        c.setLineWidth(0.3)
-                    c.line(x, y_start, x, y_end)
-
-            # Move to next month
-            if current.month == 12:
-                current = date(current.year + 1, 1, 1)
+        # First-of-month lines within range
+        for x, month in timeline['month_lines']:
+            if month == 1:
+                # Year divider - bold dark line
+                c.setStrokeColor(HexColor('#94a3b8'))
+                c.setLineWidth(1.2)
+            elif month in (4, 7, 10):
+                # Quarter divider - medium line
+                c.setStrokeColor(HexColor('#cbd5e1'))
+                c.setLineWidth(0.8)
             else:
-                current = date(current.year, current.month + 1, 1)
+                # Regular month - light line
+                c.setStrokeColor(COLORS['grid_line'])
+                c.setLineWidth(0.3)
+            c.line(x, y_start, x, y_end)
 
         # Today line - red dashed vertical line
-        today = date.today()
-        if min_date <= today <= max_date:
-            today_offset = (today - min_date).days
-            today_x = self.gantt_start_x + (today_offset / total_days) * self.gantt_width
+        today_x = timeline['today_x']
+        if today_x is not None:
             c.setStrokeColor(COLORS['bar_critical'])  # Red
             c.setLineWidth(1)
             c.setDash(3, 2)  # Dashed line
@@ -902,12 +837,61 @@ class GanttChartPDF:
             c.setDash()  # Reset to solid
 
 
+def gantt_filename(subcontractor_name_list: Optional[List[str]] = None) -> str:
+    """Download filename of the company schedule (names the subcontractor filter)."""
+    if subcontractor_name_list:
+        # Replace spaces with underscores for filename
+        sub_name = ', '.join(subcontractor_name_list).replace(' ', '_').replace(',', '')
+        return f"BFPE_Manpower_Forecast_({sub_name}).pdf"
+    return "BFPE_Manpower_Forecast.pdf"
+
+
+def gantt_spec(
+    db: Session,
+    project_id_list: Optional[List[int]] = None,
+    subcontractor_name_list: Optional[List[str]] = None,
+    as_of: Optional[datetime] = None
+) -> dict:
+    """Everything render_pdf needs for the company schedule (optionally filtered)."""
+    data = gantt_layout.load_gantt_data(db, project_id_list, subcontractor_name_list)
+
+    # Determine display name for header
+    subcontractor_display = None
+    if subcontractor_name_list:
+        subcontractor_display = ', '.join(subcontractor_name_list)
+
+    return {
+        'kind': RenderJobKind.GANTT,
+        'filename': gantt_filename(subcontractor_name_list),
+        'title': "Fire Protection Schedule",
+        'subcontractor_filter': subcontractor_display,
+        'projects': data['projects'],
+        'spans': data['spans'],
+        'project_subcontractors': data['project_subcontractors'],
+        'as_of': as_of or datetime.now(),
+    }
+
+
+def gantt_export(
+    db: Session,
+    project_id_list: Optional[List[int]] = None,
+    subcontractor_name_list: Optional[List[str]] = None
+) -> Tuple[str, dict, str, Callable[[datetime], dict]]:
+    """(kind, cache params, filename, spec builder) of a company schedule export."""
+    params = {'project_ids': project_id_list, 'subcontractor_names': subcontractor_name_list}
+    return (
+        RenderJobKind.GANTT, params, gantt_filename(subcontractor_name_list),
+        lambda as_of: gantt_spec(db, project_id_list, subcontractor_name_list, as_of)
+    )
+
+
 @router.get("/pdf")
 def export_pdf(
     project_ids: Optional[str] = Query(None, description="Comma-separated project IDs"),
     subcontractor_names: Optional[str] = Query(None, description="Comma-separated subcontractor names"),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Export project data, man-hours, and a professional Gantt chart as a PDF.
@@ -926,97 +910,19 @@ def export_pdf(
     if subcontractor_names:
         subcontractor_name_list = [name.strip() for name in subcontractor_names.split(',')]
 
-    # Get projects (filtered or all)
-    if project_id_list or subcontractor_name_list:
-        # Build filtered query
-        query = db.query(models.Project).filter(
-            models.Project.status.in_(['active', 'prospective'])
-        )
-        if project_id_list:
-            query = query.filter(models.Project.id.in_(project_id_list))
-        if subcontractor_name_list:
-            subquery = db.query(models.ProjectSubcontractor.project_id).filter(
-                models.ProjectSubcontractor.subcontractor_name.in_(subcontractor_name_list)
-            ).distinct()
-            query = query.filter(models.Project.id.in_(subquery))
-        projects = query.all()
-
-        # Get phases only for filtered projects
-        project_ids_to_include = [p.id for p in projects]
-        phases = db.query(models.SchedulePhase).join(
-            models.ProjectSchedule
-        ).filter(
-            models.ProjectSchedule.project_id.in_(project_ids_to_include)
-        ).all()
-    else:
-        # Get all active/prospective projects
-        projects = db.query(models.Project).filter(
-            models.Project.status.in_(['active', 'prospective'])
-        ).all()
-        # Get phases for those projects
-        project_ids_to_include = [p.id for p in projects]
-        phases = db.query(models.SchedulePhase).join(
-            models.ProjectSchedule
-        ).filter(
-            models.ProjectSchedule.project_id.in_(project_ids_to_include)
-        ).all() if project_ids_to_include else []
-
-    # Build subcontractor info dict for each project
-    project_subcontractors = {}
-    for project in projects:
-        # Get subcontractors for this project
-        subs = db.query(models.ProjectSubcontractor).filter(
-            models.ProjectSubcontractor.project_id == project.id
-        ).all()
-
-        # If filtering by specific subcontractors, only include those
-        if subcontractor_name_list:
-            subs = [s for s in subs if s.subcontractor_name in subcontractor_name_list]
-
-        project_subcontractors[project.id] = [
-            {'name': s.subcontractor_name, 'headcount': s.headcount or 0, 'labor_type': s.labor_type}
-            for s in subs
-        ]
-
-    # Determine display name for header
-    subcontractor_display = None
-    if subcontractor_name_list:
-        subcontractor_display = ', '.join(subcontractor_name_list)
-
-    # Generate PDF
-    pdf_generator = GanttChartPDF(page_size=landscape(letter))
-    pdf_buffer = pdf_generator.generate(
-        projects=projects,
-        phases=phases,
-        project_name="Fire Protection Schedule",
-        company_name="BFPE International",
-        subcontractor_filter=subcontractor_display,
-        project_subcontractors=project_subcontractors
-    )
-
-    # Generate filename based on filter
-    if subcontractor_display:
-        # Replace spaces with underscores for filename
-        sub_name = subcontractor_display.replace(' ', '_').replace(',', '')
-        filename = f"BFPE_Manpower_Forecast_({sub_name}).pdf"
-    else:
-        filename = "BFPE_Manpower_Forecast.pdf"
-
-    return Response(
-        pdf_buffer.read(),
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
-    )
+    return _export_response(db, gantt_export(db, project_id_list, subcontractor_name_list), if_none_match)
 
 
 class SubcontractorReportPDF:
     """Professional Subcontractor Labor Report PDF Generator"""
 
-    def __init__(self, page_size=letter):
+    def __init__(self, page_size=letter, calendars: CalendarSet = STANDARD_CALENDARS,
+                 output: Optional[BinaryIO] = None):
         self.page_size = page_size
         self.width, self.height = page_size
+        self.calendars = calendars
+        self.output = output  # File to write (default: an in-memory buffer)
+        self.as_of = datetime.now()  # Run date (set in generate())
         self.margin_left = 0.5 * inch
         self.margin_right = 0.5 * inch
         self.margin_top = 0.6 * inch
@@ -1034,22 +940,17 @@ class SubcontractorReportPDF:
         }
 
         self.row_height = 18
-        self.buffer = io.BytesIO()
-        self.canvas = canvas.Canvas(self.buffer, pagesize=self.page_size)
+        self.buffer = self.output if self.output is not None else io.BytesIO()
+        # Invariant: no creation timestamp or random document ID, so equal inputs give equal bytes
+        self.canvas = canvas.Canvas(self.buffer, pagesize=self.page_size, invariant=True, pageCompression=1)
         self.page_number = 0
         self.total_pages = 1
 
-    def calculate_work_days(self, start_date: date, end_date: date) -> int:
-        """Calculate number of business days (Mon-Fri) between two dates."""
+    def calculate_work_days(self, start_date: date, end_date: date, calendar_id: Optional[int] = None) -> int:
+        """Calculate number of working days between two dates on the project's work calendar."""
         if not start_date or not end_date:
             return 0
-        work_days = 0
-        current = start_date
-        from datetime import timedelta
-        while current <= end_date:
-            if current.weekday() < 5:  # Monday=0, Friday=4
-                work_days += 1
-            current += timedelta(days=1)
+        work_days = self.calendars.get(calendar_id).count_working_days(start_date, end_date)
         return max(work_days, 1)  # Minimum 1 to avoid division by zero
 
     def draw_header(self, subcontractor_name: str, date_range: str, run_date: str, logo_path: str = None):
@@ -1059,14 +960,14 @@ class SubcontractorReportPDF:
 
         # Draw logo if available
         logo_width = 0
-        if logo_path and os.path.exists(logo_path):
+        logo = load_logo(logo_path)
+        if logo is not None:
             try:
                 logo_height = 30
-                img = ImageReader(logo_path)
-                img_width, img_height = img.getSize()
+                img_width, img_height = logo.getSize()
                 aspect = img_width / img_height
                 logo_width = logo_height * aspect
-                c.drawImage(logo_path, self.margin_left, y - 15,
+                c.drawImage(logo, self.margin_left, y - 15,
                            width=logo_width, height=logo_height, preserveAspectRatio=True)
                 logo_width += 10
             except Exception:
@@ -1149,11 +1050,9 @@ class SubcontractorReportPDF:
         x = self.margin_left + 4
         text_y = y_pos - self.row_height + 5
 
-        # Project name (truncate if needed)
-        name = row_data.get('project_name', '')
-        max_chars = int(self.col_widths['project_name'] / 4.5)
-        if len(name) > max_chars:
-            name = name[:max_chars-2] + '..'
+        # Project name (truncated to the column width)
+        name = text_layout.truncate(row_data.get('project_name', ''), "Helvetica", 8,
+                                    self.col_widths['project_name'] - 8)
         c.drawString(x, text_y, name)
         x += self.col_widths['project_name']
 
@@ -1230,8 +1129,10 @@ class SubcontractorReportPDF:
         c.drawCentredString(self.width / 2, y, "BFPE International - Subcontractor Labor Report")
 
     def generate(self, subcontractor_name: str, projects_data: list, total_hours: float,
-                 start_date: date = None, end_date: date = None):
-        """Generate the complete PDF"""
+                 start_date: date = None, end_date: date = None, as_of: Optional[datetime] = None):
+        """Generate the complete PDF (as_of: run date, default now)"""
+        if as_of is not None:
+            self.as_of = as_of
 
         # Aggregate data at project level (not phase level)
         rows = []
@@ -1251,7 +1152,7 @@ class SubcontractorReportPDF:
                     proj_end = max(end_dates)
 
             # Calculate men required = hours / (work_days * 8 hours per day)
-            work_days = self.calculate_work_days(proj_start, proj_end)
+            work_days = self.calculate_work_days(proj_start, proj_end, project.get('work_calendar_id'))
             men_required = project_hours / (work_days * 8) if work_days > 0 else 0
 
             rows.append({
@@ -1269,7 +1170,7 @@ class SubcontractorReportPDF:
         rows_per_page = int(usable_height / self.row_height)
         self.total_pages = max(1, math.ceil((len(rows) + 1) / rows_per_page))  # +1 for summary
 
-        run_date = datetime.now().strftime('%d-%b-%y %H:%M')
+        run_date = self.as_of.strftime('%d-%b-%y %H:%M')
         date_range = ""
         if start_date and end_date:
             date_range = f"{start_date.strftime('%d-%b-%y')} to {end_date.strftime('%d-%b-%y')}"
@@ -1282,10 +1183,7 @@ class SubcontractorReportPDF:
             if page > 0:
                 self.canvas.showPage()
 
-            logo_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                                    'frontend', 'bfpe_logo.png')
-
-            self.draw_header(subcontractor_name, date_range, run_date, logo_path)
+            self.draw_header(subcontractor_name, date_range, run_date, LOGO_PATH)
 
             y_pos = self.height - self.margin_top - 30
             y_pos = self.draw_table_header(y_pos)
@@ -1307,129 +1205,733 @@ class SubcontractorReportPDF:
         return self.buffer
 
 
+def subcontractor_filename(subcontractor_name: str) -> str:
+    return f"{subcontractor_name.replace(' ', '_')}_labor_report.pdf"
+
+
+def subcontractor_spec(
+    db: Session,
+    subcontractor_name: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    as_of: Optional[datetime] = None
+) -> dict:
+    """Everything render_pdf needs for a subcontractor labor report."""
+    report = subcontractor_report.get_subcontractor_report(db, subcontractor_name, start_date, end_date)
+
+    return {
+        'kind': RenderJobKind.SUBCONTRACTOR,
+        'filename': subcontractor_filename(subcontractor_name),
+        'subcontractor_name': subcontractor_name,
+        'projects_data': report['projects'],
+        'total_hours': float(report['total_man_hours']),
+        'start_date': start_date,
+        'end_date': end_date,
+        'calendars': load_calendars(db),
+        'as_of': as_of or datetime.now(),
+    }
+
+
+def subcontractor_export(
+    db: Session,
+    subcontractor_name: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Tuple[str, dict, str, Callable[[datetime], dict]]:
+    """(kind, cache params, filename, spec builder) of a subcontractor labor report."""
+    params = {'subcontractor_name': subcontractor_name, 'start_date': start_date, 'end_date': end_date}
+    return (
+        RenderJobKind.SUBCONTRACTOR, params, subcontractor_filename(subcontractor_name),
+        lambda as_of: subcontractor_spec(db, subcontractor_name, start_date, end_date, as_of)
+    )
+
+
 @router.get("/pdf/subcontractor/{subcontractor_name}")
 def export_subcontractor_pdf(
     subcontractor_name: str,
     start_date: date = None,
     end_date: date = None,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Export subcontractor labor report as PDF."""
-    from api.subcontractor_reports import VALID_SUBCONTRACTORS
-    from decimal import Decimal
-
     if subcontractor_name not in VALID_SUBCONTRACTORS:
         return Response(status_code=400, content="Invalid subcontractor name")
 
-    # Get subcontractor data
-    project_assignments = crud.get_projects_by_subcontractor(
-        db, subcontractor_name, start_date, end_date
-    )
-
-    total_hours = Decimal('0')
-    projects_data = []
+    return _export_response(db, subcontractor_export(db, subcontractor_name, start_date, end_date), if_none_match)
 
-    for project, labor_type in project_assignments:
-        phases = crud.get_project_phases_for_labor_type(
-            db, project.id, labor_type, start_date, end_date
-        )
 
-        phases_info = []
-        project_hours = Decimal('0')
+def project_filename(project: models.Project) -> str:
+    return f"{project.name.replace(' ', '_')}_schedule.pdf"
 
-        for phase in phases:
-            if phase.estimated_man_hours:
-                phase_hours = Decimal(str(phase.estimated_man_hours))
-            elif phase.crew_size:
-                duration_days = (phase.end_date - phase.start_date).days + 1
-                phase_hours = Decimal(str(phase.crew_size)) * Decimal('8') * Decimal(str(duration_days))
-            else:
-                phase_hours = Decimal('0')
-
-            project_hours += phase_hours
-            phases_info.append({
-                "phase_name": phase.phase_name,
-                "start_date": phase.start_date,
-                "end_date": phase.end_date,
-                "man_hours": phase_hours
-            })
 
-        total_hours += project_hours
+def project_spec(data: dict, as_of: Optional[datetime] = None) -> dict:
+    """Everything render_pdf needs for a single project's schedule (data from gantt_layout.load_project_data)."""
+    project = data['project']
+    return {
+        'kind': RenderJobKind.PROJECT,
+        'filename': project_filename(project),
+        'title': project.name,
+        'subcontractor_filter': None,
+        'projects': data['projects'],
+        'spans': data['spans'],
+        'project_subcontractors': data['project_subcontractors'],
+        'as_of': as_of or datetime.now(),
+    }
 
-        projects_data.append({
-            "project_name": project.name,
-            "project_number": project.project_number,
-            "labor_type": labor_type,
-            "phases": phases_info,
-            "total_project_hours": project_hours
-        })
 
-    # Generate PDF
-    pdf_generator = SubcontractorReportPDF(page_size=letter)
-    pdf_buffer = pdf_generator.generate(
-        subcontractor_name=subcontractor_name,
-        projects_data=projects_data,
-        total_hours=float(total_hours),
-        start_date=start_date,
-        end_date=end_date
-    )
-
-    filename = f"{subcontractor_name.replace(' ', '_')}_labor_report.pdf"
-
-    return Response(
-        pdf_buffer.read(),
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
+def project_export(data: dict) -> Tuple[str, dict, str, Callable[[datetime], dict]]:
+    """(kind, cache params, filename, spec builder) of a single project's schedule."""
+    project = data['project']
+    return (
+        RenderJobKind.PROJECT, {'project_id': project.id}, project_filename(project),
+        lambda as_of: project_spec(data, as_of)
     )
 
 
 @router.get("/pdf/project/{project_id}")
 def export_project_pdf(
     project_id: int,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Export a single project's schedule as a professional PDF.
+
+    Only this project's rows are read, so the cost does not grow with the
+    number of other projects.
     """
-    project = crud.get_project(db, project_id)
-    if not project:
+    data = gantt_layout.load_project_data(db, project_id)
+    if data is None:
         return Response(status_code=404, content="Project not found")
 
-    phases = crud.get_all_phases(db)
-    project_phases = [p for p in phases if p.schedule.project_id == project_id]
+    return _export_response(db, project_export(data), if_none_match)
+
+
+class UtilizationReportPDF:
+    """Subcontractor Utilization PDF Generator (weekly hours and headcount)"""
+
+    def __init__(self, page_size=landscape(letter), output: Optional[BinaryIO] = None):
+        self.page_size = page_size
+        self.width, self.height = page_size
+        self.output = output  # File to write (default: an in-memory buffer)
+        self.as_of = datetime.now()  # Run date (set in generate())
+        self.margin_left = 0.5 * inch
+        self.margin_right = 0.5 * inch
+        self.margin_top = 0.6 * inch
+        self.margin_bottom = 0.8 * inch
+        self.table_width = self.width - self.margin_left - self.margin_right
+
+        self.row_height = 14
+        self.header_height = 25
+        self.buffer = self.output if self.output is not None else io.BytesIO()
+        self.canvas = canvas.Canvas(self.buffer, pagesize=self.page_size, invariant=True, pageCompression=1)
+        self.page_number = 0
+        self.total_pages = 1
+
+    def draw_header(self, title: str, period: str, run_date: str, logo_path: str = None):
+        """Draw the page header"""
+        c = self.canvas
+        y = self.height - self.margin_top + 20
+
+        logo_width = 0
+        logo = load_logo(logo_path)
+        if logo is not None:
+            try:
+                logo_height = 30
+                img_width, img_height = logo.getSize()
+                logo_width = logo_height * img_width / img_height
+                c.drawImage(logo, self.margin_left, y - 15,
+                           width=logo_width, height=logo_height, preserveAspectRatio=True)
+                logo_width += 10
+            except Exception:
+                logo_width = 0
+
+        c.setFont("Helvetica-Bold", 14)
+        c.setFillColor(COLORS['text_primary'])
+        c.drawString(self.margin_left + logo_width, y, title)
+
+        c.setFont("Helvetica", 9)
+        c.setFillColor(COLORS['text_secondary'])
+        c.drawRightString(self.width - self.margin_right, y, f"Page {self.page_number} of {self.total_pages}")
+        c.drawRightString(self.width - self.margin_right, y - 12, f"Run Date: {run_date}")
+        c.drawString(self.margin_left + logo_width, y - 15, f"Period: {period}")
+
+        c.setStrokeColor(COLORS['grid_line'])
+        c.setLineWidth(1)
+        c.line(self.margin_left, y - 25, self.width - self.margin_right, y - 25)
+
+    def draw_table_header(self, y_pos: float, columns: list) -> float:
+        """Draw column headers; columns are (label, width, right aligned)"""
+        c = self.canvas
+        c.setFillColor(COLORS['header_bg'])
+        c.rect(self.margin_left, y_pos - self.header_height, self.table_width, self.header_height, fill=1, stroke=0)
+
+        c.setFillColor(COLORS['header_text'])
+        c.setFont("Helvetica-Bold", 8)
+        text_y = y_pos - self.header_height / 2 - 3
+        x = self.margin_left
+        for label, width, right in columns:
+            if right:
+                c.drawRightString(x + width - 4, text_y, label)
+            else:
+                c.drawString(x + 4, text_y, label)
+            x += width
+        return y_pos - self.header_height
+
+    def draw_row(self, y_pos: float, columns: list, cells: list, row_index: int, summary: bool = False) -> float:
+        """Draw one table row (summary rows are bold on the dark background)"""
+        c = self.canvas
+        if summary:
+            c.setFillColor(COLORS['subheader_bg'])
+        else:
+            c.setFillColor(COLORS['row_alt'] if row_index % 2 == 0 else COLORS['row_normal'])
+        c.rect(self.margin_left, y_pos - self.row_height, self.table_width, self.row_height, fill=1, stroke=0)
+
+        c.setStrokeColor(COLORS['grid_line'])
+        c.setLineWidth(0.3)
+        c.line(self.margin_left, y_pos - self.row_height, self.width - self.margin_right, y_pos - self.row_height)
 
-    # Get subcontractors for this project
-    subs = db.query(models.ProjectSubcontractor).filter(
-        models.ProjectSubcontractor.project_id == project_id
-    ).all()
+        c.setFillColor(COLORS['header_text'] if summary else COLORS['text_primary'])
+        font = "Helvetica-Bold" if summary else "Helvetica"
+        c.setFont(font, 8)
+        text_y = y_pos - self.row_height + 4
+        x = self.margin_left
+        for (label, width, right), cell in zip(columns, cells):
+            if right:
+                c.drawRightString(x + width - 4, text_y, cell)
+            else:
+                c.drawString(x + 4, text_y, text_layout.truncate(cell, font, 8, width - 8))
+            x += width
+        return y_pos - self.row_height
 
-    project_subcontractors = {
-        project_id: [
-            {'name': s.subcontractor_name, 'headcount': s.headcount or 0, 'labor_type': s.labor_type}
-            for s in subs
+    def draw_footer(self):
+        """Draw page footer"""
+        c = self.canvas
+        y = self.margin_bottom - 20
+
+        c.setStrokeColor(COLORS['grid_line'])
+        c.setLineWidth(0.5)
+        c.line(self.margin_left, y + 15, self.width - self.margin_right, y + 15)
+
+        c.setFont("Helvetica", 8)
+        c.setFillColor(COLORS['text_secondary'])
+        c.drawCentredString(self.width / 2, y, "BFPE International - Subcontractor Utilization Report")
+
+    def summary_table(self, utilization: dict) -> Tuple[list, list, Optional[list]]:
+        """(columns, rows, total row) of the all-subcontractor summary"""
+        weeks = utilization['weeks']
+        columns = [
+            ('Subcontractor', 4.0 * inch, False),
+            ('Man-Hours', 1.3 * inch, True),
+            ('Avg. Crew', 1.1 * inch, True),
+            ('Peak Crew', 1.1 * inch, True),
+            ('Peak Week', 1.3 * inch, False),
+            ('Max. Assigned', 1.2 * inch, True),
         ]
+        rows = []
+        for sub in utilization['subcontractors']:
+            headcount = sub['weekly_headcount']
+            peak = max(range(len(headcount)), key=headcount.__getitem__) if headcount else None
+            rows.append([
+                sub['subcontractor_name'],
+                f"{sub['total_man_hours']:,.1f}",
+                f"{sum(headcount) / len(headcount):,.1f}" if headcount else "0.0",
+                f"{sub['peak_headcount']:,.1f}",
+                weeks[peak]['week'] if peak is not None and headcount[peak] > 0 else "",
+                f"{max(sub['assigned_headcount'], default=0):,.0f}",
+            ])
+        total = ["TOTAL", f"{sum(sub['total_man_hours'] for sub in utilization['subcontractors']):,.1f}",
+                 "", "", "", ""]
+        return columns, rows, total
+
+    def weekly_table(self, utilization: dict, sub: dict) -> Tuple[list, list, Optional[list]]:
+        """(columns, rows, total row) of one subcontractor's weeks, by labor type"""
+        labor_types = sub['labor_types']
+        # Week, start and working days on the left, totals on the right; labor types share the rest
+        fixed = 0.8 * inch + 0.9 * inch + 0.6 * inch + 1.0 * inch + 0.8 * inch + 0.9 * inch
+        pair_width = (self.table_width - fixed) / max(len(labor_types), 1) / 2
+        columns = [('Week', 0.8 * inch, False), ('Week Start', 0.9 * inch, False), ('Days', 0.6 * inch, True)]
+        for labor in labor_types:
+            label = labor['labor_type'].capitalize()
+            columns += [(f"{label} Hrs", pair_width, True), (f"{label} Crew", pair_width, True)]
+        columns += [('Total Hrs', 1.0 * inch, True), ('Crew', 0.8 * inch, True), ('Assigned', 0.9 * inch, True)]
+
+        rows = []
+        for i, week in enumerate(utilization['weeks']):
+            row = [week['week'], week['week_start'].strftime('%d-%b-%y'), str(week['working_days'])]
+            for labor in labor_types:
+                row += [f"{labor['weekly_hours'][i]:,.1f}", f"{labor['weekly_headcount'][i]:,.1f}"]
+            row += [f"{sub['weekly_hours'][i]:,.1f}", f"{sub['weekly_headcount'][i]:,.1f}",
+                    f"{sub['assigned_headcount'][i]:,.0f}"]
+            rows.append(row)
+        total = ["TOTAL", "", ""]
+        for labor in labor_types:
+            total += [f"{labor['total_man_hours']:,.1f}", ""]
+        total += [f"{sub['total_man_hours']:,.1f}", f"{sub['peak_headcount']:,.1f}", ""]
+        return columns, rows, total
+
+    def generate(self, utilization: dict, as_of: Optional[datetime] = None):
+        """Generate the complete PDF: a summary, then one weekly table per subcontractor"""
+        if as_of is not None:
+            self.as_of = as_of
+
+        sections = [("Subcontractor Utilization", self.summary_table(utilization))]
+        for sub in utilization['subcontractors']:
+            sections.append((f"Subcontractor Utilization: {sub['subcontractor_name']}",
+                             self.weekly_table(utilization, sub)))
+
+        usable_height = self.height - self.margin_top - self.margin_bottom - 30 - self.header_height
+        rows_per_page = int(usable_height / self.row_height)
+        # Each section starts on a new page; +1 row for its total
+        section_pages = [max(1, math.ceil((len(rows) + 1) / rows_per_page)) for _, (_, rows, _) in sections]
+        self.total_pages = sum(section_pages)
+
+        run_date = self.as_of.strftime('%d-%b-%y %H:%M')
+        period = (f"{utilization['start_date'].strftime('%d-%b-%y')} to "
+                  f"{utilization['end_date'].strftime('%d-%b-%y')} ({len(utilization['weeks'])} weeks)")
+
+        for (title, (columns, rows, total)), pages in zip(sections, section_pages):
+            row_index = 0
+            for page in range(pages):
+                self.page_number += 1
+                if self.page_number > 1:
+                    self.canvas.showPage()
+
+                self.draw_header(title, period, run_date, LOGO_PATH)
+                y_pos = self.height - self.margin_top - 30
+                y_pos = self.draw_table_header(y_pos, columns)
+
+                row_count = 0
+                while row_index < len(rows) and row_count < rows_per_page:
+                    y_pos = self.draw_row(y_pos, columns, rows[row_index], row_count)
+                    row_index += 1
+                    row_count += 1
+
+                if row_index >= len(rows) and row_count < rows_per_page:
+                    y_pos = self.draw_row(y_pos, columns, total, row_count, summary=True)
+
+                self.draw_footer()
+
+        self.canvas.save()
+        self.buffer.seek(0)
+        return self.buffer
+
+
+def utilization_filename(start_date: date) -> str:
+    return f"Subcontractor_Utilization_{start_date}.pdf"
+
+
+def utilization_spec(
+    db: Session,
+    start_date: date,
+    weeks: int,
+    subcontractor_names: Optional[List[str]] = None,
+    as_of: Optional[datetime] = None
+) -> dict:
+    """Everything render_pdf needs for the subcontractor utilization report."""
+    return {
+        'kind': RenderJobKind.UTILIZATION,
+        'filename': utilization_filename(start_date),
+        'utilization': subcontractor_utilization.get_utilization(db, start_date, weeks, subcontractor_names),
+        'as_of': as_of or datetime.now(),
     }
 
-    # Generate PDF
-    pdf_generator = GanttChartPDF(page_size=landscape(letter))
-    pdf_buffer = pdf_generator.generate(
-        projects=[project],
-        phases=project_phases,
-        project_name=project.name,
-        company_name="BFPE International",
-        project_subcontractors=project_subcontractors
+
+def utilization_export(
+    db: Session,
+    start_date: Optional[date] = None,
+    weeks: int = DEFAULT_HORIZON_WEEKS,
+    subcontractor_names: Optional[List[str]] = None
+) -> Tuple[str, dict, str, Callable[[datetime], dict]]:
+    """(kind, cache params, filename, spec builder) of the subcontractor utilization report."""
+    start_date, _ = subcontractor_utilization.horizon(start_date or date.today(), weeks)
+    names = sorted(set(subcontractor_names)) if subcontractor_names else None
+    params = {'start_date': start_date, 'weeks': weeks, 'subcontractor_names': names}
+    return (
+        RenderJobKind.UTILIZATION, params, utilization_filename(start_date),
+        lambda as_of: utilization_spec(db, start_date, weeks, names, as_of)
     )
 
-    filename = f"{project.name.replace(' ', '_')}_schedule.pdf"
 
-    return Response(
-        pdf_buffer.read(),
-        media_type="application/pdf",
+@router.get("/pdf/utilization")
+def export_utilization_pdf(
+    start_date: date = None,
+    weeks: int = Query(DEFAULT_HORIZON_WEEKS, ge=1, le=MAX_HORIZON_WEEKS),
+    subcontractor_names: Optional[str] = Query(None, description="Comma-separated subcontractors (default: all)"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Export weekly subcontractor hours and headcount as PDF."""
+    names = parse_subcontractor_names(subcontractor_names)
+    return _export_response(db, utilization_export(db, start_date, weeks, names), if_none_match)
+
+
+# ============================================
+# Rendering (in the render worker processes)
+# ============================================
+
+def render_pdf(spec: dict) -> str:
+    """
+    Render a spec built by gantt_spec / project_spec / subcontractor_spec /
+    utilization_spec.
+
+    The PDF is written straight to a spool file (settings.pdf_spool_dir)
+    rather than returned as bytes; returns its path, which the caller removes.
+    """
+    fd, path = tempfile.mkstemp(prefix='render-', suffix='.pdf', dir=settings.pdf_spool_dir or None)
+    try:
+        with os.fdopen(fd, 'wb') as output:
+            _render_to(spec, output)
+    except BaseException:
+        _remove_spooled(path)
+        raise
+    return path
+
+
+def _render_to(spec: dict, output: BinaryIO) -> None:
+    if spec['kind'] == RenderJobKind.UTILIZATION:
+        pdf_generator = UtilizationReportPDF(page_size=landscape(letter), output=output)
+        pdf_generator.generate(spec['utilization'], as_of=spec['as_of'])
+    elif spec['kind'] == RenderJobKind.SUBCONTRACTOR:
+        pdf_generator = SubcontractorReportPDF(page_size=letter, calendars=spec['calendars'], output=output)
+        pdf_generator.generate(
+            subcontractor_name=spec['subcontractor_name'],
+            projects_data=spec['projects_data'],
+            total_hours=spec['total_hours'],
+            start_date=spec['start_date'],
+            end_date=spec['end_date'],
+            as_of=spec['as_of']
+        )
+    else:
+        pdf_generator = GanttChartPDF(page_size=landscape(letter), output=output)
+        pdf_generator.generate(
+            projects=spec['projects'],
+            spans=spec['spans'],
+            project_name=spec['title'],
+            company_name="BFPE International",
+            subcontractor_filter=spec['subcontractor_filter'],
+            project_subcontractors=spec['project_subcontractors'],
+            as_of=spec['as_of']
+        )
+
+
+def _remove_spooled(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def warm_renderer() -> None:
+    """Render worker initializer: load fonts and the logo before the first job."""
+    for font_name in ("Helvetica", "Helvetica-Bold"):
+        pdfmetrics.getFont(font_name)
+    load_logo(LOGO_PATH)
+
+
+render_queue = RenderJobQueue(
+    max_workers=settings.pdf_render_workers,
+    max_pending=settings.pdf_render_queue,
+    result_ttl=settings.pdf_job_ttl,
+    initializer=warm_renderer,
+    discard=_remove_spooled
+)
+
+
+def _queue_full(e: RenderQueueFull) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+
+
+def _render(spec: dict) -> str:
+    """Render a spec in the worker pool and wait for the PDF (path of a spool file)."""
+    try:
+        return render_queue.render(render_pdf, spec, timeout=settings.pdf_render_timeout, label=spec['filename'])
+    except RenderQueueFull as e:
+        raise _queue_full(e)
+    except FutureTimeoutError:
+        raise HTTPException(status_code=504, detail="PDF rendering timed out")
+
+
+def _pdf_headers(filename: str, etag: Optional[str] = None) -> dict:
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if etag:
+        headers["ETag"] = etag
+        headers["Cache-Control"] = "private, no-cache"
+    return headers
+
+
+def _file_response(path: str, filename: str, etag: Optional[str] = None,
+                   remove: bool = True, media_type: str = "application/pdf") -> StreamingResponse:
+    """Stream a PDF file in chunks with its Content-Length (removing it afterwards if remove)."""
+    fileobj = open(path, 'rb')
+    headers = _pdf_headers(filename, etag)
+    headers["Content-Length"] = str(os.fstat(fileobj.fileno()).st_size)
+    return StreamingResponse(
+        iter_file(fileobj),
+        media_type=media_type,
+        headers=headers,
+        background=BackgroundTask(_remove_spooled, path) if remove else None
+    )
+
+
+def _export_response(db: Session, export: tuple, if_none_match: Optional[str] = None) -> Response:
+    """
+    Serve an export (see gantt_export) from the PDF cache, rendering it on a miss.
+
+    The cache key is a strong ETag: If-None-Match with the current key
+    returns 304 without reading or rendering anything.
+    """
+    kind, params, filename, build_spec = export
+    as_of = pdf_cache.window()
+    if not pdf_cache.enabled:
+        return _file_response(_render(build_spec(as_of)), filename)
+
+    etag = f'"{pdf_cache_key(db, kind, params, as_of)}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+    key = etag.strip('"')
+    path = pdf_cache.checkout(key, settings.pdf_spool_dir or None)
+    if path is None:
+        path = _render(build_spec(as_of))
+        pdf_cache.put_file(key, path)
+    return _file_response(path, filename, etag)
+
+
+def _cache_finished_render(key: str, future) -> None:
+    """Done callback of a background render: store the PDF under its cache key."""
+    if not future.cancelled() and future.exception() is None:
+        pdf_cache.put_file(key, future.result()[0])
+
+
+# ============================================
+# Background render jobs
+# ============================================
+
+def _job_status(job) -> dict:
+    return {
+        'id': job.id,
+        'label': job.label,
+        'status': job.status,
+        'filename': job.filename,
+        'created_at': job.created_at,
+        'finished_at': job.finished_at,
+        'render_seconds': job.render_seconds,
+        'error': job.error,
+        'download_url': f"{router.prefix}/jobs/{job.id}/download" if job.status == RenderJobStatus.DONE else None,
+    }
+
+
+@router.post("/jobs", response_model=schemas.RenderJob, status_code=202)
+def submit_render_job(
+    job: schemas.RenderJobCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Queue a PDF export; poll GET /jobs/{id} (optionally with ?wait=) and then download it.
+    """
+    if job.kind == RenderJobKind.GANTT:
+        export = gantt_export(db, job.project_ids, job.subcontractor_names)
+    elif job.kind == RenderJobKind.PROJECT:
+        data = gantt_layout.load_project_data(db, job.project_id) if job.project_id else None
+        if data is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        export = project_export(data)
+    elif job.kind == RenderJobKind.SUBCONTRACTOR:
+        if job.subcontractor_name not in VALID_SUBCONTRACTORS:
+            raise HTTPException(status_code=400, detail="Invalid subcontractor name")
+        export = subcontractor_export(db, job.subcontractor_name, job.start_date, job.end_date)
+    elif job.kind == RenderJobKind.UTILIZATION:
+        if any(name not in VALID_SUBCONTRACTORS for name in job.subcontractor_names or []):
+            raise HTTPException(status_code=400, detail="Invalid subcontractor name")
+        export = utilization_export(db, job.start_date, job.weeks, job.subcontractor_names)
+    else:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(RenderJobKind.ALL)}")
+
+    kind, params, filename, build_spec = export
+    as_of = pdf_cache.window()
+    key = pdf_cache_key(db, kind, params, as_of) if pdf_cache.enabled else None
+    cached = pdf_cache.checkout(key, settings.pdf_spool_dir or None) if key else None
+    if cached is not None:
+        render_job = render_queue.add_finished(cached, label=job.kind, filename=filename)
+    else:
+        try:
+            render_job = render_queue.submit(render_pdf, build_spec(as_of), label=job.kind, filename=filename)
+        except RenderQueueFull as e:
+            raise _queue_full(e)
+        if key:
+            render_job.future.add_done_callback(lambda future: _cache_finished_render(key, future))
+    if key:
+        render_job.etag = f'"{key}"'
+    return _job_status(render_job)
+
+
+@router.get("/jobs/{job_id}", response_model=schemas.RenderJob)
+async def get_render_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=MAX_JOB_WAIT_SECONDS, description="Seconds to wait for the job to finish"),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Get a render job's status (long-polls up to wait seconds while it is unfinished)."""
+    job = render_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Render job not found")
+    if wait:
+        await job.wait_async(wait)
+    return _job_status(job)
+
+
+@router.get("/jobs/{job_id}/download")
+def download_render_job(
+    job_id: str,
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Download a finished render job's PDF."""
+    job = render_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Render job not found")
+    if job.status == RenderJobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=f"Rendering failed: {job.error}")
+    if job.status != RenderJobStatus.DONE:
+        raise HTTPException(status_code=409, detail=f"Render job is {job.status}")
+
+    # The spooled file belongs to the job (removed when it expires) and may be downloaded again
+    return _file_response(job.result, job.filename, job.etag, remove=False, media_type=job.media_type)
+
+
+# ============================================
+# Bundle export
+# ============================================
+
+def bundle_exports(
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_gantt: bool = True
+) -> List[Tuple[str, tuple]]:
+    """(archive name, export) of every report in the bundle (see gantt_export)."""
+    exports = []
+    if include_gantt:
+        exports.append((f"gantt/{gantt_filename()}", gantt_export(db)))
+        for name in VALID_SUBCONTRACTORS:
+            exports.append((f"gantt/{gantt_filename([name])}", gantt_export(db, None, [name])))
+    for name in VALID_SUBCONTRACTORS:
+        exports.append((
+            f"subcontractor_reports/{subcontractor_filename(name)}",
+            subcontractor_export(db, name, start_date, end_date)
+        ))
+    return exports
+
+
+def _bundle_members(items: List[dict], manifest: dict) -> Iterator[Tuple[str, Union[str, bytes]]]:
+    """
+    Archive members of a bundle: cached PDFs, then each render as it
+    finishes, then manifest.json. Runs while the response streams, so it
+    must not touch the database.
+    """
+    started = time.perf_counter()
+    files = manifest['files']
+
+    def entry(item: dict, **fields) -> dict:
+        return {'name': item['name'], 'kind': item['kind'], 'cached': False,
+                'render_seconds': None, 'bytes': None, 'error': None, **fields}
+
+    rendering = [item for item in items if item['path'] is None]
+    try:
+        for item in items:
+            if item['path'] is not None:
+                files.append(entry(item, cached=True, bytes=os.path.getsize(item['path'])))
+                yield item['name'], item['path']
+                _remove_spooled(item['path'])
+
+        finished = set()
+        try:
+            for index, job in render_queue.map_completed(
+                render_pdf, [item['spec'] for item in rendering],
+                timeout=settings.pdf_render_timeout, labels=[item['name'] for item in rendering]
+            ):
+                item = rendering[index]
+                finished.add(index)
+                if job.error is not None:
+                    files.append(entry(item, error=job.error))
+                    continue
+                item['path'] = job.result
+                if item['key']:
+                    pdf_cache.put_file(item['key'], job.result)
+                files.append(entry(item, render_seconds=round(job.render_seconds, 3),
+                                   bytes=os.path.getsize(job.result)))
+                yield item['name'], job.result
+                _remove_spooled(job.result)
+        except FutureTimeoutError:
+            files.extend(
+                entry(item, error="PDF rendering timed out")
+                for index, item in enumerate(rendering) if index not in finished
+            )
+
+        manifest['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        manifest['render_seconds'] = round(sum(f['render_seconds'] or 0 for f in files), 3)
+        yield "manifest.json", json.dumps(manifest, indent=2, default=str).encode()
+    finally:
+        # Abandoned downloads: drop the PDFs not written yet
+        for item in items:
+            if item['path'] is not None:
+                _remove_spooled(item['path'])
+
+
+@router.get("/bundle")
+def export_bundle(
+    start_date: date = None,
+    end_date: date = None,
+    include_gantt: bool = Query(True, description="Include the company Gantt and one per subcontractor"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Export every subcontractor labor report (and the Gantt variants) as one ZIP.
+
+    The reports render in parallel in the render worker pool and each PDF
+    is written to the streamed archive as soon as it finishes; cached PDFs
+    are reused. manifest.json lists every file with its render time.
+    """
+    as_of = pdf_cache.window()
+    items = []
+    # Build every spec now: the session is closed by the time the body streams
+    for name, (kind, params, filename, build_spec) in bundle_exports(db, start_date, end_date, include_gantt):
+        key = pdf_cache_key(db, kind, params, as_of) if pdf_cache.enabled else None
+        path = pdf_cache.checkout(key, settings.pdf_spool_dir or None) if key else None
+        items.append({
+            'name': name,
+            'kind': kind,
+            'key': key,
+            'path': path,
+            'spec': build_spec(as_of) if path is None else None,
+        })
+
+    manifest = {
+        'created_at': datetime.now(),
+        'as_of': as_of,
+        'start_date': start_date,
+        'end_date': end_date,
+        'render_workers': render_queue.max_workers,
+        'files': [],
+    }
+    return StreamingResponse(
+        iter_zip(_bundle_members(items, manifest)),
+        media_type="application/zip",
         headers={
-            "Content-Disposition": f"attachment; filename={filename}"
+            "Content-Disposition": f"attachment; filename=BFPE_Reports_{as_of.strftime('%Y-%m-%d')}.zip"
         }
     )
+
+
+@router.get("/cache-stats")
+def get_export_cache_stats(
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Get PDF cache counters and render queue occupancy."""
+    return {'cache': pdf_cache.stats(), 'render_queue': render_queue.stats()}
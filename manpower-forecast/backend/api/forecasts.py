@@ -1,18 +1,93 @@
 """Forecast API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date, timedelta
 import crud
 import schemas
 import models
+import logger
 from database import get_db
-from services.manpower import generate_forecast
-from services.export import generate_forecast_csv, generate_project_breakdown_csv
+from config import settings
+from constants import ForecastSource, ForecastGranularity, ExportPivot, ExportFormat
+from services.manpower import generate_forecast, generate_load_buckets
+from services.daily_load import generate_forecast_materialized, get_pivot_keys, iter_load_buckets, has_load
+from services.sql_forecast import CalendarNotReady, generate_forecast_sql
+from services.work_calendar import load_calendars
+from services.forecast_cache import forecast_cache, forecast_cache_key
+from services.export import iter_csv, forecast_rows, project_breakdown_rows, write_xlsx, iter_file
 from api.auth import get_current_active_user
+from services.principal_cache import Principal
 
 router = APIRouter(prefix="/api/forecasts", tags=["forecasts"])
 
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+XLSX_SPOOL_SIZE = 8 * 1024 * 1024  # Workbooks larger than this are spooled to disk
+
+
+def company_forecast(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    granularity: str,
+    project_ids: Optional[List[int]] = None,
+    crew_type_ids: Optional[List[int]] = None,
+    subcontractor_names: Optional[List[str]] = None
+) -> dict:
+    """Company-wide forecast from the configured source (cached per data version)."""
+    key = forecast_cache_key(
+        db, start_date, end_date, granularity, project_ids, crew_type_ids, subcontractor_names
+    )
+    return forecast_cache.get_or_compute(key, lambda: _compute_company_forecast(
+        db, start_date, end_date, granularity, project_ids, crew_type_ids, subcontractor_names
+    ))
+
+
+def _compute_company_forecast(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    granularity: str,
+    project_ids: Optional[List[int]],
+    crew_type_ids: Optional[List[int]],
+    subcontractor_names: Optional[List[str]]
+) -> dict:
+    """Compute a company-wide forecast from the configured source."""
+    if _reads_daily_load(db):
+        return generate_forecast_materialized(
+            db, start_date, end_date, granularity, project_ids, crew_type_ids, subcontractor_names
+        )
+    if settings.forecast_source == ForecastSource.SQL:
+        try:
+            return generate_forecast_sql(
+                db, start_date, end_date, granularity, project_ids, crew_type_ids, subcontractor_names
+            )
+        except CalendarNotReady as e:
+            logger.warning(f"{e}; using the live engine")
+
+    phases = crud.get_active_phases_in_date_range(
+        db, start_date, end_date, project_ids, crew_type_ids, subcontractor_names
+    )
+    return generate_forecast(phases, start_date, end_date, granularity, calendars=load_calendars(db))
+
+
+def _reads_daily_load(db: Session) -> bool:
+    """
+    Whether forecasts and exports read the phase_daily_load table.
+
+    Only with FORECAST_SOURCE=materialized, and only once the table has
+    rows: a database migrated without rebuild_daily_load.py falls back to
+    the live engine.
+    """
+    if settings.forecast_source != ForecastSource.MATERIALIZED:
+        return False
+    if has_load(db):
+        return True
+    logger.warning("phase_daily_load is empty (run rebuild_daily_load.py); using the live engine")
+    return False
+
 
 @router.get("/company-wide", response_model=schemas.ManpowerForecast)
 def get_company_wide_forecast(
@@ -22,7 +97,7 @@ def get_company_wide_forecast(
     crew_type_ids: Optional[str] = Query(None, description="Comma-separated crew type IDs"),
     granularity: str = Query("weekly", description="weekly or monthly"),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Get company-wide manpower forecast.
@@ -48,27 +123,33 @@ def get_company_wide_forecast(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid crew_type_ids format")
     
-    # Get active phases in date range
-    phases = crud.get_active_phases_in_date_range(
+    # Generate forecast
+    forecast = company_forecast(
         db,
         start_date,
         end_date,
+        granularity,
         project_ids=project_id_list,
         crew_type_ids=crew_type_id_list
     )
     
-    # Generate forecast
-    forecast = generate_forecast(phases, start_date, end_date, granularity)
-    
     return forecast
 
 
+@router.get("/cache-stats")
+def get_forecast_cache_stats(
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Get forecast cache hit/miss counters."""
+    return forecast_cache.stats()
+
+
 @router.get("/project/{project_id}", response_model=schemas.ManpowerForecast)
 def get_project_forecast(
     project_id: int,
     granularity: str = Query("weekly", description="weekly or monthly"),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Get manpower forecast for a single project.
@@ -99,7 +180,9 @@ def get_project_forecast(
         }
     
     # Use schedule dates as range
-    forecast = generate_forecast(phases, schedule.start_date, schedule.end_date, granularity)
+    forecast = generate_forecast(
+        phases, schedule.start_date, schedule.end_date, granularity, calendars=load_calendars(db)
+    )
     
     return forecast
 
@@ -111,14 +194,31 @@ def export_company_forecast(
     project_ids: Optional[str] = Query(None),
     crew_type_ids: Optional[str] = Query(None),
     subcontractor_names: Optional[str] = Query(None),
-    granularity: str = Query("weekly"),
+    granularity: str = Query("weekly", description="daily, weekly or monthly"),
     export_type: str = Query("forecast", description="forecast or projects"),
+    pivot: Optional[str] = Query(None, description="crew_type or project: one man-hours column per crew type / project"),
+    file_format: str = Query(ExportFormat.CSV, alias="format", description="csv or xlsx"),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
-    Export company-wide forecast as CSV.
+    Export company-wide forecast as CSV or XLSX.
+
+    Every sheet and CSV comes from the configured forecast source, so they
+    agree with each other and with GET /company-wide: the materialized
+    daily load is streamed from the database (CSV row by row); otherwise
+    the same buckets are computed from the phases with the forecast engine
+    (settings.forecast_engine), once for every sheet.
+    XLSX has one sheet per view: Forecast, By Crew Type, By Project and
+    Projects.
     """
+    if granularity not in ForecastGranularity.ALL:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of: {', '.join(ForecastGranularity.ALL)}")
+    if pivot is not None and pivot not in ExportPivot.ALL:
+        raise HTTPException(status_code=400, detail=f"pivot must be one of: {', '.join(ExportPivot.ALL)}")
+    if file_format not in ExportFormat.ALL:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(ExportFormat.ALL)}")
+
     # Parse IDs
     project_id_list = None
     if project_ids:
@@ -139,22 +239,109 @@ def export_company_forecast(
     if subcontractor_names:
         subcontractor_name_list = [name.strip() for name in subcontractor_names.split(',')]
 
-    # Get phases and generate forecast
-    phases = crud.get_active_phases_in_date_range(
-        db, start_date, end_date, project_id_list, crew_type_id_list, subcontractor_name_list
-    )
-    forecast = generate_forecast(phases, start_date, end_date, granularity)
-    
+    filters = (project_id_list, crew_type_id_list, subcontractor_name_list)
+
+    # Buckets computed live (None: read from the phase_daily_load table)
+    live_buckets = None
+    if (file_format == ExportFormat.XLSX or export_type != "projects") and not _reads_daily_load(db):
+        phases = crud.get_active_phases_in_date_range(db, start_date, end_date, *filters)
+        live_buckets = generate_load_buckets(phases, start_date, end_date, granularity, calendars=load_calendars(db))
+
+    if file_format == ExportFormat.XLSX:
+        forecast = company_forecast(db, start_date, end_date, granularity, *filters)
+        sheets = [
+            (title, forecast_rows(
+                _load_buckets(db, live_buckets, start_date, end_date, granularity, sheet_pivot, filters),
+                granularity,
+                _pivot_columns(db, live_buckets, sheet_pivot, start_date, end_date, *filters)
+            ))
+            for title, sheet_pivot in [
+                ("Forecast", None), ("By Crew Type", ExportPivot.CREW_TYPE), ("By Project", ExportPivot.PROJECT)
+            ]
+        ]
+        sheets.append(("Projects", project_breakdown_rows(forecast['projects_included'])))
+        workbook = tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_SIZE)
+        write_xlsx(sheets, workbook)
+        filename = f"manpower_forecast_{granularity}_{start_date}_{end_date}.xlsx"
+        return StreamingResponse(
+            iter_file(workbook),
+            media_type=XLSX_MEDIA_TYPE,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
     # Generate CSV based on export type
     if export_type == "projects":
-        csv_content = generate_project_breakdown_csv(forecast['projects_included'])
+        forecast = company_forecast(db, start_date, end_date, granularity, *filters)
+        lines = iter_csv(project_breakdown_rows(forecast['projects_included']))
         filename = f"project_breakdown_{start_date}_{end_date}.csv"
     else:
-        csv_content = generate_forecast_csv(forecast, granularity)
+        pivot_columns = _pivot_columns(db, live_buckets, pivot, start_date, end_date, *filters)
+        if live_buckets is None:
+            lines = _stream_forecast_csv(
+                db.get_bind(), start_date, end_date, granularity, pivot, pivot_columns, filters
+            )
+        else:
+            lines = iter_csv(forecast_rows(_split_buckets(live_buckets, pivot), granularity, pivot_columns))
         filename = f"manpower_forecast_{granularity}_{start_date}_{end_date}.csv"
-    
-    return Response(
-        content=csv_content,
+
+    return StreamingResponse(
+        lines,
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
+
+
+def _split_buckets(live_buckets: List[tuple], pivot: Optional[str]):
+    """(bucket, total cents, {pivot key: cents}) from generate_load_buckets output."""
+    for bucket, cents, splits in live_buckets:
+        yield bucket, cents, splits.get(pivot, {})
+
+
+def _load_buckets(db: Session, live_buckets: Optional[List[tuple]], start_date, end_date, granularity, pivot,
+                  filters):
+    """Export buckets from the live buckets, or from the phase_daily_load table if live_buckets is None."""
+    if live_buckets is None:
+        return iter_load_buckets(db, start_date, end_date, granularity, pivot, *filters)
+    return _split_buckets(live_buckets, pivot)
+
+
+def _pivot_columns(
+    db: Session,
+    live_buckets: Optional[List[tuple]],
+    pivot: Optional[str],
+    start_date: date,
+    end_date: date,
+    project_ids: Optional[List[int]],
+    crew_type_ids: Optional[List[int]],
+    subcontractor_names: Optional[List[str]]
+) -> List[tuple]:
+    """(pivot key, column label) for the crew types / projects with load in the window."""
+    if pivot is None:
+        return []
+    if live_buckets is None:
+        keys = get_pivot_keys(db, pivot, start_date, end_date, project_ids, crew_type_ids, subcontractor_names)
+    else:
+        keys = sorted(
+            {key for _, _, splits in live_buckets for key in splits[pivot]},
+            key=lambda key: (key is None, key or 0)
+        )
+    if pivot == ExportPivot.CREW_TYPE:
+        names = {crew_type.id: crew_type.name for crew_type in crud.get_crew_types(db)}
+    else:
+        names = dict(db.query(models.Project.id, models.Project.name).filter(models.Project.id.in_(keys)).all())
+    return [(key, names.get(key) or "Unassigned") for key in keys]
+
+
+def _stream_forecast_csv(bind, start_date, end_date, granularity, pivot, pivot_columns, filters):
+    """
+    Forecast CSV lines read with a session of their own.
+
+    The request's session is closed when the endpoint returns, before
+    StreamingResponse starts pulling rows.
+    """
+    with Session(bind=bind) as session:
+        yield from iter_csv(forecast_rows(
+            iter_load_buckets(session, start_date, end_date, granularity, pivot, *filters),
+            granularity,
+            pivot_columns
+        ))
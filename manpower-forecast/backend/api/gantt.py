@@ -0,0 +1,84 @@
+"""Company Gantt timeline API endpoints."""
+import hashlib
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+import schemas
+from database import get_db
+from api.auth import get_current_active_user
+from services.principal_cache import Principal
+from api.projects import etag_matches
+from api.subcontractor_reports import parse_subcontractor_names
+from constants import ProjectStatus, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from services import gantt_layout
+from services.pdf_cache import export_fingerprint
+
+router = APIRouter(prefix="/api/gantt", tags=["gantt"])
+
+
+@router.get("/", response_model=schemas.GanttTimeline)
+def get_gantt(
+    project_ids: Optional[str] = Query(None, description="Comma-separated project IDs"),
+    subcontractor_names: Optional[str] = Query(None, description="Comma-separated subcontractor names"),
+    status: Optional[str] = Query(None, description="active or prospective (default: both)"),
+    trade: Optional[str] = Query(None, description="mechanical, electrical or vesda"),
+    aws: Optional[str] = Query(None, description="aws or standard (default: both)"),
+    start_date: Optional[date] = Query(None, description="Date window start (bars are clipped to it)"),
+    end_date: Optional[date] = Query(None, description="Date window end"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Get the company schedule as Gantt rows, the same rows the schedule PDF draws.
+
+    Rows are sorted by project name; offset / limit select a window of them
+    and total_rows counts all matching rows, so a client can virtual-scroll.
+    The timeline covers every matching row (not just the window) or the
+    date window if one is given; rows outside the date window are left out
+    and bar_start / bar_end are clipped to it. The weak ETag changes with
+    the data, the parameters and the day.
+    """
+    if status and status not in ProjectStatus.SCHEDULABLE:
+        raise HTTPException(status_code=400, detail=f"status must be one of: {', '.join(ProjectStatus.SCHEDULABLE)}")
+    if trade and trade not in gantt_layout.TRADE_FLAGS:
+        raise HTTPException(status_code=400, detail=f"trade must be one of: {', '.join(gantt_layout.TRADE_FLAGS)}")
+    if aws and aws not in gantt_layout.AWS_FILTERS:
+        raise HTTPException(status_code=400, detail=f"aws must be one of: {', '.join(gantt_layout.AWS_FILTERS)}")
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+
+    project_id_list = None
+    if project_ids:
+        try:
+            project_id_list = [int(id.strip()) for id in project_ids.split(',')]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="project_ids must be comma-separated integers")
+    subcontractor_name_list = parse_subcontractor_names(subcontractor_names)
+
+    today = date.today()
+    fingerprint = repr((export_fingerprint(db), project_id_list, subcontractor_name_list, status, trade, aws,
+                        start_date, end_date, offset, limit, today))
+    etag = f'W/"{hashlib.sha256(fingerprint.encode()).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    rows = gantt_layout.get_rows(db, project_id_list, subcontractor_name_list, today)
+    rows = gantt_layout.filter_rows(rows, status, trade, aws)
+    timeline_start, timeline_end = gantt_layout.timeline_range(rows, today)
+    rows = gantt_layout.clip_rows(rows, start_date, end_date)
+
+    timeline = schemas.GanttTimeline(
+        as_of=today,
+        timeline_start=start_date or timeline_start,
+        timeline_end=end_date or timeline_end,
+        total_rows=len(rows),
+        offset=offset,
+        limit=limit,
+        columns=gantt_layout.columnar(rows[offset:offset + limit]),
+    )
+    return Response(content=timeline.model_dump_json(), media_type="application/json", headers=headers)
@@ -1,35 +1,152 @@
 """Project API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import base64
+import binascii
+import hashlib
+from functools import lru_cache
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response
+from pydantic import ConfigDict, TypeAdapter, create_model
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only, raiseload, selectinload
+from typing import List, Optional, Tuple
 import crud
+import crud_async
 import schemas
 import models
-from database import get_db
+from database import get_db, get_async_db
 from api.auth import get_current_active_user
+from services.principal_cache import Principal
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
+# schemas.Project fields that are backed by a differently named column
+_FIELD_COLUMNS = {'total_scheduled_hours': 'scheduled_hours'}
+
+
+def _encode_cursor(project_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{project_id}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> int:
+    """Project ID a cursor points after (400 for anything that is not ours)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, project_id = raw.split(":", 1)
+        if prefix != "id":
+            raise ValueError(raw)
+        return int(project_id)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Validated sparse fieldset (always including id), or None for the full schema."""
+    if not fields:
+        return None
+    requested = tuple(dict.fromkeys(name.strip() for name in fields.split(',') if name.strip()))
+    unknown = [name for name in requested if name not in schemas.Project.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    if 'id' not in requested:
+        requested = ('id',) + requested
+    return requested
+
+
+def _check_work_calendar(db: Session, calendar_id: Optional[int]) -> None:
+    """400 for a work_calendar_id that does not exist (None = default calendar)."""
+    if calendar_id is not None and not crud.get_work_calendar(db, calendar_id):
+        raise HTTPException(status_code=400, detail=f"Work calendar {calendar_id} not found")
+
+
+@lru_cache(maxsize=64)
+def _projects_adapter(fields: Optional[Tuple[str, ...]]) -> TypeAdapter:
+    """Serializer for a list of projects restricted to fields (None = schemas.Project)."""
+    if fields is None:
+        return TypeAdapter(List[schemas.Project])
+    project_fields = schemas.Project.model_fields
+    model = create_model(
+        'ProjectFields',
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (project_fields[name].annotation, project_fields[name]) for name in fields}
+    )
+    return TypeAdapter(List[model])
+
+
+def _fields_loader_options(fields: Tuple[str, ...]) -> list:
+    """Load only the columns behind fields; subcontractors only when requested."""
+    columns = [
+        getattr(models.Project, _FIELD_COLUMNS.get(name, name))
+        for name in fields if name != 'subcontractors'
+    ]
+    return [
+        load_only(*columns),
+        selectinload(models.Project.subcontractors) if 'subcontractors' in fields
+        else raiseload(models.Project.subcontractors),
+        raiseload(models.Project.schedules),
+        raiseload(models.Project.work_calendar),
+    ]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against etag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or etag.removeprefix('W/') in [tag.removeprefix('W/') for tag in candidates]
+
 
 @router.get("/", response_model=List[schemas.Project])
-def list_projects(
+async def list_projects(
     skip: int = 0,
-    limit: int = 250,
+    limit: int = Query(250, ge=1),
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (keyset pagination)"),
+    fields: Optional[str] = Query(None, description="Comma-separated schemas.Project fields to return"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    """Get list of projects."""
-    return crud.get_projects(db, skip=skip, limit=limit, status=status)
+    """
+    Get list of projects, ordered by ID.
+
+    Pass the X-Next-Cursor response header back as cursor for the next page
+    (no header = last page). The weak ETag changes whenever a project in the
+    listing does; a matching If-None-Match returns 304 without loading rows.
+    """
+    after_id = _decode_cursor(cursor) if cursor else None
+    field_names = _parse_fields(fields)
+
+    count, last_updated = await crud_async.get_projects_fingerprint(db, status)
+    version = await crud_async.get_data_version(db)
+    fingerprint = repr((version, count, last_updated, status, after_id, skip, limit, field_names))
+    etag = f'W/"{hashlib.sha256(fingerprint.encode()).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    projects = await crud_async.get_projects(
+        db, skip=skip, limit=limit + 1, status=status, after_id=after_id,
+        options=_fields_loader_options(field_names) if field_names else None
+    )
+    if len(projects) > limit:
+        projects = projects[:limit]
+        headers["X-Next-Cursor"] = _encode_cursor(projects[-1].id)
+
+    adapter = _projects_adapter(field_names)
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(projects)),
+        media_type="application/json",
+        headers=headers
+    )
 
 
 @router.post("/", response_model=schemas.Project)
 def create_project(
     project: schemas.ProjectCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Create a new project and auto-create a schedule if dates are provided."""
+    _check_work_calendar(db, project.work_calendar_id)
     db_project = crud.create_project(db, project)
 
     # Auto-create schedule if start and end dates are provided
@@ -46,13 +163,13 @@ def create_project(
 
 
 @router.get("/{project_id}", response_model=schemas.Project)
-def get_project(
+async def get_project(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Get project by ID."""
-    project = crud.get_project(db, project_id)
+    project = await crud_async.get_project(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
@@ -63,9 +180,10 @@ def update_project(
     project_id: int,
     project: schemas.ProjectUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Update project."""
+    _check_work_calendar(db, project.work_calendar_id)
     updated_project = crud.update_project(db, project_id, project)
     if not updated_project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -76,7 +194,7 @@ def update_project(
 def delete_project(
     project_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Delete project."""
     success = crud.delete_project(db, project_id)
@@ -86,18 +204,17 @@ def delete_project(
 
 
 @router.get("/{project_id}/schedule", response_model=schemas.ProjectSchedule)
-def get_project_schedule(
+async def get_project_schedule(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Get project schedule."""
     # First check if project exists
-    project = crud.get_project(db, project_id)
-    if not project:
+    if not await crud_async.project_exists(db, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
 
-    schedule = crud.get_project_schedule(db, project_id)
+    schedule = await crud_async.get_project_schedule(db, project_id)
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found for this project")
     return schedule
@@ -108,7 +225,7 @@ def create_project_schedule(
     project_id: int,
     schedule: schemas.ProjectScheduleCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Create or update project schedule."""
     # Check if project exists
@@ -123,7 +240,7 @@ def create_project_schedule(
 def delete_project_schedule(
     project_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Delete project schedule."""
     schedule = crud.get_project_schedule(db, project_id)
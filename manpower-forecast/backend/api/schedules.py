@@ -1,12 +1,14 @@
 """Schedule and phase API endpoints."""
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 import crud
+import crud_async
 import schemas
-import models
-from database import get_db
+from database import get_db, get_async_db
 from api.auth import get_current_active_user
+from services.principal_cache import Principal
 
 router = APIRouter(prefix="/api", tags=["schedules"])
 
@@ -20,7 +22,7 @@ def update_schedule(
     schedule_id: int,
     schedule: schemas.ProjectScheduleUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Update project schedule."""
     updated_schedule = crud.update_project_schedule(db, schedule_id, schedule)
@@ -34,13 +36,13 @@ def update_schedule(
 # ============================================
 
 @router.get("/schedules/{schedule_id}/phases", response_model=List[schemas.SchedulePhase])
-def list_phases(
+async def list_phases(
     schedule_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Get all phases for a schedule."""
-    return crud.get_schedule_phases(db, schedule_id)
+    return await crud_async.get_schedule_phases(db, schedule_id)
 
 
 @router.post("/schedules/{schedule_id}/phases", response_model=schemas.SchedulePhase)
@@ -48,20 +50,20 @@ def create_phase(
     schedule_id: int,
     phase: schemas.SchedulePhaseCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Add a phase to a schedule."""
     return crud.create_schedule_phase(db, schedule_id, phase)
 
 
 @router.get("/phases/{phase_id}", response_model=schemas.SchedulePhase)
-def get_phase(
+async def get_phase(
     phase_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Get phase by ID."""
-    phase = crud.get_schedule_phase(db, phase_id)
+    phase = await crud_async.get_schedule_phase(db, phase_id)
     if not phase:
         raise HTTPException(status_code=404, detail="Phase not found")
     return phase
@@ -72,7 +74,7 @@ def update_phase(
     phase_id: int,
     phase: schemas.SchedulePhaseUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Update phase."""
     updated_phase = crud.update_schedule_phase(db, phase_id, phase)
@@ -85,7 +87,7 @@ def update_phase(
 def delete_phase(
     phase_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Delete phase."""
     success = crud.delete_schedule_phase(db, phase_id)
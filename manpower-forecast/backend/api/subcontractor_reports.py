@@ -1,14 +1,19 @@
 """Subcontractor report API endpoints."""
+import tempfile
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
 from datetime import date
-from decimal import Decimal
-import crud
 import schemas
-import models
 from database import get_db
 from api.auth import get_current_active_user
+from services.principal_cache import Principal
+from api.forecasts import XLSX_MEDIA_TYPE, XLSX_SPOOL_SIZE
+from constants import ExportFormat
+from services import subcontractor_report, subcontractor_utilization
+from services.subcontractor_utilization import DEFAULT_HORIZON_WEEKS, MAX_HORIZON_WEEKS
+from services.export import iter_csv, write_xlsx, iter_file
 
 router = APIRouter(prefix="/api/reports", tags=["subcontractor-reports"])
 
@@ -18,7 +23,7 @@ VALID_SUBCONTRACTORS = ["Dynalectric", "Federal Fire", "Fuentes", "Power Solutio
 
 @router.get("/subcontractors")
 def list_subcontractors(
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Get list of available subcontractors."""
     return {"subcontractors": VALID_SUBCONTRACTORS}
@@ -30,12 +35,13 @@ def get_subcontractor_report(
     start_date: Optional[date] = Query(None, description="Filter by start date"),
     end_date: Optional[date] = Query(None, description="Filter by end date"),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     Get labor report for a specific subcontractor.
 
-    Shows all projects and phases assigned to this subcontractor.
+    Shows all projects and phases assigned to this subcontractor, with the
+    hours the forecast schedules for each phase.
     """
     # Validate subcontractor name
     if subcontractor_name not in VALID_SUBCONTRACTORS:
@@ -44,55 +50,75 @@ def get_subcontractor_report(
             detail=f"Invalid subcontractor. Must be one of: {', '.join(VALID_SUBCONTRACTORS)}"
         )
 
-    # Get all projects assigned to this subcontractor
-    project_assignments = crud.get_projects_by_subcontractor(
-        db, subcontractor_name, start_date, end_date
+    return subcontractor_report.get_subcontractor_report(db, subcontractor_name, start_date, end_date)
+
+
+def parse_subcontractor_names(subcontractor_names: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated subcontractor names (None for all), validated."""
+    if not subcontractor_names:
+        return None
+    names = [name.strip() for name in subcontractor_names.split(',') if name.strip()]
+    invalid = [name for name in names if name not in VALID_SUBCONTRACTORS]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid subcontractor. Must be one of: {', '.join(VALID_SUBCONTRACTORS)}"
+        )
+    return names
+
+
+@router.get("/utilization", response_model=schemas.UtilizationReport)
+def get_subcontractor_utilization(
+    start_date: Optional[date] = Query(None, description="First week (default: this week)"),
+    weeks: int = Query(DEFAULT_HORIZON_WEEKS, ge=1, le=MAX_HORIZON_WEEKS, description="Horizon in weeks"),
+    subcontractor_names: Optional[str] = Query(None, description="Comma-separated subcontractors (default: all)"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Get weekly man-hours and implied headcount per subcontractor and labor type.
+
+    Weekly values are columnar: the n-th entry of every list belongs to
+    the n-th entry of weeks.
+    """
+    return subcontractor_utilization.get_utilization(
+        db, start_date or date.today(), weeks, parse_subcontractor_names(subcontractor_names)
     )
 
-    total_man_hours = Decimal('0')
-    projects_info = []
 
-    for project, labor_type in project_assignments:
-        # Get phases for this project
-        phases = crud.get_project_phases_for_labor_type(
-            db, project.id, labor_type, start_date, end_date
+@router.get("/utilization/export")
+def export_subcontractor_utilization(
+    start_date: Optional[date] = Query(None, description="First week (default: this week)"),
+    weeks: int = Query(DEFAULT_HORIZON_WEEKS, ge=1, le=MAX_HORIZON_WEEKS, description="Horizon in weeks"),
+    subcontractor_names: Optional[str] = Query(None, description="Comma-separated subcontractors (default: all)"),
+    file_format: str = Query(ExportFormat.CSV, alias="format", description="csv or xlsx"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Export subcontractor utilization as CSV or XLSX (one row per
+    subcontractor, labor type and week). The PDF is GET /api/export/pdf/utilization.
+    """
+    if file_format not in ExportFormat.ALL:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(ExportFormat.ALL)}")
+
+    utilization = subcontractor_utilization.get_utilization(
+        db, start_date or date.today(), weeks, parse_subcontractor_names(subcontractor_names)
+    )
+    rows = subcontractor_utilization.utilization_rows(utilization)
+    filename = f"subcontractor_utilization_{utilization['start_date']}_{utilization['end_date']}"
+
+    if file_format == ExportFormat.XLSX:
+        workbook = tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_SIZE)
+        write_xlsx([("Utilization", rows)], workbook)
+        return StreamingResponse(
+            iter_file(workbook),
+            media_type=XLSX_MEDIA_TYPE,
+            headers={"Content-Disposition": f"attachment; filename={filename}.xlsx"}
         )
 
-        phases_info = []
-        project_hours = Decimal('0')
-
-        for phase in phases:
-            # Calculate man hours for this phase
-            if phase.estimated_man_hours:
-                phase_hours = Decimal(str(phase.estimated_man_hours))
-            elif phase.crew_size:
-                duration_days = (phase.end_date - phase.start_date).days + 1
-                phase_hours = Decimal(str(phase.crew_size)) * Decimal('8') * Decimal(str(duration_days))
-            else:
-                phase_hours = Decimal('0')
-
-            project_hours += phase_hours
-
-            phases_info.append({
-                "phase_name": phase.phase_name,
-                "start_date": phase.start_date,
-                "end_date": phase.end_date,
-                "man_hours": phase_hours
-            })
-
-        total_man_hours += project_hours
-
-        projects_info.append({
-            "project_id": project.id,
-            "project_name": project.name,
-            "project_number": project.project_number,
-            "labor_type": labor_type,
-            "phases": phases_info,
-            "total_project_hours": project_hours
-        })
-
-    return {
-        "subcontractor_name": subcontractor_name,
-        "total_man_hours": total_man_hours,
-        "projects": projects_info
-    }
+    return StreamingResponse(
+        iter_csv(rows),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
+    )
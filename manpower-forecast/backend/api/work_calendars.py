@@ -0,0 +1,140 @@
+"""Work calendar and holiday API endpoints."""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+import crud
+import crud_async
+import schemas
+from database import get_db, get_async_db
+from api.auth import get_current_active_user
+from services.principal_cache import Principal
+from services.work_calendar import load_calendars
+
+router = APIRouter(prefix="/api/work-calendars", tags=["work-calendars"])
+
+
+@router.get("/", response_model=List[schemas.WorkCalendar])
+async def list_work_calendars(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Get all work calendars."""
+    return await crud_async.get_work_calendars(db)
+
+
+@router.post("/", response_model=schemas.WorkCalendar)
+def create_work_calendar(
+    work_calendar: schemas.WorkCalendarCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Create a new work calendar."""
+    return crud.create_work_calendar(db, work_calendar)
+
+
+@router.get("/holidays", response_model=List[schemas.CalendarHoliday])
+def list_company_holidays(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Get company holidays (apply to every calendar that includes them)."""
+    return crud.get_calendar_holidays(db)
+
+
+@router.post("/holidays", response_model=schemas.CalendarHoliday)
+def create_company_holiday(
+    holiday: schemas.CalendarHolidayCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Add a company holiday."""
+    return crud.create_calendar_holiday(db, holiday)
+
+
+@router.delete("/holidays/{holiday_id}")
+def delete_holiday(
+    holiday_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Delete a company or calendar holiday."""
+    success = crud.delete_calendar_holiday(db, holiday_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Holiday not found")
+    return {"message": "Holiday deleted successfully"}
+
+
+@router.get("/working-days")
+def count_working_days(
+    start_date: date = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: date = Query(..., description="End date (YYYY-MM-DD)"),
+    calendar_id: Optional[int] = Query(None, description="Work calendar ID (default calendar if omitted)"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Count working days between two dates (inclusive) on a work calendar."""
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be >= start_date")
+
+    work_calendar = load_calendars(db).get(calendar_id)
+    return {
+        "calendar_id": work_calendar.id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "working_days": work_calendar.count_working_days(start_date, end_date)
+    }
+
+
+@router.get("/{calendar_id}", response_model=schemas.WorkCalendar)
+async def get_work_calendar(
+    calendar_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Get work calendar by ID."""
+    work_calendar = await crud_async.get_work_calendar(db, calendar_id)
+    if not work_calendar:
+        raise HTTPException(status_code=404, detail="Work calendar not found")
+    return work_calendar
+
+
+@router.put("/{calendar_id}", response_model=schemas.WorkCalendar)
+def update_work_calendar(
+    calendar_id: int,
+    work_calendar: schemas.WorkCalendarUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Update work calendar."""
+    updated = crud.update_work_calendar(db, calendar_id, work_calendar)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Work calendar not found")
+    return updated
+
+
+@router.delete("/{calendar_id}")
+def delete_work_calendar(
+    calendar_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Delete work calendar (its projects fall back to the default calendar)."""
+    success = crud.delete_work_calendar(db, calendar_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Work calendar not found")
+    return {"message": "Work calendar deleted successfully"}
+
+
+@router.post("/{calendar_id}/holidays", response_model=schemas.CalendarHoliday)
+def create_calendar_holiday(
+    calendar_id: int,
+    holiday: schemas.CalendarHolidayCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Add a holiday to a work calendar."""
+    if not crud.get_work_calendar(db, calendar_id):
+        raise HTTPException(status_code=404, detail="Work calendar not found")
+    return crud.create_calendar_holiday(db, holiday, calendar_id)
@@ -0,0 +1,59 @@
+"""
+Backfill projects.scheduled_hours and check it against the forecast engine math.
+
+Usage:
+    python backfill_scheduled_hours.py            # backfill, then verify
+    python backfill_scheduled_hours.py --check    # verify only
+
+Exits with status 1 if any stored value disagrees with the recomputed hours.
+"""
+import sys
+from decimal import Decimal
+from sqlalchemy.orm import selectinload
+from database import SessionLocal, engine
+import models
+from services.project_hours import backfill_project_hours, compute_project_hours
+
+# Create tables if they don't exist
+models.Base.metadata.create_all(bind=engine)
+
+
+def verify(db) -> bool:
+    """Compare each project's stored scheduled_hours with a fresh computation."""
+    projects = db.query(models.Project).options(
+        selectinload(models.Project.schedules).selectinload(models.ProjectSchedule.phases)
+    ).order_by(models.Project.id).all()
+
+    mismatches = 0
+    for project in projects:
+        expected = compute_project_hours(db, project)
+        stored = Decimal(str(project.scheduled_hours or 0))
+        if stored != expected:
+            mismatches += 1
+            print(f"  MISMATCH  project {project.id} ({project.name}): stored={stored} expected={expected}")
+    print(f"Checked {len(projects):,} projects, {mismatches:,} mismatches.")
+    return mismatches == 0
+
+
+def main():
+    check_only = "--check" in sys.argv[1:]
+    db = SessionLocal()
+    try:
+        if not check_only:
+            print("Backfilling projects.scheduled_hours...")
+            changed = backfill_project_hours(db)
+            print(f"Updated {changed:,} projects.")
+
+        print("Verifying against the forecast engine working-day math...")
+        ok = verify(db)
+    finally:
+        db.close()
+
+    if not ok:
+        print("\nprojects.scheduled_hours is out of sync.")
+        sys.exit(1)
+    print("\nprojects.scheduled_hours is up to date.")
+
+
+if __name__ == "__main__":
+    main()
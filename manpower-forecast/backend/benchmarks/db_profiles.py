@@ -0,0 +1,203 @@
+"""
+Database engine profile benchmark (engine_profiles.py).
+
+Seeds a database with the PDF render benchmark's synthetic projects and
+runs a mixed workload against it for --seconds under each profile:
+
+- readers (--readers threads): one project page (crud.get_projects) and
+  one project schedule (crud.get_project_schedule), as the project list
+  and the schedule view do,
+- writers (--writers threads): crud.update_project on a random project
+  (notes, required manpower; bumps the data version like the API).
+
+SQLite runs in a temporary file under the "default" profile (rollback
+journal, SQLAlchemy defaults) and the "sqlite" profile (WAL and pragmas).
+With --postgres-url the same workload runs against that database under
+"default" and "postgresql"; it must be a scratch database, the benchmark
+creates and drops its tables.
+
+Per profile it reports reads and writes per second, p50 / p99 latency of
+each and the operations that failed (e.g. "database is locked"). With
+--baseline, cases are compared against a previous result file
+(throughput drop beyond --tolerance).
+
+Usage:
+    python -m benchmarks.db_profiles [--projects N] [--readers N] [--writers N] [--seconds S]
+        [--postgres-url URL] [--output FILE] [--baseline FILE] [--tolerance 0.15]
+"""
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+import crud
+import models
+import schemas
+from constants import DatabaseProfile
+from engine_profiles import create_profiled_engine, resolve_profile
+from benchmarks.pdf_render import seed
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of values (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _read(db: Session, rnd: random.Random, projects: int) -> None:
+    crud.get_projects(db, skip=rnd.randrange(max(projects - 100, 1)), limit=100)
+    crud.get_project_schedule(db, rnd.randint(1, projects))
+
+
+def _write(db: Session, rnd: random.Random, projects: int) -> None:
+    crud.update_project(db, rnd.randint(1, projects), schemas.ProjectUpdate(
+        notes=f"Updated {rnd.random():.6f}", required_manpower=rnd.randint(0, 12)
+    ))
+
+
+def _worker(operation, session_factory, projects: int, seed_value: int, stop: threading.Event,
+            latencies: list, errors: list) -> None:
+    rnd = random.Random(seed_value)
+    while not stop.is_set():
+        with session_factory() as db:
+            started = time.perf_counter()
+            try:
+                operation(db, rnd, projects)
+            except OperationalError as e:
+                errors.append(str(e.orig))
+                continue
+            latencies.append(time.perf_counter() - started)
+
+
+def run_case(database_url: str, profile: str, args) -> dict:
+    engine = create_profiled_engine(database_url, profile)
+    models.Base.metadata.drop_all(engine)
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        seed(db, args.projects, random.Random(0))
+    engine.dispose()  # Workers start from fresh connections (pragmas applied on connect)
+
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    stop = threading.Event()
+    read_latencies, write_latencies, errors = [], [], []
+    threads = [
+        threading.Thread(target=_worker, args=(_read, session_factory, args.projects, i, stop, read_latencies, errors))
+        for i in range(args.readers)
+    ] + [
+        threading.Thread(target=_worker, args=(_write, session_factory, args.projects, 1000 + i, stop,
+                                               write_latencies, errors))
+        for i in range(args.writers)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    models.Base.metadata.drop_all(engine)
+    engine.dispose()
+
+    backend = engine.dialect.name
+    result = {
+        'case': f"{backend}/{resolve_profile(database_url, profile)}",
+        'reads_per_second': round(len(read_latencies) / wall, 1),
+        'writes_per_second': round(len(write_latencies) / wall, 1),
+        'read_p50_ms': round(percentile(read_latencies, 0.50) * 1000, 2),
+        'read_p99_ms': round(percentile(read_latencies, 0.99) * 1000, 2),
+        'write_p50_ms': round(percentile(write_latencies, 0.50) * 1000, 2),
+        'write_p99_ms': round(percentile(write_latencies, 0.99) * 1000, 2),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+    }
+    print(f"{result['case']:>22}  reads {result['reads_per_second']:8.1f}/s "
+          f"(p50 {result['read_p50_ms']:7.2f} ms, p99 {result['read_p99_ms']:8.2f} ms)  "
+          f"writes {result['writes_per_second']:7.1f}/s "
+          f"(p50 {result['write_p50_ms']:7.2f} ms, p99 {result['write_p99_ms']:8.2f} ms)  errors {len(errors)}")
+    return result
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """Print the change of every case against the baseline; returns the regressions."""
+    previous = {r['case']: r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        base = previous.get(result['case'])
+        if base is None:
+            continue
+        changes = []
+        for metric in ('reads_per_second', 'writes_per_second'):
+            change = result[metric] / base[metric] - 1 if base[metric] else 0.0
+            changes.append(f"{metric} {change:+.1%}")
+            if change < -tolerance:
+                regressions.append(f"{result['case']}: {metric} {change:+.1%}")
+        print(f"{result['case']:>22}  " + ", ".join(changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--projects', type=int, default=1000)
+    parser.add_argument('--readers', type=int, default=8, help="reader threads")
+    parser.add_argument('--writers', type=int, default=2, help="writer threads")
+    parser.add_argument('--seconds', type=float, default=10, help="duration of each case")
+    parser.add_argument('--postgres-url', help="scratch PostgreSQL database to run the postgresql cases against")
+    parser.add_argument('--output', default="db_profiles_results.json")
+    parser.add_argument('--baseline', help="result file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="allowed relative throughput drop")
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    sqlite_url = f"sqlite:///{os.path.join(directory.name, 'db_profiles.db')}"
+    cases = [(sqlite_url, DatabaseProfile.DEFAULT), (sqlite_url, DatabaseProfile.SQLITE)]
+    if args.postgres_url:
+        cases += [(args.postgres_url, DatabaseProfile.DEFAULT), (args.postgres_url, DatabaseProfile.POSTGRESQL)]
+    try:
+        results = []
+        for database_url, profile in cases:
+            if database_url == sqlite_url:
+                # A fresh file per case: journal_mode=WAL persists in the database file
+                for suffix in ("", "-wal", "-shm", "-journal"):
+                    path = os.path.join(directory.name, "db_profiles.db" + suffix)
+                    if os.path.exists(path):
+                        os.remove(path)
+            results.append(run_case(database_url, profile, args))
+    finally:
+        directory.cleanup()
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'projects': args.projects,
+            'readers': args.readers,
+            'writers': args.writers,
+            'seconds': args.seconds,
+            'results': results,
+        }, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("FAIL: " + "; ".join(regressions))
+            sys.exit(1)
+        print("OK: no case regressed beyond the tolerance")
+
+
+if __name__ == '__main__':
+    main()
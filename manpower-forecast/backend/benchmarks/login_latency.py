@@ -0,0 +1,212 @@
+"""
+Login latency benchmark (POST /api/auth/token under a burst of logins).
+
+Seeds a temporary SQLite database with --users users and sends one login
+per user through the ASGI app, at most --concurrency at a time, while a
+probe keeps requesting GET /api/auth/me (a cached token: no SQL, no
+bcrypt) to show what the burst does to every other request of the worker.
+Cases:
+
+- inline: bcrypt in the request, as before the hashing pool (0 workers),
+- pool-N: services.passwords.PasswordHasher with N hashing threads.
+
+Per case it reports p50 / p99 login latency, logins per second, the
+logins refused with 503 (queue timeout) and p50 / p99 / max probe
+latency. With --baseline, cases are compared against a previous result
+file (p99 login and probe latency, --tolerance).
+
+Usage:
+    python -m benchmarks.login_latency [--users N] [--concurrency N] [--workers 1,2,4]
+        [--rounds 10] [--queue-timeout 30] [--output FILE] [--baseline FILE] [--tolerance 0.25]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import platform
+import argparse
+import tempfile
+from datetime import datetime
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+import models
+from api import auth as auth_api
+from database import get_async_db
+from main import app
+from services.passwords import PasswordHasher, hash_password
+
+PASSWORD = "shift-start-2026"
+PROBE_INTERVAL = 0.01  # Seconds between probe requests
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of values (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def seed(path: str, users: int, rounds: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(engine)
+    hashed_password = hash_password(PASSWORD, rounds)  # One hash for everyone: seeding is not measured
+    with Session(engine) as db:
+        db.add_all([
+            models.User(email=f"user{i}@example.com", hashed_password=hashed_password, role="viewer", is_active=True)
+            for i in range(users)
+        ])
+        db.commit()
+    engine.dispose()
+
+
+async def run_case(name: str, hasher: PasswordHasher, users: int, concurrency: int) -> dict:
+    auth_api.password_hasher = hasher
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        response = await client.post("/api/auth/token", data={'username': "user0@example.com", 'password': PASSWORD})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        (await client.get("/api/auth/me", headers=headers)).raise_for_status()  # Warm the principal cache
+
+        login_seconds, probe_seconds, refused = [], [], 0
+        slots = asyncio.Semaphore(concurrency)
+        done = asyncio.Event()
+
+        async def login(i: int) -> None:
+            nonlocal refused
+            async with slots:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/auth/token", data={'username': f"user{i}@example.com", 'password': PASSWORD}
+                )
+                elapsed = time.perf_counter() - started
+            if response.status_code == 503:
+                refused += 1
+            else:
+                response.raise_for_status()
+                login_seconds.append(elapsed)
+
+        async def probe() -> None:
+            while not done.is_set():
+                started = time.perf_counter()
+                (await client.get("/api/auth/me", headers=headers)).raise_for_status()
+                probe_seconds.append(time.perf_counter() - started)
+                await asyncio.sleep(PROBE_INTERVAL)
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(users)))
+        wall = time.perf_counter() - started
+        done.set()
+        await probe_task
+    hasher.shutdown()
+
+    result = {
+        'case': name,
+        'logins': len(login_seconds),
+        'refused': refused,
+        'logins_per_second': round(len(login_seconds) / wall, 1),
+        'login_p50_ms': round(percentile(login_seconds, 0.50) * 1000, 1),
+        'login_p99_ms': round(percentile(login_seconds, 0.99) * 1000, 1),
+        'probes': len(probe_seconds),
+        'probe_p50_ms': round(percentile(probe_seconds, 0.50) * 1000, 2),
+        'probe_p99_ms': round(percentile(probe_seconds, 0.99) * 1000, 2),
+        'probe_max_ms': round(max(probe_seconds, default=0) * 1000, 2),
+    }
+    print(f"{name:>8}  login p50 {result['login_p50_ms']:8.1f} ms  p99 {result['login_p99_ms']:8.1f} ms  "
+          f"{result['logins_per_second']:6.1f}/s  refused {refused:3d}  |  "
+          f"probe p50 {result['probe_p50_ms']:7.2f} ms  p99 {result['probe_p99_ms']:8.2f} ms  "
+          f"max {result['probe_max_ms']:8.2f} ms ({len(probe_seconds)} probes)")
+    return result
+
+
+async def run(path: str, args) -> list:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def benchmark_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = benchmark_db
+    try:
+        cases = [('inline', 0)] + [(f"pool-{workers}", workers) for workers in args.workers]
+        results = []
+        for name, workers in cases:
+            hasher = PasswordHasher(max_workers=workers, queue_timeout=args.queue_timeout, rounds=args.rounds)
+            results.append(await run_case(name, hasher, args.users, args.concurrency))
+        return results
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        await engine.dispose()
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """Print the change of every case against the baseline; returns the regressions."""
+    previous = {r['case']: r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        base = previous.get(result['case'])
+        if base is None:
+            continue
+        changes = []
+        for metric in ('login_p99_ms', 'probe_p99_ms'):
+            change = result[metric] / base[metric] - 1 if base[metric] else 0.0
+            changes.append(f"{metric} {change:+.1%}")
+            if change > tolerance:
+                regressions.append(f"{result['case']}: {metric} {change:+.1%}")
+        print(f"{result['case']:>8}  " + ", ".join(changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=100, help="logins in the burst (one per user)")
+    parser.add_argument('--concurrency', type=int, default=50, help="logins in flight at once")
+    parser.add_argument('--workers', default="1,2,4", help="comma-separated hashing pool sizes")
+    parser.add_argument('--rounds', type=int, default=10, help="bcrypt work factor of the seeded hashes")
+    parser.add_argument('--queue-timeout', type=float, default=30,
+                        help="seconds a login may wait for a hashing thread")
+    parser.add_argument('--output', default="login_latency_results.json")
+    parser.add_argument('--baseline', help="result file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative growth vs the baseline")
+    args = parser.parse_args()
+    args.workers = [int(workers) for workers in args.workers.split(',')]
+
+    directory = tempfile.TemporaryDirectory()
+    path = os.path.join(directory.name, "login_latency.db")
+    seed(path, args.users, args.rounds)
+    try:
+        results = asyncio.run(run(path, args))
+    finally:
+        directory.cleanup()
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'users': args.users,
+            'concurrency': args.concurrency,
+            'rounds': args.rounds,
+            'results': results,
+        }, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("FAIL: " + "; ".join(regressions))
+            sys.exit(1)
+        print("OK: no case regressed beyond the tolerance")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""
+PDF rendering benchmark for api/export_pdf.py.
+
+Seeds an in-memory SQLite database with synthetic projects (schedule,
+phases, subcontractor assignments) at each scale, builds the export specs
+with gantt_spec / subcontractor_spec like the endpoints do, and renders
+them in-process through GanttChartPDF.generate and
+SubcontractorReportPDF.generate (all subcontractor reports together).
+Nothing needs a database server or the network.
+
+Per scale and report it records the best wall time of --repeat renders,
+time per page, pages, output bytes and the peak Python memory of one more
+render under tracemalloc (not part of the timings). Renders use a fixed
+run date and seed, so output bytes only change with the layout.
+
+Results are written as JSON (--output). With --baseline, each case is
+compared against a previous result file and the run fails if wall time
+or peak memory grew by more than --tolerance.
+
+Usage:
+    python -m benchmarks.pdf_render [--scales 50,500,5000] [--repeat N]
+        [--output FILE] [--baseline FILE] [--tolerance 0.15]
+"""
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tracemalloc
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import reportlab
+from reportlab.lib.pagesizes import letter, landscape
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+import models
+from api.export_pdf import GanttChartPDF, SubcontractorReportPDF, gantt_spec, subcontractor_spec
+from api.subcontractor_reports import VALID_SUBCONTRACTORS
+from services.subcontractor_report import report_cache
+
+DEFAULT_SCALES = (50, 500, 5000)
+AS_OF = datetime(2026, 1, 5, 7, 0)  # Fixed run date: repeatable output bytes
+WORDS = ["Riverside", "Medical", "Center", "Tower", "Phase", "II", "Warehouse", "Distribution",
+         "Hangar", "Data", "Hall", "Northwest", "Terminal", "Expansion", "Mixed-Use", "Garage"]
+LABOR_TYPES = ["sprinkler", "vesda", "electrical"]
+COMPARED = ('wall_seconds', 'peak_memory_bytes')
+
+
+def seed(db: Session, num_projects: int, rnd: random.Random) -> None:
+    """Insert num_projects projects, each with an active schedule, 2-8 phases and 1-3 subcontractors."""
+    projects, schedules, phases, subcontractors = [], [], [], []
+    for project_id in range(1, num_projects + 1):
+        start = date(2025, 6, 2) + timedelta(days=rnd.randint(0, 540))
+        end = start + timedelta(days=rnd.randint(60, 420))
+        projects.append({
+            'id': project_id,
+            'name': " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 6))),
+            'project_number': f"P{project_id:05d}",
+            'status': rnd.choice(['active', 'active', 'prospective']),
+            'start_date': start,
+            'end_date': end,
+            'required_manpower': rnd.randint(0, 12),
+            'bfpe_sprinkler_headcount': rnd.randint(0, 6),
+            'bfpe_vesda_headcount': rnd.randint(0, 2),
+            'bfpe_electrical_headcount': rnd.randint(0, 2),
+            'is_aws': rnd.random() < 0.3,
+            'is_mechanical': rnd.random() < 0.3,
+            'is_electrical': rnd.random() < 0.3,
+            'is_vesda': rnd.random() < 0.3,
+            'is_out_of_town': rnd.random() < 0.1,
+        })
+        schedules.append({'id': project_id, 'project_id': project_id, 'start_date': start,
+                          'end_date': end, 'is_active': True})
+        span = (end - start).days
+        for k in range(rnd.randint(2, 8)):
+            phase_start = start + timedelta(days=rnd.randint(0, span))
+            phases.append({
+                'schedule_id': project_id,
+                'phase_name': f"Phase {k + 1}",
+                'start_date': phase_start,
+                'end_date': min(end, phase_start + timedelta(days=rnd.randint(5, 90))),
+                'estimated_man_hours': Decimal(rnd.randint(40, 2000)) if rnd.random() < 0.7 else None,
+                'crew_size': Decimal(rnd.randint(1, 8)),
+                'sort_order': k,
+            })
+        for name in rnd.sample(VALID_SUBCONTRACTORS, rnd.randint(1, 3)):
+            subcontractors.append({'project_id': project_id, 'subcontractor_name': name,
+                                   'labor_type': rnd.choice(LABOR_TYPES), 'headcount': rnd.randint(0, 6)})
+    for model, rows in ((models.Project, projects), (models.ProjectSchedule, schedules),
+                        (models.SchedulePhase, phases), (models.ProjectSubcontractor, subcontractors)):
+        db.execute(insert(model), rows)
+    db.commit()
+
+
+def _render_gantt(spec: dict) -> tuple:
+    pdf = GanttChartPDF(page_size=landscape(letter))
+    buffer = pdf.generate(
+        projects=spec['projects'], spans=spec['spans'], project_name=spec['title'],
+        company_name="BFPE International", subcontractor_filter=spec['subcontractor_filter'],
+        project_subcontractors=spec['project_subcontractors'], as_of=spec['as_of']
+    )
+    return pdf.total_pages, len(buffer.getvalue())
+
+
+def _render_subcontractors(specs: list) -> tuple:
+    pages = size = 0
+    for spec in specs:
+        pdf = SubcontractorReportPDF(page_size=letter, calendars=spec['calendars'])
+        buffer = pdf.generate(
+            subcontractor_name=spec['subcontractor_name'], projects_data=spec['projects_data'],
+            total_hours=spec['total_hours'], start_date=spec['start_date'], end_date=spec['end_date'],
+            as_of=spec['as_of']
+        )
+        pages += pdf.total_pages
+        size += len(buffer.getvalue())
+    return pages, size
+
+
+def measure(render, spec, repeat: int, memory: bool = True) -> dict:
+    """Best wall time of repeat renders, plus one render under tracemalloc for peak memory."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        pages, size = render(spec)
+        best = min(best, time.perf_counter() - started)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            render(spec)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        'wall_seconds': round(best, 4),
+        'pages': pages,
+        'seconds_per_page': round(best / pages, 5),
+        'peak_memory_bytes': peak,
+        'output_bytes': size,
+    }
+
+
+def run(scales, repeat: int, memory: bool = True) -> list:
+    results = []
+    for scale in scales:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        models.Base.metadata.create_all(engine)
+        # Every fresh database is at data version 0, so cached reports would leak between scales
+        report_cache.clear()
+        with Session(engine) as db:
+            seed(db, scale, random.Random(scale))
+            cases = [
+                ('gantt', _render_gantt, gantt_spec(db, as_of=AS_OF)),
+                ('subcontractor', _render_subcontractors,
+                 [subcontractor_spec(db, name, as_of=AS_OF) for name in VALID_SUBCONTRACTORS]),
+            ]
+        engine.dispose()
+        for report, render, spec in cases:
+            result = {'scale': scale, 'report': report, **measure(render, spec, repeat, memory)}
+            results.append(result)
+            print(f"{scale:>6} projects  {report:<14} {result['wall_seconds']:8.3f}s  "
+                  f"{result['pages']:>5} pages  {result['seconds_per_page'] * 1000:7.2f} ms/page  "
+                  f"{result['output_bytes'] / 1024:9.1f} KB  "
+                  + (f"{result['peak_memory_bytes'] / 2 ** 20:7.1f} MB peak" if memory else ""))
+    return results
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """Print the change of every case against the baseline; returns the regressions."""
+    previous = {(r['scale'], r['report']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        base = previous.get((result['scale'], result['report']))
+        if base is None:
+            continue
+        changes = []
+        for metric in COMPARED:
+            if not base.get(metric) or result.get(metric) is None:
+                continue
+            change = result[metric] / base[metric] - 1
+            changes.append(f"{metric} {change:+.1%}")
+            if change > tolerance:
+                regressions.append(f"{result['scale']} {result['report']}: {metric} {change:+.1%}")
+        if result['output_bytes'] != base['output_bytes']:
+            changes.append(f"output_bytes {base['output_bytes']} -> {result['output_bytes']}")
+        print(f"{result['scale']:>6} projects  {result['report']:<14} " + ", ".join(changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', default=",".join(map(str, DEFAULT_SCALES)),
+                        help="comma-separated project counts")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc render")
+    parser.add_argument('--output', default="pdf_render_results.json")
+    parser.add_argument('--baseline', help="result file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="allowed relative growth")
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(',')]
+    results = run(scales, args.repeat, memory=not args.no_memory)
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'reportlab': reportlab.Version,
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("FAIL: " + "; ".join(regressions))
+            sys.exit(1)
+        print(f"OK: no case regressed by more than {args.tolerance:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+Single-project PDF export benchmark (GET /api/export/pdf/project/{id}).
+
+Seeds in-memory SQLite databases of growing size with the PDF render
+benchmark's synthetic projects and exports the same project from each:
+
+- read: gantt_layout.load_project_data plus the PDF cache key (the
+  project-scoped fingerprint), i.e. every database read of the endpoint,
+- render: project_spec rendered in-process,
+- reference: the previous read path, every phase of the company with its
+  schedule, filtered to the project in Python.
+
+Per scale it records the best wall time of --repeat runs and the SQL
+statements of one read. The read must not depend on the number of other
+projects: the run fails if its statement count changes between scales or
+its time at the largest scale exceeds the smallest by more than --growth.
+With --baseline, cases are also compared against a previous result file
+(wall time, --tolerance).
+
+Usage:
+    python -m benchmarks.project_export [--scales 100,1000,10000] [--repeat N]
+        [--output FILE] [--baseline FILE] [--tolerance 0.15] [--growth 0.5]
+"""
+import io
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.pool import StaticPool
+import models
+from constants import RenderJobKind
+from query_guard import count_statements
+from api.export_pdf import project_spec, _render_to
+from benchmarks.pdf_render import seed, AS_OF
+from services import gantt_layout
+from services.pdf_cache import pdf_cache_key
+
+DEFAULT_SCALES = (100, 1000, 10000)
+PROJECT_ID = 1  # Same project (same phases) at every scale
+
+
+def _read(db: Session) -> dict:
+    data = gantt_layout.load_project_data(db, PROJECT_ID)
+    pdf_cache_key(db, RenderJobKind.PROJECT, {'project_id': PROJECT_ID}, AS_OF)
+    return data
+
+
+def _reference_read(db: Session) -> dict:
+    phases = db.query(models.SchedulePhase).options(joinedload(models.SchedulePhase.schedule)).all()
+    project_phases = [
+        {'project_id': p.schedule.project_id, 'start_date': p.start_date, 'end_date': p.end_date}
+        for p in phases if p.schedule.project_id == PROJECT_ID
+    ]
+    return gantt_layout.phase_spans(project_phases)
+
+
+def _render(data: dict) -> int:
+    output = io.BytesIO()
+    _render_to(project_spec(data, AS_OF), output)
+    return len(output.getvalue())
+
+
+def best_time(fn, repeat: int):
+    """(best wall seconds, last result) of repeat calls."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run(scales, repeat: int) -> list:
+    results = []
+    for scale in scales:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        models.Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            seed(db, scale, random.Random(0))
+        with Session(engine) as db:
+            with count_statements() as counter:
+                data = _read(db)
+            read_seconds, data = best_time(lambda: _read(db), repeat)
+            reference_seconds, _ = best_time(lambda: _reference_read(db), repeat)
+            db.expunge_all()  # Render from plain data, as a render worker would
+        render_seconds, size = best_time(lambda: _render(data), repeat)
+        engine.dispose()
+
+        result = {
+            'scale': scale,
+            'statements': counter.count,
+            'read_seconds': round(read_seconds, 5),
+            'render_seconds': round(render_seconds, 4),
+            'reference_read_seconds': round(reference_seconds, 5),
+            'output_bytes': size,
+        }
+        results.append(result)
+        print(f"{scale:>6} projects  read {read_seconds * 1000:8.2f} ms ({counter.count} statements)  "
+              f"render {render_seconds * 1000:8.1f} ms  reference read {reference_seconds * 1000:9.2f} ms")
+    return results
+
+
+def check_scaling(results: list, growth: float) -> list:
+    """Failures if the read depends on the number of projects."""
+    smallest, largest = results[0], results[-1]
+    failures = []
+    if len({r['statements'] for r in results}) > 1:
+        failures.append("statement count changes with project count: "
+                        + ", ".join(f"{r['scale']}: {r['statements']}" for r in results))
+    change = largest['read_seconds'] / smallest['read_seconds'] - 1
+    print(f"read time {smallest['scale']} -> {largest['scale']} projects: {change:+.1%}")
+    if change > growth:
+        failures.append(f"read time grew {change:+.1%} from {smallest['scale']} to {largest['scale']} projects")
+    return failures
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """Print the change of every case against the baseline; returns the regressions."""
+    previous = {r['scale']: r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        base = previous.get(result['scale'])
+        if base is None:
+            continue
+        changes = []
+        for metric in ('read_seconds', 'render_seconds'):
+            change = result[metric] / base[metric] - 1
+            changes.append(f"{metric} {change:+.1%}")
+            if change > tolerance:
+                regressions.append(f"{result['scale']}: {metric} {change:+.1%}")
+        if result['statements'] != base['statements']:
+            changes.append(f"statements {base['statements']} -> {result['statements']}")
+            regressions.append(f"{result['scale']}: statements {base['statements']} -> {result['statements']}")
+        print(f"{result['scale']:>6} projects  " + ", ".join(changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', default=",".join(map(str, DEFAULT_SCALES)),
+                        help="comma-separated project counts")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default="project_export_results.json")
+    parser.add_argument('--baseline', help="result file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="allowed relative growth vs the baseline")
+    parser.add_argument('--growth', type=float, default=0.5,
+                        help="allowed read time growth from the smallest to the largest scale")
+    args = parser.parse_args()
+
+    scales = sorted(int(scale) for scale in args.scales.split(','))
+    results = run(scales, args.repeat)
+    with open(args.output, 'w') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'results': results,
+        }, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    failures = check_scaling(results, args.growth)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures += compare(results, baseline, args.tolerance)
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK: single-project export reads are independent of project count")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Row layout benchmark for the Gantt PDF (services/text_layout.py).
+
+Lays out the project-name cell (wrapping, tag badges, truncation) of
+synthetic activity rows three ways and reports microseconds per row:
+
+- reference: canvas.stringWidth and the character-by-character truncation
+  GanttChartPDF used before the text layout module,
+- cold: text_layout with empty glyph tables and layout caches,
+- warm: text_layout again over the same rows (memoized layouts, as in a
+  warm render worker re-exporting the schedule).
+
+It also times draw_activity_row end to end and fails if any layout
+differs from the reference.
+
+Usage:
+    python -m benchmarks.row_layout [--rows N] [--repeat N]
+"""
+import io
+import sys
+import time
+import random
+import argparse
+from datetime import date, timedelta
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.pdfgen import canvas
+from api.export_pdf import GanttChartPDF
+from services import text_layout
+
+WORDS = ["Riverside", "Medical", "Center", "Tower", "Phase", "II", "Warehouse", "Distribution",
+         "Hangar", "Data", "Hall", "Northwest", "Terminal", "Expansion", "Mixed-Use", "Garage"]
+TAGS = ['AWS', 'M', 'E', 'V']
+
+
+def _random_rows(rnd: random.Random, count: int) -> list:
+    rows = []
+    for i in range(count):
+        start = date(2025, 1, 1) + timedelta(days=rnd.randint(0, 700))
+        rows.append({
+            'name': " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 7))),
+            'project_number': f"P{i:04d}",
+            'project_status': rnd.choice(['active', 'prospective']),
+            'start_date': start,
+            'end_date': start + timedelta(days=rnd.randint(30, 400)),
+            'duration': rnd.randint(30, 400),
+            'is_out_of_town': rnd.random() < 0.2,
+            'is_aws': rnd.random() < 0.3,
+            'is_mechanical': rnd.random() < 0.3,
+            'is_electrical': rnd.random() < 0.3,
+            'is_vesda': rnd.random() < 0.3,
+            'sprinkler_sub': rnd.choice(['', 'Fuentes (3)', 'Federal Fire Protection 4']),
+            'is_summary': True,
+        })
+    return rows
+
+
+def _tags(row: dict) -> list:
+    return [tag for tag, flag in zip(TAGS, ('is_aws', 'is_mechanical', 'is_electrical', 'is_vesda')) if row[flag]]
+
+
+def reference_layout(c: canvas.Canvas, row: dict, available_width: float) -> tuple:
+    """The name cell layout as computed with canvas.stringWidth (pre text_layout)."""
+    name = row['name']
+    name_font = "Helvetica-Bold" if row['is_out_of_town'] else "Helvetica"
+    tags = _tags(row)
+    tag_total_width = sum(c.stringWidth(tag, "Helvetica-Bold", 5) + 6 for tag in tags) + (1 if tags else 0)
+
+    def truncate_to_fit(text, font, size, max_w):
+        if c.stringWidth(text, font, size) <= max_w:
+            return text
+        while len(text) > 1 and c.stringWidth(text + '..', font, size) > max_w:
+            text = text[:-1]
+        return text + '..'
+
+    name_w = c.stringWidth(name, name_font, 8)
+    if name_w + tag_total_width <= available_width or (name_w <= available_width and tags):
+        return name, ''
+    line1 = ""
+    line2_words = []
+    for word in name.split():
+        test = (line1 + " " + word) if line1 else word
+        if c.stringWidth(test, name_font, 7) <= available_width:
+            line1 = test
+        else:
+            line2_words.append(word)
+    line2 = " ".join(line2_words)
+    if tags and line2:
+        line2 = truncate_to_fit(line2, name_font, 7, max(available_width - tag_total_width - 3, 20))
+    elif line2:
+        line2 = truncate_to_fit(line2, name_font, 7, available_width)
+    return line1, line2
+
+
+def cached_layout(row: dict, available_width: float) -> tuple:
+    """The same layout through text_layout."""
+    name = row['name']
+    name_font = "Helvetica-Bold" if row['is_out_of_town'] else "Helvetica"
+    tags = _tags(row)
+    tag_total_width = sum(text_layout.string_width(tag, "Helvetica-Bold", 5) + 6 for tag in tags) + (1 if tags else 0)
+    name_w = text_layout.string_width(name, name_font, 8)
+    if name_w + tag_total_width <= available_width or (name_w <= available_width and tags):
+        return name, ''
+    line1, line2 = text_layout.wrap_two_lines(name, name_font, 7, available_width)
+    if tags and line2:
+        line2 = text_layout.truncate(line2, name_font, 7, max(available_width - tag_total_width - 3, 20))
+    elif line2:
+        line2 = text_layout.truncate(line2, name_font, 7, available_width)
+    return line1, line2
+
+
+def _per_row_us(fn, rows: list, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for row in rows:
+            fn(row)
+        best = min(best, time.perf_counter() - started)
+    return best / len(rows) * 1e6
+
+
+def _draw_rows_us(rows: list, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        pdf = GanttChartPDF(page_size=landscape(letter))
+        started = time.perf_counter()
+        for i, row in enumerate(rows):
+            pdf.draw_activity_row(500, row, i, date(2025, 1, 1), date(2027, 1, 1), True)
+        best = min(best, time.perf_counter() - started)
+    return best / len(rows) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = _random_rows(random.Random(7), args.rows)
+    c = canvas.Canvas(io.BytesIO())
+    available_width = GanttChartPDF().col_widths['activity_name'] - 8
+
+    mismatches = [row['name'] for row in rows
+                  if reference_layout(c, row, available_width) != cached_layout(row, available_width)]
+    if mismatches:
+        print(f"FAIL: {len(mismatches)} layouts differ, e.g. {mismatches[0]!r}")
+        sys.exit(1)
+
+    reference = _per_row_us(lambda row: reference_layout(c, row, available_width), rows, args.repeat)
+    text_layout.clear_layout_cache()
+    cold = _per_row_us(lambda row: cached_layout(row, available_width), rows, 1)
+    warm = _per_row_us(lambda row: cached_layout(row, available_width), rows, args.repeat)
+    draw = _draw_rows_us(rows, args.repeat)
+
+    print(f"{args.rows} rows, name cell layout (us/row):")
+    print(f"  reference (canvas.stringWidth)  {reference:8.1f}")
+    print(f"  text_layout, cold caches        {cold:8.1f}  ({reference / cold:.1f}x)")
+    print(f"  text_layout, warm caches        {warm:8.1f}  ({reference / warm:.1f}x)")
+    print(f"draw_activity_row end to end (us/row): {draw:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""
+Randomized correctness check for the forecast engines and sources.
+
+Builds random projects/schedules/phases and work calendars (6-day weeks,
+company and calendar holidays) in an in-memory SQLite database and compares
+every engine (numpy, interval) and source (materialized, sql) against the
+reference Python implementation in services/manpower.py, before and after
+a holiday is added. The export buckets (generate_load_buckets, split by crew
+type and project) are compared the same way, including the materialized
+table's grouped reads.
+
+Usage:
+    python check_forecast_engines.py [--seeds N] [--projects N]
+
+Exits with status 1 on the first mismatch.
+"""
+import sys
+import random
+import argparse
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import crud
+import models
+import schemas
+from constants import ForecastEngine, ProjectStatus, ExportPivot
+from services.manpower import generate_forecast, generate_load_buckets
+from services.daily_load import generate_forecast_materialized, iter_load_buckets
+from services.sql_forecast import generate_forecast_sql
+from services.work_calendar import load_calendars
+
+SUBCONTRACTORS = ["Dynalectric", "Federal Fire", "Fuentes", "Power Solutions", "Power Plus"]
+
+
+def _random_schedules(db, rnd: random.Random, num_projects: int) -> None:
+    """Create random projects, schedules and phases through the CRUD layer."""
+    for name in ["Fitters", "Apprentices", "Foremen"]:
+        crud.create_crew_type(db, schemas.CrewTypeCreate(name=name))
+
+    def random_holidays(count):
+        return [
+            schemas.CalendarHolidayCreate(holiday_date=date(2025, 1, 1) + timedelta(days=rnd.randint(0, 1500)))
+            for _ in range(count)
+        ]
+
+    for holiday in random_holidays(rnd.randint(0, 15)):
+        crud.create_calendar_holiday(db, holiday)
+    calendar_ids = [None]
+    for k, weekmask in enumerate(["1111110", "1111100", "0111111"]):
+        work_calendar = crud.create_work_calendar(db, schemas.WorkCalendarCreate(
+            name=f"Calendar {k}",
+            weekmask=weekmask,
+            include_company_holidays=rnd.random() < 0.5,
+            is_default=rnd.random() < 0.2,
+            holidays=random_holidays(rnd.randint(0, 10))
+        ))
+        calendar_ids.append(work_calendar.id)
+
+    for i in range(num_projects):
+        start = date(2025, 1, 1) + timedelta(days=rnd.randint(0, 900))
+        project = crud.create_project(db, schemas.ProjectCreate(
+            name=f"Project {i}",
+            status=rnd.choice(ProjectStatus.ALL),
+            work_calendar_id=rnd.choice(calendar_ids),
+            subcontractors=[
+                schemas.ProjectSubcontractorCreate(
+                    subcontractor_name=rnd.choice(SUBCONTRACTORS),
+                    labor_type=rnd.choice(["sprinkler", "vesda", "electrical"]),
+                    headcount=rnd.randint(0, 6)
+                )
+            ]
+        ))
+        schedule = crud.create_project_schedule(db, project.id, schemas.ProjectScheduleCreate(
+            start_date=start, end_date=start + timedelta(days=500)
+        ))
+        for k in range(rnd.randint(0, 8)):
+            phase_start = start + timedelta(days=rnd.randint(0, 400))
+            crud.create_schedule_phase(db, schedule.id, schemas.SchedulePhaseCreate(
+                phase_name=f"Phase {k}",
+                start_date=phase_start,
+                end_date=phase_start + timedelta(days=rnd.choice([0, 1, 2, 6, 30, 120, 365])),
+                estimated_man_hours=rnd.choice([None, Decimal("0"), Decimal(str(round(rnd.uniform(0, 4000), 2)))]),
+                crew_size=rnd.choice([None, Decimal("0"), Decimal("2"), Decimal("3.5")]),
+                crew_type_id=rnd.choice([None, 1, 2, 3])
+            ))
+
+
+def _normalized(forecast: dict) -> dict:
+    """Order-insensitive view of a forecast (project ties may sort differently)."""
+    forecast = dict(forecast)
+    forecast['projects_included'] = sorted(
+        forecast['projects_included'], key=lambda p: (-p['man_hours'], p['id'])
+    )
+    return forecast
+
+
+def _table_buckets(db, start_date: date, end_date: date, granularity: str, filters: dict) -> list:
+    """The phase_daily_load table's export reads in the shape of generate_load_buckets."""
+    splits = {
+        pivot: {
+            bucket: by_key
+            for bucket, _, by_key in iter_load_buckets(db, start_date, end_date, granularity, pivot, **filters)
+        }
+        for pivot in ExportPivot.ALL
+    }
+    return [
+        (bucket, cents, {pivot: splits[pivot][bucket] for pivot in ExportPivot.ALL})
+        for bucket, cents, _ in iter_load_buckets(db, start_date, end_date, granularity, None, **filters)
+    ]
+
+
+def _compare(db, rnd: random.Random, seed: int, num_projects: int) -> bool:
+    """Compare every engine/source against the reference on random windows and filters."""
+    for _ in range(5):
+        start_date = date(2025, 1, 1) + timedelta(days=rnd.randint(0, 900))
+        end_date = start_date + timedelta(days=rnd.randint(0, 800))
+        granularity = rnd.choice(["daily", "weekly", "monthly"])
+        filters = {
+            'project_ids': rnd.choice([None, rnd.sample(range(1, num_projects + 1), min(3, num_projects))]),
+            'crew_type_ids': rnd.choice([None, [1], [2, 3]]),
+            'subcontractor_names': rnd.choice([None, [rnd.choice(SUBCONTRACTORS)]]),
+        }
+
+        phases = crud.get_active_phases_in_date_range(db, start_date, end_date, **filters)
+        calendars = load_calendars(db)
+        expected = _normalized(generate_forecast(phases, start_date, end_date, granularity,
+                                                 engine=ForecastEngine.PYTHON, calendars=calendars))
+        results = {
+            engine_name: generate_forecast(phases, start_date, end_date, granularity,
+                                           engine=engine_name, calendars=calendars)
+            for engine_name in (ForecastEngine.NUMPY, ForecastEngine.INTERVAL)
+        }
+        results['materialized'] = generate_forecast_materialized(db, start_date, end_date, granularity, **filters)
+        results['sql'] = generate_forecast_sql(db, start_date, end_date, granularity, **filters)
+
+        for name, result in results.items():
+            if _normalized(result) != expected:
+                print(f"MISMATCH seed={seed} engine={name} window={start_date}..{end_date} "
+                      f"granularity={granularity} filters={filters}")
+                return False
+
+        expected_buckets = generate_load_buckets(phases, start_date, end_date, granularity,
+                                                 engine=ForecastEngine.PYTHON, calendars=calendars)
+        bucket_results = {
+            engine_name: generate_load_buckets(phases, start_date, end_date, granularity,
+                                               engine=engine_name, calendars=calendars)
+            for engine_name in (ForecastEngine.NUMPY, ForecastEngine.INTERVAL)
+        }
+        bucket_results['materialized'] = _table_buckets(db, start_date, end_date, granularity, filters)
+
+        for name, result in bucket_results.items():
+            if result != expected_buckets:
+                print(f"MISMATCH seed={seed} buckets={name} window={start_date}..{end_date} "
+                      f"granularity={granularity} filters={filters}")
+                return False
+    return True
+
+
+def check(seed: int, num_projects: int) -> bool:
+    """Run one randomized comparison; returns True if every engine agrees."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    rnd = random.Random(seed)
+
+    try:
+        _random_schedules(db, rnd, num_projects)
+        if not _compare(db, rnd, seed, num_projects):
+            return False
+
+        # Calendar edits must refresh the materialized rows and calendar_days
+        crud.create_calendar_holiday(db, schemas.CalendarHolidayCreate(
+            holiday_date=date(2025, 1, 1) + timedelta(days=rnd.randint(0, 900))
+        ), rnd.choice([None, 1, 2, 3]))
+        return _compare(db, rnd, seed, num_projects)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=20)
+    parser.add_argument("--projects", type=int, default=25)
+    args = parser.parse_args()
+
+    for seed in range(args.seeds):
+        if not check(seed, args.projects):
+            sys.exit(1)
+        print(f"  seed {seed}: OK")
+    print(f"\nAll engines match the reference implementation ({args.seeds} seeds).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Check that endpoint SQL statement counts do not grow with the number of projects.
+
+Seeds a temporary SQLite database with N and then 3N projects (schedules,
+phases, subcontractors), calls the endpoint functions (async ones on an
+aiosqlite session), serializes their results the way FastAPI would, and
+counts the statements issued. Any count that differs between the two
+sizes is an N+1 pattern.
+
+Usage:
+    python check_query_counts.py [--projects N]
+
+Exits with status 1 if any endpoint's statement count depends on project count.
+"""
+import os
+import sys
+import random
+import asyncio
+import argparse
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+import crud
+import models
+import schemas
+from query_guard import count_statements
+from api import projects as projects_api, forecasts as forecasts_api, export_pdf as export_pdf_api
+
+SUBCONTRACTORS = ["Dynalectric", "Federal Fire", "Fuentes"]
+
+
+def _seed(db, num_projects: int) -> None:
+    rnd = random.Random(num_projects)
+    for name in ["Fitters", "Apprentices", "Foremen"]:
+        crud.create_crew_type(db, schemas.CrewTypeCreate(name=name))
+    for i in range(num_projects):
+        start = date(2026, 1, 5) + timedelta(days=rnd.randint(0, 200))
+        project = crud.create_project(db, schemas.ProjectCreate(
+            name=f"Project {i}",
+            subcontractors=[schemas.ProjectSubcontractorCreate(
+                subcontractor_name=rnd.choice(SUBCONTRACTORS), labor_type="sprinkler", headcount=2
+            )]
+        ))
+        crud.create_project_schedule(db, project.id, schemas.ProjectScheduleCreate(
+            start_date=start,
+            end_date=start + timedelta(days=120),
+            phases=[
+                schemas.SchedulePhaseCreate(
+                    phase_name=f"Phase {k}",
+                    start_date=start + timedelta(days=20 * k),
+                    end_date=start + timedelta(days=20 * k + 15),
+                    estimated_man_hours=Decimal("320"),
+                    crew_type_id=rnd.choice([1, 2, 3])
+                )
+                for k in range(4)
+            ]
+        ))
+
+
+async def _project_schedule(db) -> dict:
+    schedule = await projects_api.get_project_schedule(1, db=db, current_user=None)
+    return schemas.ProjectSchedule.model_validate(schedule).model_dump()
+
+
+def _async_endpoints(db) -> dict:
+    """Same as _endpoints for the async endpoints: {name: coroutine function}."""
+    return {
+        'GET /api/projects/': lambda: projects_api.list_projects(
+            skip=0, limit=1000, status=None, cursor=None, fields=None, if_none_match=None, db=db, current_user=None
+        ),
+        'GET /api/projects/?fields=id,name,subcontractors': lambda: projects_api.list_projects(
+            skip=0, limit=1000, status=None, cursor=None, fields="id,name,subcontractors",
+            if_none_match=None, db=db, current_user=None
+        ),
+        'GET /api/projects/1/schedule': lambda: _project_schedule(db),
+    }
+
+
+def _endpoints(db) -> dict:
+    """Call each endpoint and serialize its result; returns {name: callable}."""
+    window = (date(2026, 1, 1), date(2026, 12, 31))
+    return {
+        'GET /api/forecasts/company-wide': lambda: schemas.ManpowerForecast.model_validate(
+            forecasts_api._compute_company_forecast(db, *window, 'monthly', None, None, None)
+        ),
+        'GET /api/forecasts/project/1': lambda: schemas.ManpowerForecast.model_validate(
+            forecasts_api.get_project_forecast(1, granularity='monthly', db=db, current_user=None)
+        ),
+        'GET /api/export/pdf': lambda: export_pdf_api.export_pdf(
+            project_ids=None, subcontractor_names=None, if_none_match=None, db=db, current_user=None
+        ),
+        'GET /api/export/pdf/project/1': lambda: export_pdf_api.export_project_pdf(
+            1, if_none_match=None, db=db, current_user=None
+        ),
+    }
+
+
+async def _count_async(session_factory, name: str) -> int:
+    async with session_factory() as db:
+        with count_statements() as counter:
+            await _async_endpoints(db)[name]()
+        return counter.count
+
+
+def measure(num_projects: int) -> dict:
+    """Statement count per endpoint for a database with num_projects projects."""
+    # A file, so the sync and the async engine see the same database
+    directory = tempfile.TemporaryDirectory()
+    path = os.path.join(directory.name, "check.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # One event loop per call: connections must not outlive it
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    async_session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    db = session_factory()
+    try:
+        _seed(db, num_projects)
+    finally:
+        db.close()
+
+    counts = {}
+    for name in _async_endpoints(None):
+        counts[name] = asyncio.run(_count_async(async_session_factory, name))
+    for name in _endpoints(None):
+        # Fresh session per call, like one request
+        db = session_factory()
+        try:
+            call = _endpoints(db)[name]
+            with count_statements() as counter:
+                call()
+            counts[name] = counter.count
+        finally:
+            db.close()
+    engine.dispose()
+    directory.cleanup()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=20)
+    args = parser.parse_args()
+
+    small = measure(args.projects)
+    large = measure(args.projects * 3)
+
+    ok = True
+    print(f"{'endpoint':<52}{args.projects:>8}{args.projects * 3:>8}")
+    for name in small:
+        flag = "" if small[name] == large[name] else "  <-- grows with project count"
+        ok = ok and not flag
+        print(f"{name:<52}{small[name]:>8}{large[name]:>8}{flag}")
+
+    if not ok:
+        sys.exit(1)
+    print("\nStatement counts are constant with respect to project count.")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,20 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./manpower_forecast.db"
+    async_database_url: str = ""  # Async endpoints (empty = database_url with aiosqlite / asyncpg)
+    database_profile: str = "auto"  # "auto" (from the URL), "sqlite", "postgresql" or "default" (no tuning)
+    sqlite_journal_mode: str = "wal"  # Readers do not block the writer (needs a local filesystem)
+    sqlite_synchronous: str = "normal"  # fsync at checkpoints only (safe with WAL)
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # Bytes of the file read through mmap
+    sqlite_cache_size: int = -64 * 1024  # Page cache per connection (negative = KiB)
+    sqlite_busy_timeout: int = 5000  # Milliseconds a writer waits for the lock before "database is locked"
+    db_pool_size: int = 10  # PostgreSQL connections kept per engine
+    db_max_overflow: int = 20  # Extra connections under load
+    db_pool_timeout: int = 30  # Seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Seconds before a connection is replaced
+    db_pool_pre_ping: bool = True  # Test connections on checkout (survives server restarts / idle kills)
+    postgres_statement_timeout: int = 30000  # Milliseconds (0 = no limit)
+    postgres_prepare_threshold: int = 5  # Executions before a query is prepared server-side (0 = never)
 
     # Server
     host: str = "0.0.0.0"
@@ -15,6 +29,32 @@ class Settings(BaseSettings):
 
     # Authentication
     secret_key: str = "CHANGE-THIS-IN-PRODUCTION-use-a-random-string"
+    principal_cache_size: int = 1024  # Cached authenticated tokens (0 disables the cache)
+    principal_cache_ttl: int = 60  # Seconds a token's user snapshot is trusted
+    principal_cache_stamp: str = "principal_cache.stamp"  # Touched on user changes; shared by workers and scripts
+    bcrypt_rounds: int = 12  # Work factor of new hashes; logins re-hash passwords stored with another cost
+    password_hash_workers: int = 2  # Threads checking / hashing passwords (0 = in the request)
+    password_hash_queue_timeout: float = 5  # Seconds a login waits for a hashing thread before 503
+
+    # Forecasting
+    forecast_engine: str = "numpy"  # "numpy", "interval" or "python" (reference implementation)
+    forecast_source: str = "live"  # "live", "materialized" (phase_daily_load table) or "sql"
+    forecast_cache_size: int = 256  # Cached company-wide forecasts (0 disables the cache)
+    forecast_cache_ttl: int = 300  # Seconds
+    forecast_cache_dir: str = ""  # Optional disk tier for warm restarts (empty = memory only)
+
+    # PDF rendering (background process pool)
+    pdf_render_workers: int = 2  # Render processes (0 = render in the request thread)
+    pdf_render_queue: int = 8  # Jobs allowed to wait for a worker before returning 429
+    pdf_render_timeout: int = 120  # Seconds a direct GET export waits for its render
+    pdf_job_ttl: int = 600  # Seconds a finished job's PDF stays downloadable
+    pdf_spool_dir: str = ""  # Where renders are written before streaming (empty = system temp dir)
+    pdf_cache_dir: str = "pdf_cache"  # Rendered PDFs by content hash (empty = no cache)
+    pdf_cache_max_bytes: int = 256 * 1024 * 1024  # LRU eviction beyond this many bytes
+    pdf_cache_freshness: int = 900  # Seconds a render's run date / today-line may lag (0 = exact, no cache)
+
+    # Test/CI guard: fail requests issuing more SQL statements than this (0 = off)
+    sql_statement_budget: int = 0
 
     # CORS
     frontend_url: str = "http://localhost:3000"
@@ -37,6 +37,69 @@ class ForecastGranularity:
     ALL = [DAILY, WEEKLY, MONTHLY]
 
 
+# Forecast engines
+class ForecastEngine:
+    PYTHON = "python"  # Reference implementation (one record per phase-day)
+    NUMPY = "numpy"    # Vectorized difference-array engine
+    INTERVAL = "interval"  # Prefix sums over phase intervals (no per-day records)
+
+    ALL = [PYTHON, NUMPY, INTERVAL]
+
+
+# Where company-wide forecasts are read from
+class ForecastSource:
+    LIVE = "live"                  # Compute from SchedulePhase rows with the forecast engine
+    MATERIALIZED = "materialized"  # GROUP BY reads from the phase_daily_load table
+    SQL = "sql"                    # Single aggregation query joined against calendar_days
+
+    ALL = [LIVE, MATERIALIZED, SQL]
+
+
+# Forecast export pivots (one column per crew type / project)
+class ExportPivot:
+    CREW_TYPE = "crew_type"
+    PROJECT = "project"
+
+    ALL = [CREW_TYPE, PROJECT]
+
+
+# Forecast export file formats
+class ExportFormat:
+    CSV = "csv"
+    XLSX = "xlsx"
+
+    ALL = [CSV, XLSX]
+
+
+# Background PDF render jobs
+class RenderJobKind:
+    GANTT = "gantt"                  # Company schedule (optionally filtered)
+    PROJECT = "project"              # Single project schedule
+    SUBCONTRACTOR = "subcontractor"  # Subcontractor labor report
+    UTILIZATION = "utilization"      # Weekly hours / headcount of every subcontractor
+
+    ALL = [GANTT, PROJECT, SUBCONTRACTOR, UTILIZATION]
+
+
+class RenderJobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    ALL = [QUEUED, RUNNING, DONE, FAILED]
+
+
+# Database engine profiles (database.py, engine_profiles.py)
+class DatabaseProfile:
+    AUTO = "auto"              # Picked from the database URL
+    DEFAULT = "default"        # SQLAlchemy defaults (no pragmas, default pool)
+    SQLITE = "sqlite"          # WAL journal and connection pragmas
+    POSTGRESQL = "postgresql"  # Sized pool, pre-ping, statement timeout, prepared statements
+
+    ALL = [AUTO, DEFAULT, SQLITE, POSTGRESQL]
+
+
 # Pagination defaults
 DEFAULT_PAGE_SIZE = 100
 MAX_PAGE_SIZE = 1000
@@ -1,21 +1,51 @@
 """CRUD operations for database models."""
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import date
+from typing import List, Optional, Sequence, Tuple
+from datetime import date, datetime
 import models
 import schemas
+import loaders
+from services import daily_load, sql_forecast, forecast_cache, project_hours
+from services.work_calendar import invalidate_calendars, project_ids_on_calendar
 
 
 # ============================================
 # Project CRUD
 # ============================================
 
-def get_projects(db: Session, skip: int = 0, limit: int = 500, status: Optional[str] = None) -> List[models.Project]:
-    """Get list of projects."""
-    query = db.query(models.Project)
+def get_projects(
+    db: Session,
+    skip: int = 0,
+    limit: int = 500,
+    status: Optional[str] = None,
+    after_id: Optional[int] = None,
+    options: Optional[Sequence] = None
+) -> List[models.Project]:
+    """
+    Get list of projects ordered by ID (with everything schemas.Project serializes).
+
+    after_id: Keyset cursor - return projects with a greater ID (skip is ignored)
+    options: Loader options replacing loaders.PROJECT_WITH_HOURS (e.g. for a sparse fieldset)
+    """
+    query = db.query(models.Project).options(*(loaders.PROJECT_WITH_HOURS if options is None else options))
+    if status:
+        query = query.filter(models.Project.status == status)
+    query = query.order_by(models.Project.id)
+    if after_id is not None:
+        query = query.filter(models.Project.id > after_id)
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+
+def get_projects_fingerprint(db: Session, status: Optional[str] = None) -> Tuple[int, Optional[datetime]]:
+    """Row count and latest updated_at of the projects a listing covers (for ETags)."""
+    query = db.query(func.count(models.Project.id), func.max(models.Project.updated_at))
     if status:
         query = query.filter(models.Project.status == status)
-    return query.offset(skip).limit(limit).all()
+    count, last_updated = query.one()
+    return count, last_updated
 
 
 def get_project(db: Session, project_id: int) -> Optional[models.Project]:
@@ -29,6 +59,7 @@ def create_project(db: Session, project: schemas.ProjectCreate) -> models.Projec
     db_project = models.Project(**project_data)
     db.add(db_project)
     try:
+        forecast_cache.bump_data_version(db)
         db.commit()
         db.refresh(db_project)
 
@@ -42,6 +73,7 @@ def create_project(db: Session, project: schemas.ProjectCreate) -> models.Projec
                     headcount=sub.headcount
                 )
                 db.add(db_sub)
+            forecast_cache.bump_data_version(db)
             db.commit()
             db.refresh(db_project)
     except Exception:
@@ -77,6 +109,12 @@ def update_project(db: Session, project_id: int, project: schemas.ProjectUpdate)
             db.add(db_sub)
 
     try:
+        if 'status' in update_data or 'work_calendar_id' in update_data:
+            db.flush()
+            daily_load.refresh_project_load(db, project_id)
+        if 'work_calendar_id' in update_data:
+            project_hours.refresh_project_hours(db, [project_id])
+        forecast_cache.bump_data_version(db)
         db.commit()
         db.refresh(db_project)
     except Exception:
@@ -93,6 +131,9 @@ def delete_project(db: Session, project_id: int) -> bool:
 
     db.delete(db_project)
     try:
+        # Remove materialized load rows before their phases are deleted
+        daily_load.delete_project_load(db, project_id)
+        forecast_cache.bump_data_version(db)
         db.commit()
     except Exception:
         db.rollback()
@@ -127,13 +168,164 @@ def create_crew_type(db: Session, crew_type: schemas.CrewTypeCreate) -> models.C
     return db_crew_type
 
 
+# ============================================
+# Work Calendar CRUD
+# ============================================
+
+def _work_calendar_changed(db: Session, calendar_id: Optional[int]) -> None:
+    """
+    Refresh derived data after a calendar/holiday write (caller commits).
+
+    calendar_id None means company holidays or the default calendar changed.
+    """
+    db.flush()
+    invalidate_calendars(db)
+    sql_forecast.rebuild_calendar_days(db, calendar_id)
+    daily_load.refresh_calendar_load(db, calendar_id)
+    project_hours.refresh_project_hours(db, project_ids_on_calendar(db, calendar_id))
+    forecast_cache.bump_data_version(db)
+
+
+def get_work_calendars(db: Session) -> List[models.WorkCalendar]:
+    """Get all work calendars."""
+    return db.query(models.WorkCalendar).order_by(models.WorkCalendar.name).all()
+
+
+def get_work_calendar(db: Session, calendar_id: int) -> Optional[models.WorkCalendar]:
+    """Get work calendar by ID."""
+    return db.query(models.WorkCalendar).filter(models.WorkCalendar.id == calendar_id).first()
+
+
+def create_work_calendar(db: Session, work_calendar: schemas.WorkCalendarCreate) -> models.WorkCalendar:
+    """Create new work calendar (with optional holidays)."""
+    db_calendar = models.WorkCalendar(**work_calendar.model_dump(exclude={'holidays'}))
+    for holiday in work_calendar.holidays or []:
+        db_calendar.holidays.append(models.CalendarHoliday(**holiday.model_dump()))
+    if db_calendar.is_default:
+        db.query(models.WorkCalendar).update({models.WorkCalendar.is_default: False})
+    db.add(db_calendar)
+    try:
+        db.flush()  # Assigns the id: a new non-default calendar only refreshes its own (no) projects
+        _work_calendar_changed(db, None if db_calendar.is_default else db_calendar.id)
+        db.commit()
+        db.refresh(db_calendar)
+    except Exception:
+        db.rollback()
+        raise
+    return db_calendar
+
+
+def update_work_calendar(
+    db: Session,
+    calendar_id: int,
+    work_calendar: schemas.WorkCalendarUpdate
+) -> Optional[models.WorkCalendar]:
+    """Update work calendar."""
+    db_calendar = get_work_calendar(db, calendar_id)
+    if not db_calendar:
+        return None
+
+    was_default = db_calendar.is_default
+    update_data = work_calendar.model_dump(exclude_unset=True)
+    if update_data.get('is_default'):
+        db.query(models.WorkCalendar).filter(
+            models.WorkCalendar.id != calendar_id
+        ).update({models.WorkCalendar.is_default: False})
+    for field, value in update_data.items():
+        setattr(db_calendar, field, value)
+
+    try:
+        default_changed = was_default or db_calendar.is_default
+        _work_calendar_changed(db, None if default_changed else calendar_id)
+        db.commit()
+        db.refresh(db_calendar)
+    except Exception:
+        db.rollback()
+        raise
+    return db_calendar
+
+
+def delete_work_calendar(db: Session, calendar_id: int) -> bool:
+    """Delete work calendar (its projects fall back to the default calendar)."""
+    db_calendar = get_work_calendar(db, calendar_id)
+    if not db_calendar:
+        return False
+
+    project_ids = [project.id for project in db_calendar.projects]
+    was_default = db_calendar.is_default
+    db.delete(db_calendar)
+    try:
+        db.flush()
+        invalidate_calendars(db)
+        if was_default:
+            sql_forecast.rebuild_calendar_days(db)
+            daily_load.refresh_calendar_load(db)
+            project_ids = project_ids_on_calendar(db)
+        else:
+            sql_forecast.delete_calendar_days(db, calendar_id)
+            for project_id in project_ids:
+                daily_load.refresh_project_load(db, project_id)
+        project_hours.refresh_project_hours(db, project_ids)
+        forecast_cache.bump_data_version(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return True
+
+
+def get_calendar_holidays(db: Session, calendar_id: Optional[int] = None) -> List[models.CalendarHoliday]:
+    """Get holidays of a work calendar (company holidays if calendar_id is None)."""
+    query = db.query(models.CalendarHoliday)
+    if calendar_id is None:
+        query = query.filter(models.CalendarHoliday.calendar_id.is_(None))
+    else:
+        query = query.filter(models.CalendarHoliday.calendar_id == calendar_id)
+    return query.order_by(models.CalendarHoliday.holiday_date).all()
+
+
+def create_calendar_holiday(
+    db: Session,
+    holiday: schemas.CalendarHolidayCreate,
+    calendar_id: Optional[int] = None
+) -> models.CalendarHoliday:
+    """Add a holiday to a work calendar (company holiday if calendar_id is None)."""
+    db_holiday = models.CalendarHoliday(**holiday.model_dump(), calendar_id=calendar_id)
+    db.add(db_holiday)
+    try:
+        _work_calendar_changed(db, calendar_id)
+        db.commit()
+        db.refresh(db_holiday)
+    except Exception:
+        db.rollback()
+        raise
+    return db_holiday
+
+
+def delete_calendar_holiday(db: Session, holiday_id: int) -> bool:
+    """Delete a holiday."""
+    db_holiday = db.query(models.CalendarHoliday).filter(models.CalendarHoliday.id == holiday_id).first()
+    if not db_holiday:
+        return False
+
+    calendar_id = db_holiday.calendar_id
+    db.delete(db_holiday)
+    try:
+        _work_calendar_changed(db, calendar_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return True
+
+
 # ============================================
 # Project Schedule CRUD
 # ============================================
 
 def get_project_schedule(db: Session, project_id: int) -> Optional[models.ProjectSchedule]:
     """Get project schedule (most recent active)."""
-    return db.query(models.ProjectSchedule).filter(
+    return db.query(models.ProjectSchedule).options(*loaders.SCHEDULE_WITH_PHASES).filter(
         models.ProjectSchedule.project_id == project_id,
         models.ProjectSchedule.is_active == True
     ).first()
@@ -149,6 +341,7 @@ def create_project_schedule(
     db_schedule = models.ProjectSchedule(project_id=project_id, **schedule_data)
     db.add(db_schedule)
     try:
+        forecast_cache.bump_data_version(db)
         db.commit()
         db.refresh(db_schedule)
 
@@ -179,6 +372,11 @@ def update_project_schedule(
         setattr(db_schedule, field, value)
 
     try:
+        if 'is_active' in update_data:
+            db.flush()
+            daily_load.refresh_schedule_load(db, db_schedule)
+            project_hours.refresh_project_hours(db, [db_schedule.project_id])
+        forecast_cache.bump_data_version(db)
         db.commit()
         db.refresh(db_schedule)
     except Exception:
@@ -193,8 +391,13 @@ def delete_project_schedule(db: Session, schedule_id: int) -> bool:
     if not db_schedule:
         return False
 
+    project_id = db_schedule.project_id
     db.delete(db_schedule)
     try:
+        # Remove materialized load rows before their phases are deleted
+        daily_load.delete_phase_load(db, [phase.id for phase in db_schedule.phases])
+        project_hours.refresh_project_hours(db, [project_id])
+        forecast_cache.bump_data_version(db)
         db.commit()
     except Exception:
         db.rollback()
@@ -227,6 +430,11 @@ def create_schedule_phase(
     db_phase = models.SchedulePhase(schedule_id=schedule_id, **phase.model_dump())
     db.add(db_phase)
     try:
+        db.flush()
+        daily_load.refresh_phase_load(db, db_phase)
+        sql_forecast.cover_phase(db, db_phase)
+        project_hours.refresh_project_hours(db, [db_phase.schedule.project_id])
+        forecast_cache.bump_data_version(db)
         db.commit()
         db.refresh(db_phase)
     except Exception:
@@ -250,6 +458,11 @@ def update_schedule_phase(
         setattr(db_phase, field, value)
 
     try:
+        db.flush()
+        daily_load.refresh_phase_load(db, db_phase)
+        sql_forecast.cover_phase(db, db_phase)
+        project_hours.refresh_project_hours(db, [db_phase.schedule.project_id])
+        forecast_cache.bump_data_version(db)
         db.commit()
         db.refresh(db_phase)
     except Exception:
@@ -264,8 +477,13 @@ def delete_schedule_phase(db: Session, phase_id: int) -> bool:
     if not db_phase:
         return False
 
+    project_id = db_phase.schedule.project_id
     db.delete(db_phase)
     try:
+        # Remove materialized load rows before their phases are deleted
+        daily_load.delete_phase_load(db, [phase_id])
+        project_hours.refresh_project_hours(db, [project_id])
+        forecast_cache.bump_data_version(db)
         db.commit()
     except Exception:
         db.rollback()
@@ -284,9 +502,17 @@ def get_all_projects(db: Session):
     """Get all projects."""
     return db.query(models.Project).all()
 
-def get_all_phases(db: Session):
-    """Get all schedule phases for all projects."""
-    return db.query(models.SchedulePhase).all()
+def get_project_phases(db: Session, project_id: int) -> List[models.SchedulePhase]:
+    """Get all schedule phases of a project (every schedule)."""
+    return db.query(models.SchedulePhase).join(
+        models.ProjectSchedule
+    ).join(
+        models.Project
+    ).options(
+        *loaders.PHASE_WITH_JOINED_PROJECT
+    ).filter(
+        models.ProjectSchedule.project_id == project_id
+    ).all()
 
 def get_active_phases_in_date_range(
     db: Session,
@@ -296,11 +522,13 @@ def get_active_phases_in_date_range(
     crew_type_ids: Optional[List[int]] = None,
     subcontractor_names: Optional[List[str]] = None
 ) -> List[models.SchedulePhase]:
-    """Get all active phases within a date range."""
+    """Get all active phases within a date range (with schedule and project loaded)."""
     query = db.query(models.SchedulePhase).join(
         models.ProjectSchedule
     ).join(
         models.Project
+    ).options(
+        *loaders.PHASE_WITH_JOINED_PROJECT
     ).filter(
         models.Project.status.in_(['active', 'prospective']),
         models.SchedulePhase.start_date <= end_date,
@@ -327,18 +555,36 @@ def get_active_phases_in_date_range(
 # Subcontractor CRUD
 # ============================================
 
-def get_projects_by_subcontractor(
+def get_subcontractor_phases(
     db: Session,
     subcontractor_name: str,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ) -> List[tuple]:
-    """Get all projects assigned to a subcontractor with their labor types."""
+    """
+    (labor_type, project, phase) rows of a subcontractor's active/prospective
+    projects in one query, phase None for projects without active-schedule
+    phases in the range. Ordered by project, then phase start date.
+    """
+    phase_join = [models.SchedulePhase.schedule_id == models.ProjectSchedule.id]
+    if start_date:
+        phase_join.append(models.SchedulePhase.end_date >= start_date)
+    if end_date:
+        phase_join.append(models.SchedulePhase.start_date <= end_date)
+
     query = db.query(
+        models.ProjectSubcontractor.labor_type,
         models.Project,
-        models.ProjectSubcontractor.labor_type
+        models.SchedulePhase
     ).join(
-        models.ProjectSubcontractor
+        models.Project, models.ProjectSubcontractor.project_id == models.Project.id
+    ).outerjoin(
+        models.ProjectSchedule, and_(
+            models.ProjectSchedule.project_id == models.Project.id,
+            models.ProjectSchedule.is_active == True
+        )
+    ).outerjoin(
+        models.SchedulePhase, and_(*phase_join)
     ).filter(
         models.ProjectSubcontractor.subcontractor_name == subcontractor_name,
         models.Project.status.in_(['active', 'prospective'])
@@ -349,29 +595,23 @@ def get_projects_by_subcontractor(
     if end_date:
         query = query.filter(models.Project.start_date <= end_date)
 
-    return query.all()
+    return query.order_by(
+        models.Project.id, models.SchedulePhase.start_date, models.SchedulePhase.id
+    ).all()
 
 
-def get_project_phases_for_labor_type(
+def get_subcontractor_assignments(
     db: Session,
-    project_id: int,
-    labor_type: str,
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None
-) -> List[models.SchedulePhase]:
-    """Get phases for a project filtered by labor type (sprinkler/vesda)."""
-    query = db.query(models.SchedulePhase).join(
-        models.ProjectSchedule
-    ).join(
-        models.Project
+    subcontractor_names: Optional[List[str]] = None
+) -> List[models.ProjectSubcontractor]:
+    """Subcontractor assignments of active/prospective projects."""
+    query = db.query(models.ProjectSubcontractor).join(
+        models.Project, models.ProjectSubcontractor.project_id == models.Project.id
     ).filter(
-        models.ProjectSchedule.project_id == project_id,
-        models.ProjectSchedule.is_active == True
+        models.Project.status.in_(['active', 'prospective'])
     )
 
-    if start_date:
-        query = query.filter(models.SchedulePhase.end_date >= start_date)
-    if end_date:
-        query = query.filter(models.SchedulePhase.start_date <= end_date)
+    if subcontractor_names:
+        query = query.filter(models.ProjectSubcontractor.subcontractor_name.in_(subcontractor_names))
 
-    return query.order_by(models.SchedulePhase.start_date).all()
+    return query.all()
@@ -0,0 +1,171 @@
+"""Async read operations (AsyncSession) for the async endpoints.
+
+Same queries and results as the crud.py functions of the same name, with
+every relationship the response serializes eager-loaded (async sessions
+cannot lazy load). Writes stay in crud.py: they maintain derived data
+(daily load, project hours, data version) through the sync session.
+"""
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Sequence, Tuple
+from datetime import datetime
+import models
+import loaders
+from services.forecast_cache import DATA_VERSION_ID
+
+
+# ============================================
+# User CRUD
+# ============================================
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[models.User]:
+    """Get user by email."""
+    return await db.scalar(select(models.User).where(models.User.email == email).limit(1))
+
+
+async def get_users(db: AsyncSession) -> List[models.User]:
+    """Get all users."""
+    return list(await db.scalars(select(models.User)))
+
+
+async def create_user(db: AsyncSession, user: models.User) -> models.User:
+    """Insert a new user."""
+    db.add(user)
+    try:
+        await db.commit()
+        await db.refresh(user)
+    except Exception:
+        await db.rollback()
+        raise
+    return user
+
+
+async def update_password_hash(db: AsyncSession, user: models.User, hashed_password: str) -> models.User:
+    """Store a new hash of the user's password (e.g. re-hashed with a new work factor)."""
+    user.hashed_password = hashed_password
+    try:
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return user
+
+
+# ============================================
+# Project CRUD
+# ============================================
+
+async def get_projects(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 500,
+    status: Optional[str] = None,
+    after_id: Optional[int] = None,
+    options: Optional[Sequence] = None
+) -> List[models.Project]:
+    """See crud.get_projects."""
+    query = select(models.Project).options(*(loaders.PROJECT_WITH_HOURS if options is None else options))
+    if status:
+        query = query.where(models.Project.status == status)
+    query = query.order_by(models.Project.id)
+    if after_id is not None:
+        query = query.where(models.Project.id > after_id)
+    elif skip:
+        query = query.offset(skip)
+    return list(await db.scalars(query.limit(limit)))
+
+
+async def get_projects_fingerprint(db: AsyncSession, status: Optional[str] = None) -> Tuple[int, Optional[datetime]]:
+    """Row count and latest updated_at of the projects a listing covers (for ETags)."""
+    query = select(func.count(models.Project.id), func.max(models.Project.updated_at))
+    if status:
+        query = query.where(models.Project.status == status)
+    count, last_updated = (await db.execute(query)).one()
+    return count, last_updated
+
+
+async def get_project(db: AsyncSession, project_id: int) -> Optional[models.Project]:
+    """Get project by ID (serializable as schemas.Project)."""
+    return await db.scalar(
+        select(models.Project).options(*loaders.PROJECT_WITH_HOURS).where(models.Project.id == project_id)
+    )
+
+
+async def project_exists(db: AsyncSession, project_id: int) -> bool:
+    """Whether a project with this ID exists (without loading it)."""
+    return await db.scalar(select(models.Project.id).where(models.Project.id == project_id)) is not None
+
+
+async def get_data_version(db: AsyncSession) -> int:
+    """See forecast_cache.get_data_version."""
+    version = await db.scalar(
+        select(models.DataVersion.version).where(models.DataVersion.id == DATA_VERSION_ID)
+    )
+    return version or 0
+
+
+# ============================================
+# Crew Type CRUD
+# ============================================
+
+async def get_crew_types(db: AsyncSession) -> List[models.CrewType]:
+    """Get all crew types."""
+    return list(await db.scalars(select(models.CrewType)))
+
+
+async def get_crew_type(db: AsyncSession, crew_type_id: int) -> Optional[models.CrewType]:
+    """Get crew type by ID."""
+    return await db.scalar(select(models.CrewType).where(models.CrewType.id == crew_type_id))
+
+
+# ============================================
+# Work Calendar CRUD
+# ============================================
+
+async def get_work_calendars(db: AsyncSession) -> List[models.WorkCalendar]:
+    """Get all work calendars (with their holidays)."""
+    return list(await db.scalars(
+        select(models.WorkCalendar).options(*loaders.CALENDAR_WITH_HOLIDAYS).order_by(models.WorkCalendar.name)
+    ))
+
+
+async def get_work_calendar(db: AsyncSession, calendar_id: int) -> Optional[models.WorkCalendar]:
+    """Get work calendar by ID (with its holidays)."""
+    return await db.scalar(
+        select(models.WorkCalendar).options(*loaders.CALENDAR_WITH_HOLIDAYS)
+        .where(models.WorkCalendar.id == calendar_id)
+    )
+
+
+# ============================================
+# Project Schedule CRUD
+# ============================================
+
+async def get_project_schedule(db: AsyncSession, project_id: int) -> Optional[models.ProjectSchedule]:
+    """Get project schedule (most recent active)."""
+    return await db.scalar(
+        select(models.ProjectSchedule).options(*loaders.SCHEDULE_WITH_PHASES).where(
+            models.ProjectSchedule.project_id == project_id,
+            models.ProjectSchedule.is_active == True
+        ).limit(1)
+    )
+
+
+# ============================================
+# Schedule Phase CRUD
+# ============================================
+
+async def get_schedule_phases(db: AsyncSession, schedule_id: int) -> List[models.SchedulePhase]:
+    """Get all phases for a schedule."""
+    return list(await db.scalars(
+        select(models.SchedulePhase).options(*loaders.PHASE_WITH_CREW_TYPE).where(
+            models.SchedulePhase.schedule_id == schedule_id
+        ).order_by(models.SchedulePhase.sort_order, models.SchedulePhase.start_date)
+    ))
+
+
+async def get_schedule_phase(db: AsyncSession, phase_id: int) -> Optional[models.SchedulePhase]:
+    """Get schedule phase by ID."""
+    return await db.scalar(
+        select(models.SchedulePhase).options(*loaders.PHASE_WITH_CREW_TYPE).where(models.SchedulePhase.id == phase_id)
+    )
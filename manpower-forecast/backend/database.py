@@ -1,18 +1,53 @@
-"""Database configuration and session management."""
-from sqlalchemy import create_engine
+"""Database configuration and session management.
+
+Two engines share the same database:
+
+- the sync engine (SessionLocal, get_db) for the write endpoints, the
+  forecast / report / PDF endpoints (FastAPI runs them in its threadpool)
+  and the migrate / import scripts,
+- the async engine (AsyncSessionLocal, get_async_db; aiosqlite in
+  development, asyncpg on PostgreSQL) for the async endpoints, including
+  the authentication dependency every request goes through, so they never
+  block the event loop on a database round trip.
+
+Both are tuned by settings.database_profile (WAL and pragmas on SQLite,
+pool sizing and timeouts on PostgreSQL), see engine_profiles.py.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import settings
+from engine_profiles import create_profiled_async_engine, create_profiled_engine
+
+# Sync driver URL prefix -> async driver URL prefix
+ASYNC_DRIVERS = {
+    "sqlite://": "sqlite+aiosqlite://",
+    "sqlite+pysqlite://": "sqlite+aiosqlite://",
+    "postgresql://": "postgresql+asyncpg://",
+    "postgresql+psycopg2://": "postgresql+asyncpg://",
+    "postgresql+psycopg://": "postgresql+asyncpg://",
+    "postgres://": "postgresql+asyncpg://",
+}
+
+
+def async_database_url(database_url: str) -> str:
+    """database_url with its driver replaced by the async one (unchanged if already async)."""
+    for prefix, async_prefix in ASYNC_DRIVERS.items():
+        if database_url.startswith(prefix):
+            return async_prefix + database_url[len(prefix):]
+    return database_url
+
 
 # Create database engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
-)
+engine = create_profiled_engine(settings.database_url)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory (objects stay usable after commit, as responses serialize them)
+async_engine = create_profiled_async_engine(settings.async_database_url or async_database_url(settings.database_url))
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -26,6 +61,12 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,119 @@
+"""Database engine profiles.
+
+database.py builds both engines through this module; settings.database_profile
+picks the tuning ("auto" picks it from the database URL):
+
+- sqlite: every new connection sets journal_mode=WAL (readers no longer
+  block the writer and a commit does not lock the whole file; the file
+  must be on a local filesystem), synchronous=NORMAL (fsync at WAL
+  checkpoints instead of every commit), mmap_size, cache_size and
+  busy_timeout (a writer waits for the lock instead of failing with
+  "database is locked"),
+- postgresql: a sized QueuePool (pool_size, max_overflow, pool_timeout,
+  pool_recycle) with pre-ping, a statement_timeout on every connection
+  and server-side prepared statements (psycopg 3: prepare_threshold;
+  asyncpg: its prepared statement cache; psycopg2 cannot prepare
+  server-side, use postgresql+psycopg:// for that),
+- default: SQLAlchemy's defaults, as before the profiles (for comparison
+  and as a fallback).
+"""
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from config import settings
+from constants import DatabaseProfile
+
+ASYNCPG_STATEMENT_CACHE_SIZE = 100  # asyncpg's default; 0 when prepared statements are off
+
+
+def resolve_profile(database_url: str, profile: Optional[str] = None) -> str:
+    """The profile for database_url (profile defaults to settings.database_profile)."""
+    profile = profile or settings.database_profile
+    if profile not in DatabaseProfile.ALL:
+        raise ValueError(f"database_profile must be one of: {', '.join(DatabaseProfile.ALL)}")
+    backend = make_url(database_url).get_backend_name()
+    if profile == DatabaseProfile.AUTO:
+        if backend == "sqlite":
+            return DatabaseProfile.SQLITE
+        if backend == "postgresql":
+            return DatabaseProfile.POSTGRESQL
+        return DatabaseProfile.DEFAULT
+    if profile != DatabaseProfile.DEFAULT and profile != backend:
+        raise ValueError(f"database_profile {profile!r} does not apply to a {backend} database")
+    return profile
+
+
+def sqlite_pragmas() -> List[Tuple[str, object]]:
+    """PRAGMAs the sqlite profile sets on every new connection, in order."""
+    return [
+        ("journal_mode", settings.sqlite_journal_mode),
+        ("synchronous", settings.sqlite_synchronous),
+        ("mmap_size", settings.sqlite_mmap_size),
+        ("cache_size", settings.sqlite_cache_size),
+        ("busy_timeout", settings.sqlite_busy_timeout),
+    ]
+
+
+def _set_sqlite_pragmas(engine: Engine) -> None:
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def _postgresql_options(database_url: str) -> Dict:
+    driver = make_url(database_url).get_driver_name()
+    options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if driver == "asyncpg":
+        connect_args = {
+            "prepared_statement_cache_size":
+                ASYNCPG_STATEMENT_CACHE_SIZE if settings.postgres_prepare_threshold > 0 else 0,
+        }
+        if settings.postgres_statement_timeout:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.postgres_statement_timeout)}
+    else:
+        connect_args = {}
+        if settings.postgres_statement_timeout:
+            connect_args["options"] = f"-c statement_timeout={settings.postgres_statement_timeout}"
+        if driver == "psycopg":
+            connect_args["prepare_threshold"] = settings.postgres_prepare_threshold or None
+    options["connect_args"] = connect_args
+    return options
+
+
+def engine_options(database_url: str, profile: Optional[str] = None) -> Dict:
+    """Keyword arguments for create_engine / create_async_engine under the profile."""
+    profile = resolve_profile(database_url, profile)
+    if profile == DatabaseProfile.POSTGRESQL:
+        return _postgresql_options(database_url)
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.get_driver_name() != "aiosqlite":
+        return {"connect_args": {"check_same_thread": False}}  # Sessions move between FastAPI's threads
+    return {}
+
+
+def create_profiled_engine(database_url: str, profile: Optional[str] = None) -> Engine:
+    """create_engine(database_url) tuned by the profile."""
+    engine = create_engine(database_url, **engine_options(database_url, profile))
+    if resolve_profile(database_url, profile) == DatabaseProfile.SQLITE:
+        _set_sqlite_pragmas(engine)
+    return engine
+
+
+def create_profiled_async_engine(database_url: str, profile: Optional[str] = None) -> AsyncEngine:
+    """create_async_engine(database_url) tuned by the profile."""
+    engine = create_async_engine(database_url, **engine_options(database_url, profile))
+    if resolve_profile(database_url, profile) == DatabaseProfile.SQLITE:
+        _set_sqlite_pragmas(engine.sync_engine)
+    return engine
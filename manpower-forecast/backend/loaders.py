@@ -0,0 +1,59 @@
+"""Named eager-loading strategies.
+
+Each profile lists the relationships a code path actually touches, loaded
+up front so the number of SQL statements does not grow with the number of
+rows (no per-row lazy loads):
+
+- selectinload for collections (one extra IN query per relationship),
+- joinedload / contains_eager for many-to-one parents,
+- raiseload for relationships the path must never touch, so an accidental
+  lazy load fails loudly instead of silently issuing N queries.
+
+Async sessions (crud_async) cannot lazy load at all, so every relationship
+their callers serialize must come from a profile.
+
+Usage:
+    db.query(models.Project).options(*loaders.PROJECT_WITH_HOURS)
+"""
+from sqlalchemy.orm import selectinload, joinedload, contains_eager, raiseload
+import models
+
+
+# Project serialization (schemas.Project): subcontractors; total_scheduled_hours
+# reads the stored projects.scheduled_hours column.
+PROJECT_WITH_HOURS = (
+    selectinload(models.Project.subcontractors),
+    raiseload(models.Project.schedules),
+    raiseload(models.Project.work_calendar),
+)
+
+# Projects for reports that only need their subcontractor assignments.
+PROJECT_WITH_SUBCONTRACTORS = (
+    selectinload(models.Project.subcontractors),
+    raiseload(models.Project.schedules),
+    raiseload(models.Project.work_calendar),
+)
+
+# Schedule serialization (schemas.ProjectSchedule): phases with their crew type.
+SCHEDULE_WITH_PHASES = (
+    selectinload(models.ProjectSchedule.phases).joinedload(models.SchedulePhase.crew_type),
+)
+
+# Phases for the forecast engines: phase.schedule.project, for queries that
+# already join ProjectSchedule and Project explicitly.
+PHASE_WITH_JOINED_PROJECT = (
+    contains_eager(models.SchedulePhase.schedule).contains_eager(models.ProjectSchedule.project),
+    raiseload(models.SchedulePhase.crew_type),
+)
+
+# Work calendar serialization (schemas.WorkCalendar): holidays.
+CALENDAR_WITH_HOLIDAYS = (
+    selectinload(models.WorkCalendar.holidays),
+    raiseload(models.WorkCalendar.projects),
+)
+
+# Phase serialization (schemas.SchedulePhase): crew type.
+PHASE_WITH_CREW_TYPE = (
+    joinedload(models.SchedulePhase.crew_type),
+    raiseload(models.SchedulePhase.schedule),
+)
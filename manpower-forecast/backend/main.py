@@ -1,12 +1,15 @@
 """FastAPI main application."""
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from config import settings
 from database import init_db, SessionLocal
-from api import projects, schedules, crew_types, forecasts, auth
-from api import export_pdf, subcontractor_reports
+from api import projects, schedules, crew_types, forecasts, auth, work_calendars
+from api import export_pdf, subcontractor_reports, gantt
 import models
 import logger
+import query_guard
+from services.passwords import password_hasher
 
 # Create FastAPI app
 app = FastAPI(
@@ -22,25 +25,46 @@ app.add_middleware(
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+# SQL statement budget (test/CI mode): fail requests with N+1 query patterns
+if settings.sql_statement_budget > 0:
+    @app.middleware("http")
+    async def enforce_sql_statement_budget(request: Request, call_next):
+        label = f"{request.method} {request.url.path}"
+        try:
+            with query_guard.count_statements(settings.sql_statement_budget, label) as counter:
+                response = await call_next(request)
+        except query_guard.QueryBudgetExceeded as e:
+            logger.error(str(e))
+            return JSONResponse(
+                status_code=500,
+                content={"detail": str(e), "statements": e.counter.statements}
+            )
+        response.headers["X-SQL-Statements"] = str(counter.count)
+        return response
+
 # Include routers
 
 
 app.include_router(projects.router)
 app.include_router(schedules.router)
 app.include_router(crew_types.router)
+app.include_router(work_calendars.router)
 app.include_router(forecasts.router)
 app.include_router(auth.router)
 app.include_router(export_pdf.router)
 app.include_router(subcontractor_reports.router)
+app.include_router(gantt.router)
 
 
 @app.on_event("startup")
 def startup_event():
     """Initialize database on startup."""
     init_db()
+    export_pdf.render_queue.start()
     
     # Seed crew types if empty
     db = SessionLocal()
@@ -65,6 +89,13 @@ def startup_event():
         db.close()
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """Stop the PDF render workers and the password hashing threads."""
+    export_pdf.render_queue.shutdown()
+    password_hasher.shutdown()
+
+
 @app.get("/")
 def root():
     """Root endpoint."""
@@ -29,30 +29,20 @@ class Project(Base):
     bfpe_sprinkler_headcount = Column(Integer, default=0)
     bfpe_vesda_headcount = Column(Integer, default=0)
     bfpe_electrical_headcount = Column(Integer, default=0)
+    work_calendar_id = Column(Integer, ForeignKey("work_calendars.id", ondelete="SET NULL"), index=True)  # None = default calendar
+    scheduled_hours = Column(Numeric(12, 2), nullable=False, default=0, server_default="0")  # Maintained by services/project_hours.py
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     schedules = relationship("ProjectSchedule", back_populates="project", cascade="all, delete-orphan")
     subcontractors = relationship("ProjectSubcontractor", back_populates="project", cascade="all, delete-orphan")
+    work_calendar = relationship("WorkCalendar", back_populates="projects")
 
     @property
     def total_scheduled_hours(self):
-        """Calculate total scheduled hours from active schedule."""
-        total = 0.0
-        for schedule in self.schedules:
-            if schedule.is_active:
-                for phase in schedule.phases:
-                    if phase.estimated_man_hours:
-                        total += float(phase.estimated_man_hours)
-                    elif phase.crew_size:
-                        # Calculate hours from crew size
-                        days = (phase.end_date - phase.start_date).days + 1
-                        # Estimate working days (approx 5/7)
-                        # For a precise calc we'd need the service logic, but this is a good property approximation
-                        # Or better: just use total days * 8 * (5/7) or if we want to be simple:
-                        total += float(phase.crew_size) * 8 * days * (5/7)
-        return round(total, 2)
+        """Total scheduled hours of the active schedule, as distributed by the forecast engine."""
+        return round(float(self.scheduled_hours or 0), 2)
 
 
 class CrewType(Base):
@@ -152,3 +142,70 @@ class ProjectSubcontractor(Base):
 
     # Relationships
     project = relationship("Project", back_populates="subcontractors")
+
+
+class PhaseDailyLoad(Base):
+    """Materialized per-working-day load of a schedule phase (see services/daily_load.py)."""
+    __tablename__ = "phase_daily_load"
+
+    id = Column(Integer, primary_key=True, index=True)
+    phase_id = Column(Integer, ForeignKey("schedule_phases.id", ondelete="CASCADE"), nullable=False, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    crew_type_id = Column(Integer, index=True)
+    work_date = Column(Date, nullable=False, index=True)
+    week_start = Column(Date, nullable=False)  # Monday of the ISO week
+    month = Column(String(7), nullable=False)  # "2026-03"
+    man_hours_cents = Column(Integer, nullable=False)  # Integer cents so SUM() is exact
+
+
+class WorkCalendar(Base):
+    """Work calendar (working weekdays + holidays) assigned to projects."""
+    __tablename__ = "work_calendars"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False, unique=True)
+    description = Column(Text)
+    weekmask = Column(String(7), nullable=False, default="1111100")  # Mon..Sun, 1 = working day
+    include_company_holidays = Column(Boolean, default=True)
+    is_default = Column(Boolean, default=False)  # Used for projects without a calendar
+    created_at = Column(DateTime, server_default=func.now())
+
+    # Relationships
+    holidays = relationship("CalendarHoliday", back_populates="calendar", cascade="all, delete-orphan")
+    projects = relationship("Project", back_populates="work_calendar")
+
+
+class CalendarHoliday(Base):
+    """Non-working day; calendar_id None means a company holiday (all calendars)."""
+    __tablename__ = "calendar_holidays"
+
+    id = Column(Integer, primary_key=True, index=True)
+    calendar_id = Column(Integer, ForeignKey("work_calendars.id", ondelete="CASCADE"), index=True)
+    holiday_date = Column(Date, nullable=False, index=True)
+    name = Column(String(255))
+    created_at = Column(DateTime, server_default=func.now())
+
+    # Relationships
+    calendar = relationship("WorkCalendar", back_populates="holidays")
+
+
+class DataVersion(Base):
+    """Schedule data version, bumped by every CRUD write (see services/forecast_cache.py)."""
+    __tablename__ = "data_versions"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class CalendarDay(Base):
+    """Per-calendar day table used for SQL-side forecast aggregation (see services/sql_forecast.py)."""
+    __tablename__ = "calendar_days"
+
+    calendar_id = Column(Integer, primary_key=True)  # work_calendars.id (0 = built-in standard calendar)
+    day = Column(Date, primary_key=True)
+    ordinal = Column(Integer, nullable=False)  # date.toordinal()
+    is_working_day = Column(Integer, nullable=False)  # 1 = working day, 0 = not (integer so it can be summed)
+    working_day_index = Column(Integer, nullable=False)  # Working days strictly before this day (from 0001-01-01)
+    week_start = Column(Date, nullable=False)  # Monday of the ISO week
+    month = Column(String(7), nullable=False)  # "2026-03"
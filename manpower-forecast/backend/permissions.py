@@ -1,7 +1,7 @@
 """Role-based access control (RBAC) permissions."""
 from fastapi import Depends, HTTPException, status
-import models
 from api.auth import get_current_active_user
+from services.principal_cache import Principal
 from constants import UserRole
 
 
@@ -28,9 +28,9 @@ def require_role(minimum_role: str):
             ...
     """
     async def role_checker(
-        current_user: models.User = Depends(get_current_active_user)
-    ) -> models.User:
-        user_role = getattr(current_user, 'role', UserRole.VIEWER) or UserRole.VIEWER
+        current_user: Principal = Depends(get_current_active_user)
+    ) -> Principal:
+        user_role = current_user.role
         user_level = get_role_level(user_role)
         required_level = get_role_level(minimum_role)
 
@@ -45,9 +45,9 @@ def require_role(minimum_role: str):
 
 
 # Convenience dependencies
-def require_admin(current_user: models.User = Depends(get_current_active_user)) -> models.User:
+def require_admin(current_user: Principal = Depends(get_current_active_user)) -> Principal:
     """Require admin role."""
-    user_role = getattr(current_user, 'role', UserRole.VIEWER) or UserRole.VIEWER
+    user_role = current_user.role
     if user_role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -56,9 +56,9 @@ def require_admin(current_user: models.User = Depends(get_current_active_user))
     return current_user
 
 
-def require_editor(current_user: models.User = Depends(get_current_active_user)) -> models.User:
+def require_editor(current_user: Principal = Depends(get_current_active_user)) -> Principal:
     """Require editor or admin role."""
-    user_role = getattr(current_user, 'role', UserRole.VIEWER) or UserRole.VIEWER
+    user_role = current_user.role
     if get_role_level(user_role) < get_role_level(UserRole.EDITOR):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -67,6 +67,6 @@ def require_editor(current_user: models.User = Depends(get_current_active_user))
     return current_user
 
 
-def require_viewer(current_user: models.User = Depends(get_current_active_user)) -> models.User:
+def require_viewer(current_user: Principal = Depends(get_current_active_user)) -> Principal:
     """Require at least viewer role (any authenticated user)."""
     return current_user
@@ -0,0 +1,72 @@
+"""SQL statement counting (N+1 guard).
+
+Counts the statements each request sends to the database. With
+SQL_STATEMENT_BUDGET set (test/CI mode), a request that issues more
+statements than the budget fails with a 500 listing the statements, so a
+new per-row lazy load is caught as soon as an endpoint hits it.
+
+Usage in scripts:
+    with count_statements() as counter:
+        ...
+    print(counter.count)
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MAX_RECORDED_STATEMENTS = 50
+
+_current_counter: ContextVar[Optional["StatementCounter"]] = ContextVar("sql_statement_counter", default=None)
+
+
+class StatementCounter:
+    """Number of statements executed (and the first few, for error messages)."""
+
+    def __init__(self):
+        self.count = 0
+        self.statements: List[str] = []
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        if len(self.statements) < MAX_RECORDED_STATEMENTS:
+            self.statements.append(" ".join(statement.split()))
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised when a block issues more SQL statements than allowed."""
+
+    def __init__(self, counter: StatementCounter, budget: int, label: str = ""):
+        self.counter = counter
+        self.budget = budget
+        super().__init__(
+            f"{label or 'Request'} issued {counter.count} SQL statements (budget {budget})"
+        )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Registered on the Engine class, so every engine is counted
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.record(statement)
+
+
+@contextmanager
+def count_statements(budget: Optional[int] = None, label: str = ""):
+    """
+    Count SQL statements issued inside the block.
+
+    The counter is shared with threads started from this context (FastAPI
+    runs sync endpoints in a threadpool with a copy of the context).
+    Raises QueryBudgetExceeded on exit if budget is given and exceeded.
+    """
+    counter = StatementCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+    if budget is not None and counter.count > budget:
+        raise QueryBudgetExceeded(counter, budget, label)
@@ -0,0 +1,31 @@
+"""
+Rebuild the calendar_days table used by FORECAST_SOURCE=sql.
+
+Calendar, holiday and phase writes keep the table current; run this once
+on an existing database (until then SQL forecasts fall back to the live
+engine).
+
+Usage:
+    python rebuild_calendar_days.py
+"""
+from database import SessionLocal, engine
+import models
+from services.sql_forecast import rebuild_calendar_days
+
+# Create tables if they don't exist
+models.Base.metadata.create_all(bind=engine)
+
+
+def main():
+    db = SessionLocal()
+    try:
+        print("Rebuilding calendar_days...")
+        rows = rebuild_calendar_days(db)
+        db.commit()
+        print(f"Wrote {rows:,} rows.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
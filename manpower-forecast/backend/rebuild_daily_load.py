@@ -0,0 +1,84 @@
+"""
+Rebuild the materialized phase_daily_load table and check it against the live engine.
+
+Usage:
+    python rebuild_daily_load.py            # rebuild, then verify
+    python rebuild_daily_load.py --check    # verify only
+
+Exits with status 1 if the table disagrees with the live forecast.
+"""
+import sys
+from datetime import date
+from sqlalchemy import func
+from database import SessionLocal, engine
+import crud
+import models
+from services.daily_load import rebuild_daily_load, generate_forecast_materialized
+from services.manpower import generate_forecast
+from services.work_calendar import load_calendars
+
+# Create tables if they don't exist
+models.Base.metadata.create_all(bind=engine)
+
+
+def _normalized(forecast: dict) -> dict:
+    """Order-insensitive view of a forecast (project ties may sort differently)."""
+    forecast = dict(forecast)
+    forecast['projects_included'] = sorted(
+        forecast['projects_included'], key=lambda p: (-p['man_hours'], p['id'])
+    )
+    return forecast
+
+
+def verify(db) -> bool:
+    """Compare materialized and live forecasts over the full phase span and each year in it."""
+    first, last = db.query(
+        func.min(models.SchedulePhase.start_date), func.max(models.SchedulePhase.end_date)
+    ).one()
+    if first is None:
+        print("No phases found - nothing to verify.")
+        return True
+
+    windows = [(first, last)]
+    windows += [
+        (max(first, date(year, 1, 1)), min(last, date(year, 12, 31)))
+        for year in range(first.year, last.year + 1)
+    ]
+
+    ok = True
+    for start_date, end_date in windows:
+        phases = crud.get_active_phases_in_date_range(db, start_date, end_date)
+        live = generate_forecast(phases, start_date, end_date, 'monthly', calendars=load_calendars(db))
+        materialized = generate_forecast_materialized(db, start_date, end_date, 'monthly')
+
+        if _normalized(live) == _normalized(materialized):
+            print(f"  OK        {start_date} .. {end_date}  ({live['total_man_hours']:,.2f} hrs)")
+        else:
+            ok = False
+            print(f"  MISMATCH  {start_date} .. {end_date}  "
+                  f"live={live['total_man_hours']:,.2f} materialized={materialized['total_man_hours']:,.2f}")
+    return ok
+
+
+def main():
+    check_only = "--check" in sys.argv[1:]
+    db = SessionLocal()
+    try:
+        if not check_only:
+            print("Rebuilding phase_daily_load...")
+            rows = rebuild_daily_load(db)
+            print(f"Wrote {rows:,} rows.")
+
+        print("Verifying against live forecast engine...")
+        ok = verify(db)
+    finally:
+        db.close()
+
+    if not ok:
+        print("\nphase_daily_load is out of sync with the live engine.")
+        sys.exit(1)
+    print("\nphase_daily_load matches the live engine.")
+
+
+if __name__ == "__main__":
+    main()
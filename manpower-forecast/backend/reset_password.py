@@ -38,7 +38,7 @@ def reset_password():
         db.close()
         return
 
-    # Update password
+    # Update password (cached logins are kept: they do not hold the hash, see services/principal_cache.py)
     user.hashed_password = get_password_hash(new_password)
     db.commit()
     print(f"\nPassword updated successfully for {user.email}")
@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import date, datetime
 from decimal import Decimal
+from services.work_calendar import validate_weekmask
 
 
 # ============================================
@@ -26,6 +27,66 @@ class CrewType(CrewTypeBase):
         from_attributes = True
 
 
+# ============================================
+# Work Calendar Schemas
+# ============================================
+
+class CalendarHolidayBase(BaseModel):
+    holiday_date: date
+    name: Optional[str] = None
+
+
+class CalendarHolidayCreate(CalendarHolidayBase):
+    pass
+
+
+class CalendarHoliday(CalendarHolidayBase):
+    id: int
+    calendar_id: Optional[int] = None  # None = company holiday
+
+    class Config:
+        from_attributes = True
+
+
+class WorkCalendarBase(BaseModel):
+    name: str
+    description: Optional[str] = None
+    weekmask: str = "1111100"  # Mon..Sun, 1 = working day (e.g. "1111110" for 6-day weeks)
+    include_company_holidays: bool = True
+    is_default: bool = False
+
+    @field_validator('weekmask')
+    @classmethod
+    def check_weekmask(cls, v):
+        return validate_weekmask(v)
+
+
+class WorkCalendarCreate(WorkCalendarBase):
+    holidays: Optional[List[CalendarHolidayCreate]] = []
+
+
+class WorkCalendarUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    weekmask: Optional[str] = None
+    include_company_holidays: Optional[bool] = None
+    is_default: Optional[bool] = None
+
+    @field_validator('weekmask')
+    @classmethod
+    def check_weekmask(cls, v):
+        return v if v is None else validate_weekmask(v)
+
+
+class WorkCalendar(WorkCalendarBase):
+    id: int
+    holidays: List[CalendarHoliday] = []
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 # ============================================
 # Subcontractor Schemas
 # ============================================
@@ -72,6 +133,7 @@ class ProjectBase(BaseModel):
     bfpe_sprinkler_headcount: int = 0
     bfpe_vesda_headcount: int = 0
     bfpe_electrical_headcount: int = 0
+    work_calendar_id: Optional[int] = None  # None = default work calendar
 
 
 class ProjectCreate(ProjectBase):
@@ -97,6 +159,7 @@ class ProjectUpdate(BaseModel):
     bfpe_sprinkler_headcount: Optional[int] = None
     bfpe_vesda_headcount: Optional[int] = None
     bfpe_electrical_headcount: Optional[int] = None
+    work_calendar_id: Optional[int] = None
     subcontractors: Optional[List[ProjectSubcontractorCreate]] = None
 
 
@@ -275,3 +338,97 @@ class SubcontractorReport(BaseModel):
     subcontractor_name: str
     total_man_hours: Decimal
     projects: List[SubcontractorProjectInfo] = []
+
+
+class UtilizationWeek(BaseModel):
+    week: str  # ISO week, e.g. 2026-W07
+    week_start: date
+    working_days: int  # Default work calendar
+
+
+class LaborTypeUtilization(BaseModel):
+    labor_type: str
+    total_man_hours: float
+    weekly_hours: List[float] = []  # One value per week
+    weekly_headcount: List[float] = []
+    assigned_headcount: List[float] = []
+
+
+class SubcontractorUtilization(BaseModel):
+    subcontractor_name: str
+    total_man_hours: float
+    peak_headcount: float
+    weekly_hours: List[float] = []
+    weekly_headcount: List[float] = []
+    assigned_headcount: List[float] = []
+    labor_types: List[LaborTypeUtilization] = []
+
+
+class UtilizationReport(BaseModel):
+    start_date: date
+    end_date: date
+    weeks: List[UtilizationWeek] = []
+    subcontractors: List[SubcontractorUtilization] = []
+
+
+# ============================================
+# Gantt Schemas
+# ============================================
+
+class GanttColumns(BaseModel):
+    """One list per column; the n-th entry of every list belongs to the n-th row."""
+    project_id: List[int] = []
+    name: List[str] = []  # Prospective projects carry their manpower estimate, e.g. "Tower (6)"
+    project_number: List[Optional[str]] = []
+    status: List[str] = []
+    start_date: List[date] = []  # First phase start (project start without phases)
+    end_date: List[date] = []
+    bar_start: List[date] = []  # start_date / end_date clipped to the date window
+    bar_end: List[date] = []
+    duration: List[int] = []  # Days
+    bfpe_sprinkler_headcount: List[int] = []
+    bfpe_vesda_headcount: List[int] = []
+    bfpe_electrical_headcount: List[int] = []
+    sprinkler_sub: List[str] = []  # "Name 4" on site, "Name (4)" future manpower
+    vesda_sub: List[str] = []
+    electrical_sub: List[str] = []
+    tags: List[List[str]] = []  # AWS, M, E, V
+    is_out_of_town: List[bool] = []
+
+
+class GanttTimeline(BaseModel):
+    as_of: date
+    timeline_start: date
+    timeline_end: date
+    total_rows: int  # Rows matching the filters (before offset / limit)
+    offset: int
+    limit: int
+    columns: GanttColumns
+
+
+# ============================================
+# Render Job Schemas
+# ============================================
+
+class RenderJobCreate(BaseModel):
+    """Background PDF export request (same filters as the GET /api/export/pdf* endpoints)."""
+    kind: str = Field(..., description="gantt, project, subcontractor or utilization")
+    project_ids: Optional[List[int]] = None  # gantt
+    subcontractor_names: Optional[List[str]] = None  # gantt, utilization
+    project_id: Optional[int] = None  # project
+    subcontractor_name: Optional[str] = None  # subcontractor
+    start_date: Optional[date] = None  # subcontractor, utilization
+    end_date: Optional[date] = None  # subcontractor
+    weeks: int = Field(52, ge=1, le=104)  # utilization
+
+
+class RenderJob(BaseModel):
+    id: str
+    label: str
+    status: str  # queued, running, done, failed
+    filename: str
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    render_seconds: Optional[float] = None
+    error: Optional[str] = None
+    download_url: Optional[str] = None
@@ -0,0 +1,330 @@
+"""Materialized daily-load table.
+
+phase_daily_load holds one row per phase per working day with the same
+cents-per-day value the forecast engine computes. It is kept in sync by
+the CRUD write paths (phase create/update/delete, project status changes,
+schedule changes), so company-wide forecasts become GROUP BY reads.
+
+Only phases of schedulable projects (active/prospective) are materialized,
+matching crud.get_active_phases_in_date_range. Working days come from each
+project's work calendar, so calendar and holiday edits refresh the rows of
+the projects using that calendar.
+"""
+from typing import List, Dict, Optional, Iterator, Tuple
+from datetime import date, timedelta
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session, joinedload
+import calendar
+import models
+from constants import ProjectStatus, ForecastGranularity, ExportPivot
+from services.manpower import calculate_phase_daily_manpower, cents_to_decimal
+from services.work_calendar import load_calendars, project_ids_on_calendar
+
+REBUILD_BATCH_SIZE = 500
+EXPORT_FETCH_SIZE = 1000  # Grouped rows fetched per round trip when streaming exports
+
+
+def _load_rows(db: Session, phase: models.SchedulePhase) -> List[Dict]:
+    """Build phase_daily_load rows for a phase (empty if it isn't forecastable)."""
+    project = phase.schedule.project
+    if project.status not in ProjectStatus.SCHEDULABLE:
+        return []
+    try:
+        records = calculate_phase_daily_manpower(phase, load_calendars(db).for_project(project))
+    except ValueError:
+        return []
+
+    return [
+        {
+            'phase_id': phase.id,
+            'project_id': project.id,
+            'crew_type_id': record['crew_type_id'],
+            'work_date': record['date'],
+            'week_start': record['date'] - timedelta(days=record['date'].weekday()),
+            'month': record['date'].strftime('%Y-%m'),
+            'man_hours_cents': int(record['man_hours'] * 100),
+        }
+        for record in records
+    ]
+
+
+def _insert_rows(db: Session, rows: List[Dict]) -> None:
+    if rows:
+        db.execute(insert(models.PhaseDailyLoad), rows)
+
+
+# ============================================
+# Incremental maintenance (called by crud; caller commits)
+# ============================================
+
+def refresh_phase_load(db: Session, phase: models.SchedulePhase) -> None:
+    """Replace the materialized rows of a single phase."""
+    delete_phase_load(db, [phase.id])
+    _insert_rows(db, _load_rows(db, phase))
+
+
+def delete_phase_load(db: Session, phase_ids: List[int]) -> None:
+    """Remove the materialized rows of the given phases."""
+    if phase_ids:
+        db.query(models.PhaseDailyLoad).filter(
+            models.PhaseDailyLoad.phase_id.in_(phase_ids)
+        ).delete(synchronize_session=False)
+
+
+def refresh_schedule_load(db: Session, schedule: models.ProjectSchedule) -> None:
+    """Replace the materialized rows of every phase in a schedule."""
+    delete_phase_load(db, [phase.id for phase in schedule.phases])
+    for phase in schedule.phases:
+        _insert_rows(db, _load_rows(db, phase))
+
+
+def refresh_project_load(db: Session, project_id: int) -> None:
+    """Replace the materialized rows of every phase in a project (e.g. after a status change)."""
+    delete_project_load(db, project_id)
+    phases = db.query(models.SchedulePhase).join(
+        models.ProjectSchedule
+    ).filter(
+        models.ProjectSchedule.project_id == project_id
+    ).all()
+    for phase in phases:
+        _insert_rows(db, _load_rows(db, phase))
+
+
+def refresh_calendar_load(db: Session, calendar_id: Optional[int] = None) -> None:
+    """
+    Replace the materialized rows of every project on a work calendar.
+
+    calendar_id None (company holidays / default calendar changed) refreshes
+    every project.
+    """
+    for project_id in project_ids_on_calendar(db, calendar_id):
+        refresh_project_load(db, project_id)
+
+
+def delete_project_load(db: Session, project_id: int) -> None:
+    """Remove the materialized rows of a project."""
+    db.query(models.PhaseDailyLoad).filter(
+        models.PhaseDailyLoad.project_id == project_id
+    ).delete(synchronize_session=False)
+
+
+def rebuild_daily_load(db: Session) -> int:
+    """
+    Recompute the whole table from SchedulePhase rows.
+
+    Returns: Number of rows written
+    """
+    db.query(models.PhaseDailyLoad).delete(synchronize_session=False)
+    phases = db.query(models.SchedulePhase).options(
+        joinedload(models.SchedulePhase.schedule).joinedload(models.ProjectSchedule.project)
+    ).all()
+
+    written = 0
+    batch = []
+    for phase in phases:
+        batch.extend(_load_rows(db, phase))
+        if len(batch) >= REBUILD_BATCH_SIZE:
+            _insert_rows(db, batch)
+            written += len(batch)
+            batch = []
+    _insert_rows(db, batch)
+    written += len(batch)
+
+    db.commit()
+    return written
+
+
+# ============================================
+# Forecast reads
+# ============================================
+
+def _apply_filters(
+    db: Session,
+    query,
+    start_date: date,
+    end_date: date,
+    project_ids: Optional[List[int]],
+    crew_type_ids: Optional[List[int]],
+    subcontractor_names: Optional[List[str]]
+):
+    """Apply the same filters as crud.get_active_phases_in_date_range."""
+    load = models.PhaseDailyLoad
+    query = query.filter(load.work_date >= start_date, load.work_date <= end_date)
+
+    if project_ids:
+        query = query.filter(load.project_id.in_(project_ids))
+
+    if crew_type_ids:
+        query = query.filter(load.crew_type_id.in_(crew_type_ids))
+
+    if subcontractor_names:
+        subquery = db.query(models.ProjectSubcontractor.project_id).filter(
+            models.ProjectSubcontractor.subcontractor_name.in_(subcontractor_names)
+        ).distinct()
+        query = query.filter(load.project_id.in_(subquery))
+
+    return query
+
+
+def _rollup(rows) -> Dict:
+    """Fold (bucket, crew_type_id, cents) rows into {bucket: (cents, crew breakdown)}."""
+    buckets = {}
+    for bucket, crew_type_id, cents in rows:
+        entry = buckets.setdefault(bucket, [0, {}])
+        entry[0] += cents
+        if crew_type_id:
+            entry[1][crew_type_id] = entry[1].get(crew_type_id, 0) + cents
+    return buckets
+
+
+def generate_forecast_materialized(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    granularity: str = 'weekly',
+    project_ids: Optional[List[int]] = None,
+    crew_type_ids: Optional[List[int]] = None,
+    subcontractor_names: Optional[List[str]] = None
+) -> Dict:
+    """
+    Generate company-wide forecast from the materialized table.
+
+    Returns the same payload as services.manpower.generate_forecast.
+    """
+    load = models.PhaseDailyLoad
+    filters = (start_date, end_date, project_ids, crew_type_ids, subcontractor_names)
+
+    weekly_forecast = []
+    monthly_forecast = []
+
+    if granularity in ['weekly', 'monthly']:
+        query = db.query(
+            load.week_start, load.crew_type_id, func.sum(load.man_hours_cents)
+        ).group_by(load.week_start, load.crew_type_id)
+        for week_start, (cents, crews) in sorted(_rollup(_apply_filters(db, query, *filters)).items()):
+            year, week_num, _ = week_start.isocalendar()
+            weekly_forecast.append({
+                'week': f"{year}-W{week_num:02d}",
+                'week_start': week_start,
+                'man_hours': cents_to_decimal(cents),
+                'crew_breakdown': {k: cents_to_decimal(v) for k, v in crews.items()}
+            })
+
+    if granularity == 'monthly':
+        query = db.query(
+            load.month, load.crew_type_id, func.sum(load.man_hours_cents)
+        ).group_by(load.month, load.crew_type_id)
+        for month, (cents, crews) in sorted(_rollup(_apply_filters(db, query, *filters)).items()):
+            year, month_num = map(int, month.split('-'))
+            monthly_forecast.append({
+                'month': month,
+                'month_name': f"{calendar.month_name[month_num]} {year}",
+                'man_hours': cents_to_decimal(cents),
+                'crew_breakdown': {k: cents_to_decimal(v) for k, v in crews.items()}
+            })
+
+    query = db.query(
+        load.project_id, models.Project.name, func.sum(load.man_hours_cents)
+    ).join(
+        models.Project, models.Project.id == load.project_id
+    ).group_by(load.project_id, models.Project.name)
+    project_rows = sorted(_apply_filters(db, query, *filters).all(), key=lambda r: (-r[2], r[0]))
+
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'total_man_hours': float(cents_to_decimal(sum(r[2] for r in project_rows))),
+        'project_count': len(project_rows),
+        'weekly_forecast': weekly_forecast,
+        'monthly_forecast': monthly_forecast,
+        'projects_included': [
+            {'id': project_id, 'name': name, 'man_hours': float(cents_to_decimal(cents))}
+            for project_id, name, cents in project_rows
+        ]
+    }
+
+
+def has_load(db: Session) -> bool:
+    """Whether the table has any rows (False on a migrated database before rebuild_daily_load.py)."""
+    return db.query(models.PhaseDailyLoad.id).limit(1).first() is not None
+
+
+# ============================================
+# Streaming reads (exports)
+# ============================================
+
+def _bucket_column(granularity: str):
+    load = models.PhaseDailyLoad
+    return {
+        ForecastGranularity.DAILY: load.work_date,
+        ForecastGranularity.WEEKLY: load.week_start,
+        ForecastGranularity.MONTHLY: load.month,
+    }[granularity]
+
+
+def _pivot_column(pivot: Optional[str]):
+    load = models.PhaseDailyLoad
+    return {
+        None: None,
+        ExportPivot.CREW_TYPE: load.crew_type_id,
+        ExportPivot.PROJECT: load.project_id,
+    }[pivot]
+
+
+def get_pivot_keys(
+    db: Session,
+    pivot: str,
+    start_date: date,
+    end_date: date,
+    project_ids: Optional[List[int]] = None,
+    crew_type_ids: Optional[List[int]] = None,
+    subcontractor_names: Optional[List[str]] = None
+) -> List[Optional[int]]:
+    """Crew type / project IDs with load in the window (the export's pivot columns)."""
+    column = _pivot_column(pivot)
+    query = db.query(column).distinct()
+    query = _apply_filters(db, query, start_date, end_date, project_ids, crew_type_ids, subcontractor_names)
+    return sorted((key for (key,) in query.all()), key=lambda key: (key is None, key or 0))
+
+
+def iter_load_buckets(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    granularity: str = ForecastGranularity.WEEKLY,
+    pivot: Optional[str] = None,
+    project_ids: Optional[List[int]] = None,
+    crew_type_ids: Optional[List[int]] = None,
+    subcontractor_names: Optional[List[str]] = None
+) -> Iterator[Tuple[object, int, Dict[Optional[int], int]]]:
+    """
+    Stream (bucket, total cents, {pivot key: cents}) in bucket order.
+
+    bucket is the work date, week start (Monday) or "YYYY-MM" month. Rows are
+    grouped in the database and fetched EXPORT_FETCH_SIZE at a time, so memory
+    stays flat however long the window is.
+    """
+    bucket_column = _bucket_column(granularity)
+    pivot_column = _pivot_column(pivot)
+    load = models.PhaseDailyLoad
+    if pivot_column is None:
+        query = db.query(bucket_column, func.sum(load.man_hours_cents)).group_by(bucket_column)
+    else:
+        query = db.query(bucket_column, pivot_column, func.sum(load.man_hours_cents)).group_by(
+            bucket_column, pivot_column
+        )
+    query = _apply_filters(db, query, start_date, end_date, project_ids, crew_type_ids, subcontractor_names)
+    rows = query.order_by(bucket_column).execution_options(yield_per=EXPORT_FETCH_SIZE)
+
+    current, total, by_key = None, 0, {}
+    for row in rows:
+        bucket, cents = row[0], row[-1]
+        if bucket != current:
+            if current is not None:
+                yield current, total, by_key
+            current, total, by_key = bucket, 0, {}
+        total += cents
+        if pivot_column is not None:
+            by_key[row[1]] = cents
+    if current is not None:
+        yield current, total, by_key
@@ -1,54 +1,161 @@
-"""Export service for generating CSV files."""
-import pandas as pd
-from typing import List, Dict
-from io import StringIO
+"""Export service for generating CSV, XLSX and ZIP files.
 
+Rows are produced one bucket at a time (see daily_load.iter_load_buckets)
+and CSV text is yielded line by line, so a StreamingResponse can send a
+multi-year daily export without holding it in memory. openpyxl is only
+imported when an XLSX export is requested. ZIP archives are likewise
+written on the fly (iter_zip), one member at a time.
+"""
+import csv
+import time
+import calendar
+import zipfile
+from decimal import Decimal
+from typing import List, Dict, Iterable, Iterator, Optional, Sequence, Tuple, BinaryIO, Union
+from constants import ForecastGranularity
+from services.manpower import cents_to_decimal
 
-def generate_forecast_csv(forecast_data: Dict, granularity: str = 'weekly') -> str:
+EXPORT_CHUNK_SIZE = 64 * 1024  # Bytes per chunk when streaming a spooled file
+
+BUCKET_HEADERS = {
+    ForecastGranularity.DAILY: ['Date'],
+    ForecastGranularity.WEEKLY: ['Week', 'Week Start'],
+    ForecastGranularity.MONTHLY: ['Month', 'Month Name'],
+}
+
+
+class _Line:
+    """File-like object whose write() hands the text back (csv.writer as a generator)."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(rows: Iterable[Sequence]) -> Iterator[str]:
+    """Yield rows as CSV lines."""
+    writer = csv.writer(_Line())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _bucket_labels(granularity: str, bucket) -> list:
+    """Leading label columns of a forecast row (see BUCKET_HEADERS)."""
+    if granularity == ForecastGranularity.DAILY:
+        return [bucket]
+    if granularity == ForecastGranularity.WEEKLY:
+        year, week_num, _ = bucket.isocalendar()
+        return [f"{year}-W{week_num:02d}", bucket]
+    year, month_num = map(int, bucket.split('-'))
+    return [bucket, f"{calendar.month_name[month_num]} {year}"]
+
+
+def forecast_rows(
+    buckets: Iterable[Tuple[object, int, Dict[Optional[int], int]]],
+    granularity: str = ForecastGranularity.WEEKLY,
+    pivot_columns: Optional[List[Tuple[Optional[int], str]]] = None
+) -> Iterator[list]:
     """
-    Generate CSV from forecast data.
-    
+    Header plus one row per forecast bucket.
+
     Args:
-        forecast_data: Forecast dictionary
-        granularity: 'weekly' or 'monthly'
-    
-    Returns:
-        CSV string
+        buckets: (bucket, total cents, {pivot key: cents}) in bucket order
+        granularity: 'daily', 'weekly' or 'monthly'
+        pivot_columns: (pivot key, column label) for per-crew-type / per-project columns
     """
-    if granularity == 'weekly':
-        data = forecast_data.get('weekly_forecast', [])
-        df = pd.DataFrame(data)
-        if not df.empty:
-            df = df[['week', 'week_start', 'man_hours']]
-            df.columns = ['Week', 'Week Start', 'Man Hours']
-    else:
-        data = forecast_data.get('monthly_forecast', [])
-        df = pd.DataFrame(data)
-        if not df.empty:
-            df = df[['month', 'month_name', 'man_hours']]
-            df.columns = ['Month', 'Month Name', 'Man Hours']
-    
-    # Convert to CSV
-    output = StringIO()
-    df.to_csv(output, index=False)
-    return output.getvalue()
-
-
-def generate_project_breakdown_csv(projects: List[Dict]) -> str:
+    pivot_columns = pivot_columns or []
+    yield BUCKET_HEADERS[granularity] + ['Man Hours'] + [label for _, label in pivot_columns]
+    for bucket, cents, by_key in buckets:
+        yield (
+            _bucket_labels(granularity, bucket)
+            + [cents_to_decimal(cents)]
+            + [cents_to_decimal(by_key.get(key, 0)) for key, _ in pivot_columns]
+        )
+
+
+def project_breakdown_rows(projects: List[Dict]) -> Iterator[list]:
+    """Header plus one row per project contribution dict."""
+    yield ['Project Name', 'Man Hours']
+    for project in projects:
+        yield [project['name'], project['man_hours']]
+
+
+def write_xlsx(sheets: Iterable[Tuple[str, Iterable[Sequence]]], fileobj: BinaryIO) -> None:
     """
-    Generate CSV of project contributions.
-    
-    Args:
-        projects: List of project contribution dicts
-    
-    Returns:
-        CSV string
+    Write (sheet title, rows) pairs as an XLSX workbook.
+
+    Uses openpyxl's write-only mode, which spools each sheet to disk as
+    rows are appended instead of building the workbook in memory.
+    """
+    from openpyxl import Workbook  # Only needed for XLSX exports
+
+    workbook = Workbook(write_only=True)
+    for title, rows in sheets:
+        sheet = workbook.create_sheet(title=title[:31])  # Excel's sheet title limit
+        for row in rows:
+            sheet.append([float(value) if isinstance(value, Decimal) else value for value in row])
+    workbook.save(fileobj)
+
+
+def iter_file(fileobj: BinaryIO, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file from the start in chunks, closing it afterwards."""
+    try:
+        fileobj.seek(0)
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+class _Chunks:
+    """Write-only, unseekable file object whose bytes a generator takes as they are written."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, value: bytes) -> int:
+        self.data += value
+        return len(value)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        chunk = bytes(self.data)
+        self.data.clear()
+        return chunk
+
+
+def iter_zip(
+    members: Iterable[Tuple[str, Union[str, bytes]]],
+    chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of (name, file path or bytes) members as it is written.
+
+    zipfile writes data descriptors when its file is not seekable, so no
+    member or archive has to fit in memory; the next member is only pulled
+    from members once the previous one has been written. Files are stored
+    (PDFs and XLSX are already compressed); bytes members are deflated.
     """
-    df = pd.DataFrame(projects)
-    if not df.empty:
-        df = df[['name', 'man_hours']]
-        df.columns = ['Project Name', 'Man Hours']
-    
-    output = StringIO()
-    df.to_csv(output, index=False)
-    return output.getvalue()
+    sink = _Chunks()
+    with zipfile.ZipFile(sink, 'w') as archive:
+        for name, source in members:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            if isinstance(source, bytes):
+                info.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(info, source)
+            else:
+                with open(source, 'rb') as src, archive.open(info, 'w') as dest:
+                    while True:
+                        chunk = src.read(chunk_size)
+                        if not chunk:
+                            break
+                        dest.write(chunk)
+                        if len(sink.data) >= chunk_size:
+                            yield sink.take()
+            if sink.data:
+                yield sink.take()
+    yield sink.take()
@@ -0,0 +1,207 @@
+"""Forecast result cache.
+
+Company-wide forecasts only change when schedule data changes, so results
+are cached in-process (LRU with TTL and size bound) under a key that
+includes the current data version. The CRUD write paths bump the version
+(a single row in data_versions) in the same transaction as the write, so a
+new version simply makes older entries unreachable; they age out of the LRU.
+
+An optional disk tier (settings.forecast_cache_dir) stores pickled results
+by key hash so a restarted worker can warm up without recomputing.
+
+Cached results are shared between callers and must not be mutated.
+"""
+from typing import Any, Callable, Dict, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from sqlalchemy.orm import Session
+import models
+import logger
+from config import settings
+
+DATA_VERSION_ID = 1
+
+
+# ============================================
+# Data version
+# ============================================
+
+def get_data_version(db: Session) -> int:
+    """Current schedule data version (0 if nothing has been written yet)."""
+    version = db.query(models.DataVersion.version).filter(
+        models.DataVersion.id == DATA_VERSION_ID
+    ).scalar()
+    return version or 0
+
+
+def bump_data_version(db: Session) -> None:
+    """Increment the data version (caller commits, together with the write)."""
+    updated = db.query(models.DataVersion).filter(
+        models.DataVersion.id == DATA_VERSION_ID
+    ).update({models.DataVersion.version: models.DataVersion.version + 1}, synchronize_session=False)
+    if not updated:
+        db.add(models.DataVersion(id=DATA_VERSION_ID, version=1))
+
+
+# ============================================
+# Cache
+# ============================================
+
+class ForecastCache:
+    """Thread-safe LRU cache with TTL, size bound, counters and an optional disk tier."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300,
+                 disk_dir: Optional[str] = None, max_disk_entries: int = 2000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """Cached value for key, or None (expired entries count as misses)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        value = self._disk_get(key)
+        with self._lock:
+            if value is not None:
+                self.disk_hits += 1
+                self._store(key, value, now)
+            else:
+                self.misses += 1
+        return value
+
+    def put(self, key: Tuple, value: Any) -> None:
+        with self._lock:
+            self._store(key, value, time.monotonic())
+        self._disk_put(key, value)
+
+    def get_or_compute(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """Return the cached value or compute, store and return it."""
+        if self.max_entries <= 0:
+            return compute()
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                'disk_tier': bool(self.disk_dir),
+            }
+
+    def _store(self, key: Tuple, value: Any, stored_at: float) -> None:
+        """Insert under the lock, evicting least recently used entries."""
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    # Disk tier
+
+    def _disk_path(self, key: Tuple) -> str:
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.pickle")
+
+    def _disk_get(self, key: Tuple) -> Optional[Any]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                os.remove(path)
+                return None
+            with open(path, 'rb') as f:
+                stored_key, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable forecast cache file {path}: {e}")
+            return None
+        # Guard against hash collisions
+        return value if stored_key == key else None
+
+    def _disk_put(self, key: Tuple, value: Any) -> None:
+        if not self.disk_dir:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._disk_path(key))
+            self._prune_disk()
+        except OSError as e:
+            logger.warning(f"Could not write forecast cache file: {e}")
+
+    def _prune_disk(self) -> None:
+        """Drop the oldest files beyond max_disk_entries."""
+        paths = [
+            os.path.join(self.disk_dir, name)
+            for name in os.listdir(self.disk_dir) if name.endswith('.pickle')
+        ]
+        if len(paths) <= self.max_disk_entries:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+forecast_cache = ForecastCache(
+    max_entries=settings.forecast_cache_size,
+    ttl_seconds=settings.forecast_cache_ttl,
+    disk_dir=settings.forecast_cache_dir or None
+)
+
+
+def forecast_cache_key(db: Session, start_date, end_date, granularity: str,
+                       project_ids=None, crew_type_ids=None, subcontractor_names=None) -> Tuple:
+    """Cache key for a company-wide forecast at the current data version."""
+    return (
+        start_date,
+        end_date,
+        tuple(sorted(set(project_ids))) if project_ids else None,
+        tuple(sorted(set(crew_type_ids))) if crew_type_ids else None,
+        tuple(sorted(set(subcontractor_names))) if subcontractor_names else None,
+        granularity,
+        get_data_version(db),
+    )
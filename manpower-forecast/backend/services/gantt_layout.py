@@ -0,0 +1,307 @@
+"""Gantt layout model.
+
+One row per project with a bar, sorted by name: the bar spans the
+project's phases (any schedule) or, without phases, the project's own
+dates, and carries the BFPE trade headcounts, the subcontractor labels per
+labor type and the trade tags. GanttChartPDF draws these rows and
+GET /api/gantt serves them as columns, so the browser chart and the PDF
+agree.
+
+Spans come from a single GROUP BY (min start, max end per project)
+instead of loading every phase; phase_spans computes the same thing from
+already loaded phase dicts in one pass. get_rows caches the rows per
+filter, day and data version (shared with the subcontractor reports'
+cache); cached rows must not be mutated.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+import models
+import loaders
+from constants import ProjectStatus
+from services.forecast_cache import get_data_version
+from services.subcontractor_report import report_cache
+
+# Project attributes the layout reads (plain dicts are picklable for render workers)
+GANTT_PROJECT_FIELDS = (
+    'id', 'name', 'project_number', 'status', 'start_date', 'end_date', 'required_manpower',
+    'bfpe_sprinkler_headcount', 'bfpe_vesda_headcount', 'bfpe_electrical_headcount',
+    'is_aws', 'is_mechanical', 'is_electrical', 'is_vesda', 'is_out_of_town',
+)
+
+# (project flag, badge label, badge color) in drawing order
+TRADE_TAGS = (
+    ('is_aws', 'AWS', '#7c3aed'),        # Purple
+    ('is_mechanical', 'M', '#2563eb'),   # Blue
+    ('is_electrical', 'E', '#d97706'),   # Amber
+    ('is_vesda', 'V', '#db2777'),        # Pink
+)
+
+# Trade filter -> project flag
+TRADE_FLAGS = {'mechanical': 'is_mechanical', 'electrical': 'is_electrical', 'vesda': 'is_vesda'}
+AWS_FILTERS = ('aws', 'standard')
+
+LABOR_TYPES = ('sprinkler', 'vesda', 'electrical')
+DATE_BUFFER_DAYS = 7  # Timeline margin around the earliest start / latest end
+
+Span = Tuple[date, date]
+
+
+def gantt_project(project: models.Project) -> dict:
+    """Plain-data view of a project for the layout."""
+    return {field: getattr(project, field) for field in GANTT_PROJECT_FIELDS}
+
+
+def project_subcontractor_labels(project: models.Project,
+                                 subcontractor_names: Optional[List[str]] = None) -> List[dict]:
+    """The project's subcontractors (only subcontractor_names if given) as layout dicts."""
+    subs = project.subcontractors
+    if subcontractor_names:
+        subs = [s for s in subs if s.subcontractor_name in subcontractor_names]
+    return [
+        {'name': s.subcontractor_name, 'headcount': s.headcount or 0, 'labor_type': s.labor_type}
+        for s in subs
+    ]
+
+
+def query_spans(db: Session, project_ids: Iterable[int]) -> Dict[int, Span]:
+    """(earliest phase start, latest phase end) per project, over all of its schedules."""
+    project_ids = list(project_ids)
+    if not project_ids:
+        return {}
+    rows = db.query(
+        models.ProjectSchedule.project_id,
+        func.min(models.SchedulePhase.start_date),
+        func.max(models.SchedulePhase.end_date)
+    ).join(
+        models.SchedulePhase, models.SchedulePhase.schedule_id == models.ProjectSchedule.id
+    ).filter(
+        models.ProjectSchedule.project_id.in_(project_ids)
+    ).group_by(models.ProjectSchedule.project_id).all()
+    return {project_id: (start, end) for project_id, start, end in rows}
+
+
+def phase_spans(phases: Iterable[dict]) -> Dict[int, Span]:
+    """query_spans for {'project_id', 'start_date', 'end_date'} phase dicts (one pass)."""
+    starts = {}
+    ends = {}
+    for phase in phases:
+        project_id = phase['project_id']
+        if phase['start_date'] and (project_id not in starts or phase['start_date'] < starts[project_id]):
+            starts[project_id] = phase['start_date']
+        if phase['end_date'] and (project_id not in ends or phase['end_date'] > ends[project_id]):
+            ends[project_id] = phase['end_date']
+    return {project_id: (starts.get(project_id), ends.get(project_id)) for project_id in starts.keys() | ends.keys()}
+
+
+def load_gantt_data(db: Session, project_ids: Optional[List[int]] = None,
+                    subcontractor_names: Optional[List[str]] = None) -> dict:
+    """
+    Projects (active/prospective, optionally filtered), their spans and
+    subcontractor labels: everything build_rows needs, in three queries.
+    """
+    query = db.query(models.Project).options(*loaders.PROJECT_WITH_SUBCONTRACTORS).filter(
+        models.Project.status.in_(ProjectStatus.SCHEDULABLE)
+    )
+    if project_ids:
+        query = query.filter(models.Project.id.in_(project_ids))
+    if subcontractor_names:
+        subquery = db.query(models.ProjectSubcontractor.project_id).filter(
+            models.ProjectSubcontractor.subcontractor_name.in_(subcontractor_names)
+        ).distinct()
+        query = query.filter(models.Project.id.in_(subquery))
+    projects = query.all()
+
+    return {
+        'projects': [gantt_project(project) for project in projects],
+        'spans': query_spans(db, [project.id for project in projects]),
+        'project_subcontractors': {
+            project.id: project_subcontractor_labels(project, subcontractor_names) for project in projects
+        },
+    }
+
+
+def load_project_data(db: Session, project_id: int) -> Optional[dict]:
+    """
+    load_gantt_data for one project (any status), or None if it does not
+    exist: the project with its span in one query (indexed on the schedule
+    and phase foreign keys), plus its subcontractors.
+    """
+    row = db.query(
+        models.Project,
+        func.min(models.SchedulePhase.start_date),
+        func.max(models.SchedulePhase.end_date)
+    ).options(*loaders.PROJECT_WITH_SUBCONTRACTORS).outerjoin(
+        models.ProjectSchedule, models.ProjectSchedule.project_id == models.Project.id
+    ).outerjoin(
+        models.SchedulePhase, models.SchedulePhase.schedule_id == models.ProjectSchedule.id
+    ).filter(models.Project.id == project_id).group_by(models.Project.id).first()
+    if row is None:
+        return None
+
+    project, start, end = row
+    return {
+        'project': project,
+        'projects': [gantt_project(project)],
+        'spans': {project.id: (start, end)} if start else {},
+        'project_subcontractors': {project.id: project_subcontractor_labels(project)},
+    }
+
+
+def format_subcontractors(subs: List[dict], use_parens: bool) -> str:
+    """"Name HC" for crews on site, "Name (HC)" for future manpower, plain name without headcount."""
+    parts = []
+    for s in subs:
+        name = s['name']
+        hc = s.get('headcount', 0)
+        if hc:
+            parts.append(f"{name} ({hc})" if use_parens else f"{name} {hc}")
+        else:
+            parts.append(name)
+    return ', '.join(parts)
+
+
+def build_rows(projects: List[dict], spans: Dict[int, Span],
+               project_subcontractors: Optional[Dict[int, List[dict]]] = None,
+               today: Optional[date] = None) -> List[dict]:
+    """
+    Gantt rows sorted by name (projects without any dates are left out).
+
+    today decides whether an active project's crews are on site yet
+    ("Name 4") or still future manpower ("Name (4)").
+    """
+    project_subcontractors = project_subcontractors or {}
+    today = today or date.today()
+    rows = []
+    for project in sorted(projects, key=lambda p: p['name'].lower()):
+        project_start, project_end = spans.get(project['id']) or (project['start_date'], project['end_date'])
+        if not (project_start and project_end):
+            continue
+
+        # Parentheses for prospective projects and active ones that have not started yet
+        use_parens = (project['status'] == 'prospective' or
+                      (project['status'] == 'active' and project_start > today))
+        subs_info = project_subcontractors.get(project['id'], [])
+        subs_by_type = {
+            labor_type: format_subcontractors([s for s in subs_info if s.get('labor_type') == labor_type], use_parens)
+            for labor_type in LABOR_TYPES
+        }
+
+        # For prospective projects, append manpower estimate to name
+        display_name = project['name']
+        req_manpower = project.get('required_manpower', 0) or 0
+        if project['status'] == 'prospective' and req_manpower > 0:
+            display_name = f"{project['name']} ({req_manpower})"
+
+        rows.append({
+            'activity_id': f"PROJ-{project['id']}",
+            'project_id': project['id'],
+            'name': display_name,
+            'project_number': project.get('project_number'),
+            'project_status': project['status'],
+            'bfpe_sprinkler_headcount': project.get('bfpe_sprinkler_headcount', 0) or 0,
+            'bfpe_vesda_headcount': project.get('bfpe_vesda_headcount', 0) or 0,
+            'bfpe_electrical_headcount': project.get('bfpe_electrical_headcount', 0) or 0,
+            'sprinkler_sub': subs_by_type['sprinkler'],
+            'vesda_sub': subs_by_type['vesda'],
+            'electrical_sub': subs_by_type['electrical'],
+            'duration': (project_end - project_start).days,
+            'start_date': project_start,
+            'end_date': project_end,
+            'bar_type': 'remaining',
+            'indent_level': 0,
+            'is_summary': False,
+            'is_aws': project.get('is_aws', False) or False,
+            'is_mechanical': project.get('is_mechanical', False) or False,
+            'is_electrical': project.get('is_electrical', False) or False,
+            'is_vesda': project.get('is_vesda', False) or False,
+            'is_out_of_town': project.get('is_out_of_town', False) or False,
+        })
+    return rows
+
+
+def get_rows(db: Session, project_ids: Optional[List[int]] = None,
+             subcontractor_names: Optional[List[str]] = None,
+             today: Optional[date] = None) -> List[dict]:
+    """build_rows over load_gantt_data (cached per filter, day and data version)."""
+    today = today or date.today()
+    key = ('gantt', tuple(sorted(set(project_ids or ()))), tuple(sorted(set(subcontractor_names or ()))),
+           today, get_data_version(db))
+
+    def compute():
+        data = load_gantt_data(db, project_ids, subcontractor_names)
+        return build_rows(data['projects'], data['spans'], data['project_subcontractors'], today)
+
+    return report_cache.get_or_compute(key, compute)
+
+
+def filter_rows(rows: List[dict], status: Optional[str] = None, trade: Optional[str] = None,
+                aws: Optional[str] = None) -> List[dict]:
+    """Rows of one status, with a trade flag (TRADE_FLAGS) and/or AWS or standard only."""
+    flag = TRADE_FLAGS.get(trade)
+    return [
+        row for row in rows
+        if (not status or row['project_status'] == status)
+        and (not flag or row[flag])
+        and (not aws or row['is_aws'] == (aws == 'aws'))
+    ]
+
+
+def row_tags(row: dict) -> List[str]:
+    """Trade tag labels of a row, in drawing order."""
+    return [label for flag, label, _ in TRADE_TAGS if row.get(flag)]
+
+
+def timeline_range(rows: List[dict], today: Optional[date] = None) -> Span:
+    """Timeline covering every bar plus DATE_BUFFER_DAYS (30 days from today without rows)."""
+    if not rows:
+        today = today or date.today()
+        return today - timedelta(days=DATE_BUFFER_DAYS), today + timedelta(days=30 + DATE_BUFFER_DAYS)
+    buffer = timedelta(days=DATE_BUFFER_DAYS)
+    return (min(row['start_date'] for row in rows) - buffer,
+            max(row['end_date'] for row in rows) + buffer)
+
+
+def clip_rows(rows: List[dict], window_start: Optional[date], window_end: Optional[date]) -> List[dict]:
+    """Rows whose bar overlaps the window, with bar_start / bar_end clipped to it."""
+    clipped = []
+    for row in rows:
+        if (window_start and row['end_date'] < window_start) or (window_end and row['start_date'] > window_end):
+            continue
+        clipped.append({
+            **row,
+            'bar_start': max(row['start_date'], window_start) if window_start else row['start_date'],
+            'bar_end': min(row['end_date'], window_end) if window_end else row['end_date'],
+        })
+    return clipped
+
+
+# API column name -> row key (or function of the row)
+ROW_COLUMNS = {
+    'project_id': 'project_id',
+    'name': 'name',
+    'project_number': 'project_number',
+    'status': 'project_status',
+    'start_date': 'start_date',
+    'end_date': 'end_date',
+    'bar_start': 'bar_start',
+    'bar_end': 'bar_end',
+    'duration': 'duration',
+    'bfpe_sprinkler_headcount': 'bfpe_sprinkler_headcount',
+    'bfpe_vesda_headcount': 'bfpe_vesda_headcount',
+    'bfpe_electrical_headcount': 'bfpe_electrical_headcount',
+    'sprinkler_sub': 'sprinkler_sub',
+    'vesda_sub': 'vesda_sub',
+    'electrical_sub': 'electrical_sub',
+    'tags': row_tags,
+    'is_out_of_town': 'is_out_of_town',
+}
+
+
+def columnar(rows: List[dict]) -> Dict[str, list]:
+    """Rows as one list per column (see ROW_COLUMNS)."""
+    return {
+        column: [key(row) for row in rows] if callable(key) else [row[key] for row in rows]
+        for column, key in ROW_COLUMNS.items()
+    }
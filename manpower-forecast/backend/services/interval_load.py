@@ -0,0 +1,307 @@
+"""Interval-based manpower aggregation.
+
+Each phase is added as a (start, end, hours-per-working-day) interval.
+Instead of emitting one record per working day, the accumulator keeps a
+sorted list of breakpoints with the running daily rate and the prefix sum
+of load up to each breakpoint. Weekly, monthly and per-project totals are
+then range queries: prefix(end + 1) - prefix(start), each answered with a
+binary search plus a working-day count from the work calendar (a
+subtraction of two cumulative lookups). Phases on different work calendars
+go into separate accumulators whose range totals are summed.
+
+Cost is O(phases log phases + buckets log phases), independent of how many
+days each phase spans. Hours are carried as integer cents so the results
+match the reference engine in services.manpower.
+"""
+from typing import List, Dict, Tuple
+from datetime import date, timedelta
+from bisect import bisect_right
+from collections import defaultdict
+import calendar
+import models
+from constants import ForecastGranularity, ExportPivot
+from services.manpower import get_phase_total_hours, get_phase_daily_hours, cents_to_decimal
+from services.work_calendar import BusinessCalendar, CalendarSet, STANDARD_CALENDAR, STANDARD_CALENDARS
+
+
+class IntervalAccumulator:
+    """Prefix-sum structure of per-working-day load keyed by date ordinal (one work calendar)."""
+
+    def __init__(self, work_calendar: BusinessCalendar = STANDARD_CALENDAR):
+        self.work_calendar = work_calendar
+        self._deltas = defaultdict(int)
+        self._breakpoints = None
+        self._rates = None
+        self._prefix = None
+
+    def add(self, start_date: date, end_date: date, per_day: int) -> None:
+        """Add per_day to every working day in [start_date, end_date]."""
+        if per_day == 0 or end_date < start_date:
+            return
+        self._deltas[start_date.toordinal()] += per_day
+        self._deltas[end_date.toordinal() + 1] -= per_day
+        self._breakpoints = None
+
+    def _freeze(self) -> None:
+        """Sort breakpoints and compute rate/prefix at each one."""
+        self._breakpoints = sorted(self._deltas)
+        self._rates = []
+        self._prefix = []
+        rate = 0
+        total = 0
+        previous = None
+        for ordinal in self._breakpoints:
+            if previous is not None:
+                total += rate * self._working_days_between(previous, ordinal)
+            rate += self._deltas[ordinal]
+            self._rates.append(rate)
+            self._prefix.append(total)
+            previous = ordinal
+
+    def prefix(self, ordinal: int) -> int:
+        """Total load over working days strictly before ordinal."""
+        if self._breakpoints is None:
+            self._freeze()
+        i = bisect_right(self._breakpoints, ordinal) - 1
+        if i < 0:
+            return 0
+        return self._prefix[i] + self._rates[i] * self._working_days_between(self._breakpoints[i], ordinal)
+
+    def range_total(self, start_date: date, end_date: date) -> int:
+        """Total load over working days in [start_date, end_date]."""
+        return self.prefix(end_date.toordinal() + 1) - self.prefix(start_date.toordinal())
+
+    def _working_days_between(self, start_ordinal: int, end_ordinal: int) -> int:
+        """Working days in ordinals [start_ordinal, end_ordinal)."""
+        return self.work_calendar.working_days_before(date.fromordinal(end_ordinal)) - \
+            self.work_calendar.working_days_before(date.fromordinal(start_ordinal))
+
+
+class CalendarAccumulators:
+    """One IntervalAccumulator per work calendar; range totals are summed across them."""
+
+    def __init__(self):
+        self._accumulators = {}
+
+    def add(self, work_calendar: BusinessCalendar, start_date: date, end_date: date, per_day: int) -> None:
+        if work_calendar.id not in self._accumulators:
+            self._accumulators[work_calendar.id] = IntervalAccumulator(work_calendar)
+        self._accumulators[work_calendar.id].add(start_date, end_date, per_day)
+
+    def range_total(self, start_date: date, end_date: date) -> int:
+        return sum(a.range_total(start_date, end_date) for a in self._accumulators.values())
+
+
+def _week_buckets(start_date: date, end_date: date) -> List[tuple]:
+    """(week key, week start, range start, range end) for each ISO week touching the window."""
+    buckets = []
+    monday = start_date - timedelta(days=start_date.weekday())
+    while monday <= end_date:
+        year, week_num, _ = monday.isocalendar()
+        buckets.append((
+            f"{year}-W{week_num:02d}",
+            monday,
+            max(monday, start_date),
+            min(monday + timedelta(days=6), end_date)
+        ))
+        monday += timedelta(weeks=1)
+    return buckets
+
+
+def _month_buckets(start_date: date, end_date: date) -> List[tuple]:
+    """(month key, month name, range start, range end) for each month touching the window."""
+    buckets = []
+    year, month = start_date.year, start_date.month
+    while date(year, month, 1) <= end_date:
+        last_day = calendar.monthrange(year, month)[1]
+        buckets.append((
+            f"{year}-{month:02d}",
+            f"{calendar.month_name[month]} {year}",
+            max(date(year, month, 1), start_date),
+            min(date(year, month, last_day), end_date)
+        ))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return buckets
+
+
+def _query_bucket(total: CalendarAccumulators, presence: CalendarAccumulators,
+                  crews: Dict, crew_presence: Dict, range_start: date, range_end: date):
+    """Range-query one bucket; returns (cents, crew breakdown) or None if the bucket is empty."""
+    if presence.range_total(range_start, range_end) == 0:
+        return None
+    crew_breakdown = {}
+    for crew_type_id, accumulator in crews.items():
+        if crew_presence[crew_type_id].range_total(range_start, range_end) > 0:
+            crew_breakdown[crew_type_id] = cents_to_decimal(accumulator.range_total(range_start, range_end))
+    return cents_to_decimal(total.range_total(range_start, range_end)), crew_breakdown
+
+
+def generate_forecast_intervals(
+    phases: List[models.SchedulePhase],
+    start_date: date,
+    end_date: date,
+    granularity: str = 'weekly',
+    calendars: CalendarSet = STANDARD_CALENDARS
+) -> Dict:
+    """
+    Generate manpower forecast from list of phases (interval accumulator).
+
+    Same arguments and return value as services.manpower.generate_forecast.
+    """
+    total = CalendarAccumulators()
+    presence = CalendarAccumulators()
+    crews = {}
+    crew_presence = {}
+    project_names = {}
+    project_totals = {}
+
+    for phase in phases:
+        try:
+            total_hours = get_phase_total_hours(phase)
+        except ValueError:
+            # Skip phases with invalid data
+            continue
+        project_id = phase.schedule.project_id
+        if project_id not in project_names:
+            project_names[project_id] = phase.schedule.project.name
+
+        work_calendar = calendars.for_phase(phase)
+        num_working_days = work_calendar.count_working_days(phase.start_date, phase.end_date)
+        if num_working_days == 0:
+            continue
+
+        # Clip to requested date range
+        clipped_start = max(phase.start_date, start_date)
+        clipped_end = min(phase.end_date, end_date)
+        in_range_days = work_calendar.count_working_days(clipped_start, clipped_end)
+        if in_range_days == 0:
+            continue
+
+        daily_cents = int(get_phase_daily_hours(total_hours, num_working_days) * 100)
+        project_totals[project_id] = project_totals.get(project_id, 0) + daily_cents * in_range_days
+
+        total.add(work_calendar, clipped_start, clipped_end, daily_cents)
+        presence.add(work_calendar, clipped_start, clipped_end, 1)
+        if phase.crew_type_id:
+            if phase.crew_type_id not in crews:
+                crews[phase.crew_type_id] = CalendarAccumulators()
+                crew_presence[phase.crew_type_id] = CalendarAccumulators()
+            crews[phase.crew_type_id].add(work_calendar, clipped_start, clipped_end, daily_cents)
+            crew_presence[phase.crew_type_id].add(work_calendar, clipped_start, clipped_end, 1)
+
+    weekly_forecast = []
+    monthly_forecast = []
+
+    if granularity in ['weekly', 'monthly'] and project_totals:
+        for week, week_start, range_start, range_end in _week_buckets(start_date, end_date):
+            result = _query_bucket(total, presence, crews, crew_presence, range_start, range_end)
+            if result:
+                weekly_forecast.append({
+                    'week': week,
+                    'week_start': week_start,
+                    'man_hours': result[0],
+                    'crew_breakdown': result[1]
+                })
+
+    if granularity == 'monthly' and project_totals:
+        for month, month_name, range_start, range_end in _month_buckets(start_date, end_date):
+            result = _query_bucket(total, presence, crews, crew_presence, range_start, range_end)
+            if result:
+                monthly_forecast.append({
+                    'month': month,
+                    'month_name': month_name,
+                    'man_hours': result[0],
+                    'crew_breakdown': result[1]
+                })
+
+    # Sort by hours (stable, so ties keep first-seen order like the reference engine)
+    projects_included = [
+        {
+            'id': project_id,
+            'name': project_names.get(project_id, 'Unknown'),
+            'man_hours': float(cents_to_decimal(cents))
+        }
+        for project_id, cents in sorted(project_totals.items(), key=lambda x: x[1], reverse=True)
+    ]
+
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'total_man_hours': float(cents_to_decimal(sum(project_totals.values()))),
+        'project_count': len(project_totals),
+        'weekly_forecast': weekly_forecast,
+        'monthly_forecast': monthly_forecast,
+        'projects_included': projects_included
+    }
+
+
+def _export_buckets(start_date: date, end_date: date, granularity: str) -> List[tuple]:
+    """(export bucket, range start, range end) for each day / week / month touching the window."""
+    if granularity == ForecastGranularity.DAILY:
+        days = (start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1))
+        return [(day, day, day) for day in days]
+    if granularity == ForecastGranularity.WEEKLY:
+        return [(week_start, range_start, range_end)
+                for _, week_start, range_start, range_end in _week_buckets(start_date, end_date)]
+    return [(month, range_start, range_end)
+            for month, _, range_start, range_end in _month_buckets(start_date, end_date)]
+
+
+def load_buckets_intervals(
+    phases: List[models.SchedulePhase],
+    start_date: date,
+    end_date: date,
+    granularity: str = ForecastGranularity.WEEKLY,
+    calendars: CalendarSet = STANDARD_CALENDARS
+) -> List[Tuple]:
+    """
+    Export buckets with crew type / project splits (interval accumulator).
+
+    Same arguments and return value as services.manpower.generate_load_buckets.
+    """
+    total = CalendarAccumulators()
+    presence = CalendarAccumulators()
+    # {pivot: {key: (load, presence)}}
+    splits = {ExportPivot.CREW_TYPE: {}, ExportPivot.PROJECT: {}}
+
+    for phase in phases:
+        try:
+            total_hours = get_phase_total_hours(phase)
+        except ValueError:
+            # Skip phases with invalid data
+            continue
+        work_calendar = calendars.for_phase(phase)
+        num_working_days = work_calendar.count_working_days(phase.start_date, phase.end_date)
+        if num_working_days == 0:
+            continue
+
+        clipped_start = max(phase.start_date, start_date)
+        clipped_end = min(phase.end_date, end_date)
+        if work_calendar.count_working_days(clipped_start, clipped_end) == 0:
+            continue
+
+        daily_cents = int(get_phase_daily_hours(total_hours, num_working_days) * 100)
+        total.add(work_calendar, clipped_start, clipped_end, daily_cents)
+        presence.add(work_calendar, clipped_start, clipped_end, 1)
+        for pivot, key in ((ExportPivot.CREW_TYPE, phase.crew_type_id),
+                           (ExportPivot.PROJECT, phase.schedule.project_id)):
+            if key not in splits[pivot]:
+                splits[pivot][key] = (CalendarAccumulators(), CalendarAccumulators())
+            splits[pivot][key][0].add(work_calendar, clipped_start, clipped_end, daily_cents)
+            splits[pivot][key][1].add(work_calendar, clipped_start, clipped_end, 1)
+
+    buckets = []
+    if not splits[ExportPivot.PROJECT]:
+        return buckets
+    for bucket, range_start, range_end in _export_buckets(start_date, end_date, granularity):
+        if presence.range_total(range_start, range_end) == 0:
+            continue
+        buckets.append((bucket, total.range_total(range_start, range_end), {
+            pivot: {
+                key: load.range_total(range_start, range_end)
+                for key, (load, key_presence) in accumulators.items()
+                if key_presence.range_total(range_start, range_end) > 0
+            }
+            for pivot, accumulators in splits.items()
+        }))
+    return buckets
@@ -1,63 +1,110 @@
 """Manpower calculation and forecasting service."""
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from datetime import date, timedelta
 from decimal import Decimal
 from collections import defaultdict
 import calendar
 import models
+from config import settings
+from constants import ForecastEngine, ForecastGranularity, ExportPivot
+from services.work_calendar import BusinessCalendar, CalendarSet, STANDARD_CALENDAR, STANDARD_CALENDARS
 
 
-def get_working_days(start_date: date, end_date: date) -> List[date]:
+def get_working_days(start_date: date, end_date: date,
+                     work_calendar: Optional[BusinessCalendar] = None) -> List[date]:
     """
-    Returns list of weekdays (Mon-Fri) between start and end (inclusive).
-    
-    v1: Simple weekday filter
-    v2: Honor company holidays, custom work calendars
+    Returns list of working days between start and end (inclusive).
+
+    Uses the given work calendar (weekmask + holidays); defaults to the
+    standard Mon-Fri calendar without holidays.
     """
-    days = []
-    current = start_date
-    
-    while current <= end_date:
-        # 0 = Monday, 6 = Sunday
-        if current.weekday() < 5:  # Monday to Friday
-            days.append(current)
-        current += timedelta(days=1)
-    
-    return days
+    return (work_calendar or STANDARD_CALENDAR).working_days(start_date, end_date)
 
 
-def calculate_phase_daily_manpower(phase: models.SchedulePhase) -> List[Dict]:
+def count_working_days(start_date: date, end_date: date,
+                       work_calendar: Optional[BusinessCalendar] = None) -> int:
     """
-    Distribute a phase's man-hours evenly across its duration.
+    Count working days between start and end (inclusive) without building the list.
 
-    Returns: List of daily manpower records
+    Same calendar as get_working_days; a subtraction of two cumulative lookups.
+    """
+    return (work_calendar or STANDARD_CALENDAR).count_working_days(start_date, end_date)
+
+
+def working_days_before(day: date, work_calendar: Optional[BusinessCalendar] = None) -> int:
+    """Number of working days strictly before day, counted from 0001-01-01 (a Monday)."""
+    return (work_calendar or STANDARD_CALENDAR).working_days_before(day)
+
+
+def get_phase_total_hours(phase: models.SchedulePhase) -> Decimal:
+    """
+    Determine a phase's total man-hours (Decimal for precision).
+
+    Raises ValueError if the phase has neither man-hours nor crew size.
     """
-    # Step 1: Determine total man-hours (use Decimal for precision)
     if phase.estimated_man_hours:
-        total_hours = Decimal(str(phase.estimated_man_hours))
+        return Decimal(str(phase.estimated_man_hours))
     elif phase.crew_size:
         # Convert crew size to total hours
         duration_days = (phase.end_date - phase.start_date).days + 1
-        total_hours = Decimal(str(phase.crew_size)) * Decimal('8') * Decimal(str(duration_days))
+        return Decimal(str(phase.crew_size)) * Decimal('8') * Decimal(str(duration_days))
     else:
         raise ValueError("Phase must have man-hours or crew size")
 
-    # Step 2: Calculate working days (exclude weekends)
-    working_days = get_working_days(phase.start_date, phase.end_date)
+
+def get_phase_daily_hours(total_hours: Decimal, num_working_days: int) -> Decimal:
+    """Hours per working day, quantized to cents (as recorded per day)."""
+    return (total_hours / Decimal(str(num_working_days))).quantize(Decimal('0.01'))
+
+
+def cents_to_decimal(cents: int) -> Decimal:
+    """Convert integer cents to a 2-place Decimal (e.g. 1234 -> 12.34)."""
+    return (Decimal(int(cents)) / 100).quantize(Decimal('0.01'))
+
+
+def get_phase_scheduled_hours(phase: models.SchedulePhase,
+                              work_calendar: Optional[BusinessCalendar] = None) -> Decimal:
+    """
+    Hours the forecast distributes for a phase (per-day hours * working days).
+
+    Returns 0 for phases without man-hours/crew size or without working days.
+    """
+    try:
+        total_hours = get_phase_total_hours(phase)
+    except ValueError:
+        return Decimal('0')
+    num_working_days = count_working_days(phase.start_date, phase.end_date, work_calendar)
+    if num_working_days == 0:
+        return Decimal('0')
+    return get_phase_daily_hours(total_hours, num_working_days) * num_working_days
+
+
+def calculate_phase_daily_manpower(phase: models.SchedulePhase,
+                                   work_calendar: Optional[BusinessCalendar] = None) -> List[Dict]:
+    """
+    Distribute a phase's man-hours evenly across its duration.
+
+    Returns: List of daily manpower records
+    """
+    # Step 1: Determine total man-hours
+    total_hours = get_phase_total_hours(phase)
+
+    # Step 2: Calculate working days (project calendar: weekends, holidays)
+    working_days = get_working_days(phase.start_date, phase.end_date, work_calendar)
     num_working_days = len(working_days)
 
     if num_working_days == 0:
         return []
 
     # Step 3: Evenly distribute hours across working days (Decimal division)
-    hours_per_day = total_hours / Decimal(str(num_working_days))
+    hours_per_day = get_phase_daily_hours(total_hours, num_working_days)
 
     # Step 4: Build daily records
     daily_records = []
     for day in working_days:
         daily_records.append({
             'date': day,
-            'man_hours': hours_per_day.quantize(Decimal('0.01')),
+            'man_hours': hours_per_day,
             'phase_id': phase.id,
             'project_id': phase.schedule.project_id,
             'crew_type_id': phase.crew_type_id
@@ -158,7 +205,9 @@ def generate_forecast(
     phases: List[models.SchedulePhase],
     start_date: date,
     end_date: date,
-    granularity: str = 'weekly'
+    granularity: str = 'weekly',
+    engine: Optional[str] = None,
+    calendars: Optional[CalendarSet] = None
 ) -> Dict:
     """
     Generate manpower forecast from list of phases.
@@ -168,17 +217,28 @@ def generate_forecast(
         start_date: Forecast start date
         end_date: Forecast end date
         granularity: 'daily', 'weekly', or 'monthly'
+        engine: Forecast engine to use (defaults to settings.forecast_engine)
+        calendars: Work calendars of the phases' projects (defaults to Mon-Fri)
     
     Returns:
         Forecast data dictionary
     """
+    engine = engine or settings.forecast_engine
+    calendars = calendars or STANDARD_CALENDARS
+    if engine == ForecastEngine.NUMPY:
+        from services.manpower_vectorized import generate_forecast_vectorized
+        return generate_forecast_vectorized(phases, start_date, end_date, granularity, calendars)
+    if engine == ForecastEngine.INTERVAL:
+        from services.interval_load import generate_forecast_intervals
+        return generate_forecast_intervals(phases, start_date, end_date, granularity, calendars)
+
     # Step 1: Calculate daily manpower for each phase
     all_daily_records = []
     project_names = {}
     
     for phase in phases:
         try:
-            daily_records = calculate_phase_daily_manpower(phase)
+            daily_records = calculate_phase_daily_manpower(phase, calendars.for_phase(phase))
             all_daily_records.extend(daily_records)
             # Store project name for later
             if phase.schedule.project_id not in project_names:
@@ -226,3 +286,63 @@ def generate_forecast(
         'monthly_forecast': monthly_forecast if granularity == 'monthly' else [],
         'projects_included': projects_included
     }
+
+
+def load_bucket_key(day: date, granularity: str):
+    """Export bucket of a working day: the date, its week start (Monday) or "YYYY-MM" month."""
+    if granularity == ForecastGranularity.DAILY:
+        return day
+    if granularity == ForecastGranularity.WEEKLY:
+        return day - timedelta(days=day.weekday())
+    return day.strftime('%Y-%m')
+
+
+def generate_load_buckets(
+    phases: List[models.SchedulePhase],
+    start_date: date,
+    end_date: date,
+    granularity: str = ForecastGranularity.WEEKLY,
+    engine: Optional[str] = None,
+    calendars: Optional[CalendarSet] = None
+) -> List[Tuple]:
+    """
+    Load of phases inside the window per export bucket (see load_bucket_key).
+
+    The live counterpart of the phase_daily_load table's grouped reads:
+    returns (bucket, total cents, {pivot: {key: cents}}) in bucket order
+    for every bucket with a working day of some phase, with the load split
+    by ExportPivot.CREW_TYPE (None = no crew type) and ExportPivot.PROJECT.
+    A key is present when one of its phases has a working day in the
+    bucket, even if its cents round to 0.
+
+    engine defaults to settings.forecast_engine.
+    """
+    engine = engine or settings.forecast_engine
+    calendars = calendars or STANDARD_CALENDARS
+    if engine == ForecastEngine.NUMPY:
+        from services.manpower_vectorized import load_buckets_vectorized
+        return load_buckets_vectorized(phases, start_date, end_date, granularity, calendars)
+    if engine == ForecastEngine.INTERVAL:
+        from services.interval_load import load_buckets_intervals
+        return load_buckets_intervals(phases, start_date, end_date, granularity, calendars)
+
+    # Reference: one phase's daily records at a time, folded into the buckets
+    buckets = {}
+    for phase in phases:
+        try:
+            daily_records = calculate_phase_daily_manpower(phase, calendars.for_phase(phase))
+        except ValueError:
+            # Skip phases with invalid data
+            continue
+        for record in daily_records:
+            if not start_date <= record['date'] <= end_date:
+                continue
+            cents = int(record['man_hours'] * 100)
+            entry = buckets.setdefault(load_bucket_key(record['date'], granularity), [0, {
+                ExportPivot.CREW_TYPE: {}, ExportPivot.PROJECT: {}
+            }])
+            entry[0] += cents
+            for pivot, key in ((ExportPivot.CREW_TYPE, record['crew_type_id']),
+                               (ExportPivot.PROJECT, record['project_id'])):
+                entry[1][pivot][key] = entry[1][pivot].get(key, 0) + cents
+    return [(bucket, buckets[bucket][0], buckets[bucket][1]) for bucket in sorted(buckets)]
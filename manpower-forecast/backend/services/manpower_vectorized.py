@@ -0,0 +1,406 @@
+"""Vectorized (NumPy) manpower forecasting engine.
+
+Produces the same payload as the reference implementation in
+services.manpower without building one record per phase per working day.
+Phases are reduced to arrays (start/end ordinal, daily hours, crew type,
+project, work calendar), daily load is accumulated with difference arrays +
+cumsum per work calendar and masked with that calendar's working days
+(np.busdaycalendar: weekmask + holidays), and the result is bucketed into
+ISO weeks / months with bincount.
+
+All hours are carried as integer cents so the totals match the reference
+engine's Decimal arithmetic exactly (crew_breakdown keys may be ordered
+differently; the values are identical).
+"""
+from typing import List, Dict, Optional, Tuple
+from datetime import date, timedelta
+import calendar
+import numpy as np
+import models
+from constants import ForecastGranularity, ExportPivot
+from services.manpower import get_phase_total_hours, get_phase_daily_hours, cents_to_decimal
+from services.work_calendar import BusinessCalendar, CalendarSet, STANDARD_CALENDARS
+
+NO_CREW = -1
+
+
+def busday_count(begin: np.ndarray, end: np.ndarray, calendar_index: np.ndarray,
+                 calendars: List[BusinessCalendar]) -> np.ndarray:
+    """np.busday_count over [begin, end) using each row's work calendar."""
+    counts = np.zeros(len(begin), dtype=np.int64)
+    for i, work_calendar in enumerate(calendars):
+        rows = calendar_index == i
+        if rows.any():
+            counts[rows] = np.busday_count(begin[rows], end[rows], busdaycal=work_calendar.busdaycalendar())
+    return counts
+
+
+def build_phase_arrays(phases: List[models.SchedulePhase],
+                       calendars: CalendarSet = STANDARD_CALENDARS) -> Dict:
+    """
+    Reduce phases to parallel arrays.
+
+    Phases without man-hours or crew size are skipped, exactly like the
+    reference engine. Daily hours are quantized per phase the same way
+    calculate_phase_daily_manpower does, then stored as integer cents.
+
+    Returns:
+        Dict with 'start', 'end' (datetime64[D]), 'daily_cents',
+        'working_days', 'crew_type_id', 'project_id', 'calendar_index'
+        arrays, 'calendars' (BusinessCalendar per index) and
+        'project_names' mapping.
+    """
+    starts = []
+    ends = []
+    totals = []
+    crew_type_ids = []
+    project_ids = []
+    calendar_indexes = []
+    calendar_rows = {}
+    phase_calendars = []
+    project_names = {}
+
+    for phase in phases:
+        try:
+            total_hours = get_phase_total_hours(phase)
+        except ValueError:
+            # Skip phases with invalid data
+            continue
+        project_id = phase.schedule.project_id
+        if project_id not in project_names:
+            project_names[project_id] = phase.schedule.project.name
+        starts.append(phase.start_date)
+        ends.append(phase.end_date)
+        totals.append(total_hours)
+        crew_type_ids.append(phase.crew_type_id if phase.crew_type_id else NO_CREW)
+        project_ids.append(project_id)
+        work_calendar = calendars.for_phase(phase)
+        if work_calendar.id not in calendar_rows:
+            calendar_rows[work_calendar.id] = len(calendar_rows)
+            phase_calendars.append(work_calendar)
+        calendar_indexes.append(calendar_rows[work_calendar.id])
+
+    start = np.array(starts, dtype='datetime64[D]')
+    end = np.array(ends, dtype='datetime64[D]')
+    calendar_index = np.array(calendar_indexes, dtype=np.int64)
+    working_days = busday_count(start, end + 1, calendar_index, phase_calendars)
+
+    # Per-day hours are quantized per phase (cheap: one Decimal op per phase)
+    daily_cents = np.zeros(len(totals), dtype=np.int64)
+    for i, (total_hours, num_days) in enumerate(zip(totals, working_days)):
+        if num_days > 0:
+            daily_cents[i] = int(get_phase_daily_hours(total_hours, int(num_days)) * 100)
+
+    return {
+        'start': start,
+        'end': end,
+        'daily_cents': daily_cents,
+        'working_days': working_days.astype(np.int64),
+        'crew_type_id': np.array(crew_type_ids, dtype=np.int64),
+        'project_id': np.array(project_ids, dtype=np.int64),
+        'calendar_index': calendar_index,
+        'calendars': phase_calendars,
+        'project_names': project_names,
+    }
+
+
+def clip_to_window(arrays: Dict, start_date: date, end_date: date) -> Dict:
+    """
+    Clip phase intervals to the forecast window.
+
+    Returns:
+        Dict with 'offset_start'/'offset_end' (day offsets into the window),
+        'in_range_days' (working days inside the window) and 'active' mask.
+    """
+    window_start = np.datetime64(start_date, 'D')
+    window_end = np.datetime64(end_date, 'D')
+
+    clipped_start = np.maximum(arrays['start'], window_start)
+    clipped_end = np.minimum(arrays['end'], window_end)
+    overlaps = (clipped_start <= clipped_end) & (arrays['working_days'] > 0)
+
+    in_range_days = np.zeros(len(clipped_start), dtype=np.int64)
+    if overlaps.any():
+        in_range_days[overlaps] = busday_count(clipped_start[overlaps], clipped_end[overlaps] + 1,
+                                               arrays['calendar_index'][overlaps], arrays['calendars'])
+
+    return {
+        'offset_start': (clipped_start - window_start).astype(np.int64),
+        'offset_end': (clipped_end - window_start).astype(np.int64),
+        'in_range_days': in_range_days,
+        'active': in_range_days > 0,
+    }
+
+
+def daily_load(values: np.ndarray, offset_start: np.ndarray, offset_end: np.ndarray,
+               num_days: int, rows: Optional[np.ndarray] = None, num_rows: int = 1) -> np.ndarray:
+    """
+    Accumulate constant per-day values over [offset_start, offset_end] intervals.
+
+    Uses a difference array + cumsum, so cost is O(intervals + days).
+    If rows is given, accumulates into a (num_rows, num_days) matrix.
+    Non-working days are NOT masked here; callers apply calendar masks.
+    """
+    if rows is None:
+        diff = np.zeros(num_days + 1, dtype=np.int64)
+        np.add.at(diff, offset_start, values)
+        np.add.at(diff, offset_end + 1, -values)
+        return np.cumsum(diff)[:num_days]
+
+    diff = np.zeros((num_rows, num_days + 1), dtype=np.int64)
+    np.add.at(diff, (rows, offset_start), values)
+    np.add.at(diff, (rows, offset_end + 1), -values)
+    return np.cumsum(diff, axis=1)[:, :num_days]
+
+
+def bucket_sums(bucket_index: np.ndarray, values: np.ndarray, num_buckets: int) -> np.ndarray:
+    """Sum daily values into buckets with bincount (exact for integer cents)."""
+    sums = np.bincount(bucket_index, weights=values, minlength=num_buckets)
+    return np.rint(sums).astype(np.int64)
+
+
+def row_bucket_sums(bucket_index: np.ndarray, values: np.ndarray, num_buckets: int) -> np.ndarray:
+    """bucket_sums of every row of a rows x days matrix (rows x num_buckets)."""
+    num_rows = len(values)
+    flat_index = (np.arange(num_rows)[:, None] * num_buckets + bucket_index[None, :]).ravel()
+    return bucket_sums(flat_index, values.ravel(), num_rows * num_buckets).reshape(num_rows, num_buckets)
+
+
+def window_buckets(start_date: date, num_days: int, calendars: List[BusinessCalendar]) -> Dict:
+    """
+    Precompute per-day week/month bucket indices and per-calendar working masks for the window.
+
+    Returns:
+        Dict with 'working_mask' (calendars x days, 1 on working days),
+        'week_index' / 'month_index' (bucket of each day) and
+        'week_mondays' / 'months' (datetime64 / month number of each bucket)
+    """
+    days = np.datetime64(start_date, 'D') + np.arange(num_days)
+    ordinals = start_date.toordinal() + np.arange(num_days)
+    # date.fromordinal(1) is a Monday, so (ordinal - 1) % 7 is the weekday
+    mondays = ordinals - (ordinals - 1) % 7
+    week_index = (mondays - mondays[0]) // 7
+    months = days.astype('datetime64[M]').astype(np.int64)
+    month_index = months - months[0]
+    return {
+        'working_mask': np.array([
+            np.is_busday(days, busdaycal=work_calendar.busdaycalendar()) for work_calendar in calendars
+        ], dtype=np.int64).reshape(len(calendars), num_days),
+        'week_index': week_index,
+        'week_mondays': mondays[0] + 7 * np.arange(int(week_index[-1]) + 1),
+        'month_index': month_index,
+        'months': months[0] + np.arange(int(month_index[-1]) + 1),
+    }
+
+
+def _aggregate(load: np.ndarray, presence: np.ndarray, crew_load: np.ndarray,
+               crew_presence: np.ndarray, crew_keys: List[int],
+               bucket_index: np.ndarray, num_buckets: int) -> List[tuple]:
+    """Bucket total and per-crew daily load; returns (bucket, cents, crew dict) for non-empty buckets."""
+    totals = bucket_sums(bucket_index, load, num_buckets)
+    present = bucket_sums(bucket_index, presence, num_buckets) > 0
+
+    num_crews = len(crew_keys)
+    if num_crews:
+        crew_totals = row_bucket_sums(bucket_index, crew_load, num_buckets)
+        crew_present = row_bucket_sums(bucket_index, crew_presence, num_buckets) > 0
+
+    buckets = []
+    for b in np.flatnonzero(present):
+        crew_breakdown = {}
+        for k in range(num_crews):
+            if crew_present[k, b]:
+                crew_breakdown[crew_keys[k]] = cents_to_decimal(crew_totals[k, b])
+        buckets.append((int(b), cents_to_decimal(totals[b]), crew_breakdown))
+    return buckets
+
+
+def masked_load(values: np.ndarray, offset_start: np.ndarray, offset_end: np.ndarray, num_days: int,
+                calendar_index: np.ndarray, mask: np.ndarray,
+                rows: Optional[np.ndarray] = None, num_rows: int = 1) -> np.ndarray:
+    """
+    Daily load counted only on each phase's calendar working days.
+
+    values are per-phase daily amounts over [offset_start, offset_end] (from
+    clip_to_window), calendar_index picks each phase's row of mask (the
+    'working_mask' of window_buckets). With rows (per-phase row numbers,
+    e.g. a crew type or project index) the load is split into num_rows rows.
+
+    Returns:
+        Array of num_days, or num_rows x num_days when rows is given
+    """
+    num_calendars = len(mask)
+    if rows is None:
+        rows, num_rows = np.zeros(len(values), dtype=np.int64), 1
+        squeeze = True
+    else:
+        squeeze = False
+    load = daily_load(values, offset_start, offset_end, num_days,
+                      rows=rows * num_calendars + calendar_index, num_rows=num_rows * num_calendars)
+    load = (load.reshape(num_rows, num_calendars, num_days) * mask[None, :, :]).sum(axis=1)
+    return load[0] if squeeze else load
+
+
+def generate_forecast_vectorized(
+    phases: List[models.SchedulePhase],
+    start_date: date,
+    end_date: date,
+    granularity: str = 'weekly',
+    calendars: CalendarSet = STANDARD_CALENDARS
+) -> Dict:
+    """
+    Generate manpower forecast from list of phases (vectorized).
+
+    Same arguments and return value as services.manpower.generate_forecast.
+    """
+    arrays = build_phase_arrays(phases, calendars)
+    window = clip_to_window(arrays, start_date, end_date)
+    active = window['active']
+
+    # Project contributions: daily cents * working days inside the window
+    project_ids = arrays['project_id'][active]
+    contributions = arrays['daily_cents'][active] * window['in_range_days'][active]
+    first_seen = {}
+    project_totals = {}
+    for order, (project_id, cents) in enumerate(zip(project_ids.tolist(), contributions.tolist())):
+        first_seen.setdefault(project_id, order)
+        project_totals[project_id] = project_totals.get(project_id, 0) + cents
+
+    projects_included = [
+        {
+            'id': project_id,
+            'name': arrays['project_names'].get(project_id, 'Unknown'),
+            'man_hours': float(cents_to_decimal(cents))
+        }
+        for project_id, cents in sorted(project_totals.items(), key=lambda x: (-x[1], first_seen[x[0]]))
+    ]
+    total_cents = int(contributions.sum()) if len(contributions) else 0
+
+    weekly_forecast = []
+    monthly_forecast = []
+
+    if granularity in ['weekly', 'monthly'] and active.any():
+        num_days = (end_date - start_date).days + 1
+        buckets = window_buckets(start_date, num_days, arrays['calendars'])
+        mask = buckets['working_mask']
+        calendar_index = arrays['calendar_index'][active]
+
+        offset_start = window['offset_start'][active]
+        offset_end = window['offset_end'][active]
+        daily_cents = arrays['daily_cents'][active]
+        ones = np.ones(len(daily_cents), dtype=np.int64)
+
+        load = masked_load(daily_cents, offset_start, offset_end, num_days, calendar_index, mask)
+        presence = masked_load(ones, offset_start, offset_end, num_days, calendar_index, mask)
+
+        crew_type_ids = arrays['crew_type_id'][active]
+        has_crew = crew_type_ids != NO_CREW
+        # Crew keys in order of first appearance (matches reference dict ordering)
+        crew_rows_by_id = {}
+        for crew_type_id in crew_type_ids[has_crew].tolist():
+            crew_rows_by_id.setdefault(crew_type_id, len(crew_rows_by_id))
+        crew_keys = list(crew_rows_by_id)
+        crew_rows = np.array([crew_rows_by_id[c] for c in crew_type_ids[has_crew].tolist()], dtype=np.int64)
+        crew_load = masked_load(daily_cents[has_crew], offset_start[has_crew], offset_end[has_crew], num_days,
+                                calendar_index[has_crew], mask, rows=crew_rows, num_rows=len(crew_keys))
+        crew_presence = masked_load(ones[has_crew], offset_start[has_crew], offset_end[has_crew], num_days,
+                                    calendar_index[has_crew], mask, rows=crew_rows, num_rows=len(crew_keys))
+
+        for b, cents, crew_breakdown in _aggregate(
+            load, presence, crew_load, crew_presence, crew_keys,
+            buckets['week_index'], len(buckets['week_mondays'])
+        ):
+            week_start = date.fromordinal(int(buckets['week_mondays'][b]))
+            year, week_num, _ = week_start.isocalendar()
+            weekly_forecast.append({
+                'week': f"{year}-W{week_num:02d}",
+                'week_start': week_start,
+                'man_hours': cents,
+                'crew_breakdown': crew_breakdown
+            })
+
+        if granularity == 'monthly':
+            for b, cents, crew_breakdown in _aggregate(
+                load, presence, crew_load, crew_presence, crew_keys,
+                buckets['month_index'], len(buckets['months'])
+            ):
+                month_value = int(buckets['months'][b])
+                year, month_num = 1970 + month_value // 12, month_value % 12 + 1
+                monthly_forecast.append({
+                    'month': f"{year}-{month_num:02d}",
+                    'month_name': f"{calendar.month_name[month_num]} {year}",
+                    'man_hours': cents,
+                    'crew_breakdown': crew_breakdown
+                })
+
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'total_man_hours': float(cents_to_decimal(total_cents)),
+        'project_count': len(project_totals),
+        'weekly_forecast': weekly_forecast,
+        'monthly_forecast': monthly_forecast,
+        'projects_included': projects_included
+    }
+
+
+def load_buckets_vectorized(
+    phases: List[models.SchedulePhase],
+    start_date: date,
+    end_date: date,
+    granularity: str = ForecastGranularity.WEEKLY,
+    calendars: CalendarSet = STANDARD_CALENDARS
+) -> List[Tuple]:
+    """
+    Export buckets with crew type / project splits (vectorized).
+
+    Same arguments and return value as services.manpower.generate_load_buckets.
+    """
+    arrays = build_phase_arrays(phases, calendars)
+    window = clip_to_window(arrays, start_date, end_date)
+    active = window['active']
+    if not active.any():
+        return []
+
+    num_days = (end_date - start_date).days + 1
+    buckets = window_buckets(start_date, num_days, arrays['calendars'])
+    if granularity == ForecastGranularity.DAILY:
+        bucket_index = np.arange(num_days)
+        bucket_keys = [start_date + timedelta(days=offset) for offset in range(num_days)]
+    elif granularity == ForecastGranularity.WEEKLY:
+        bucket_index = buckets['week_index']
+        bucket_keys = [date.fromordinal(int(monday)) for monday in buckets['week_mondays']]
+    else:
+        bucket_index = buckets['month_index']
+        bucket_keys = [f"{1970 + int(month) // 12}-{int(month) % 12 + 1:02d}" for month in buckets['months']]
+    num_buckets = len(bucket_keys)
+
+    daily_cents = arrays['daily_cents'][active]
+    ones = np.ones(len(daily_cents), dtype=np.int64)
+    intervals = (window['offset_start'][active], window['offset_end'][active], num_days,
+                 arrays['calendar_index'][active], buckets['working_mask'])
+    totals = bucket_sums(bucket_index, masked_load(daily_cents, *intervals), num_buckets)
+    present = bucket_sums(bucket_index, masked_load(ones, *intervals), num_buckets) > 0
+
+    splits = {}
+    for pivot, ids in ((ExportPivot.CREW_TYPE, arrays['crew_type_id'][active]),
+                       (ExportPivot.PROJECT, arrays['project_id'][active])):
+        keys, rows = np.unique(ids, return_inverse=True)
+        load = masked_load(daily_cents, *intervals, rows=rows, num_rows=len(keys))
+        presence = masked_load(ones, *intervals, rows=rows, num_rows=len(keys))
+        keys = keys.tolist()
+        if pivot == ExportPivot.CREW_TYPE:
+            keys = [None if key == NO_CREW else key for key in keys]
+        splits[pivot] = (
+            keys,
+            row_bucket_sums(bucket_index, load, num_buckets),
+            row_bucket_sums(bucket_index, presence, num_buckets) > 0,
+        )
+
+    return [
+        (bucket_keys[b], int(totals[b]), {
+            pivot: {keys[k]: int(sums[k, b]) for k in np.flatnonzero(key_present[:, b])}
+            for pivot, (keys, sums, key_present) in splits.items()
+        })
+        for b in np.flatnonzero(present)
+    ]
@@ -0,0 +1,152 @@
+"""Password hashing (bcrypt) off the event loop.
+
+A bcrypt check is ~0.25 s of CPU at the default cost. Run inline in an
+async endpoint, a burst of logins (shift start) blocks the event loop and
+every other request of the worker waits behind it. PasswordHasher runs
+checks and hashes in a dedicated thread pool instead (bcrypt releases the
+GIL while hashing):
+
+- at most max_workers hashes run at once, so logins cannot take every
+  core from the rest of the API,
+- a hash that waited longer than queue_timeout seconds for a thread is
+  not started; the caller gets PasswordQueueTimeout (HTTP 503) instead
+  of a login that would arrive after the client gave up,
+- hashes are created with settings.bcrypt_rounds; needs_rehash() tells
+  the login endpoint to re-hash a password stored with another cost, so
+  changing the work factor takes effect as users log in.
+
+max_workers = 0 hashes in the calling thread (scripts and benchmarks).
+"""
+import time
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+import bcrypt
+from config import settings
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+
+
+class PasswordQueueTimeout(RuntimeError):
+    """Raised when a password hash waited longer than the queue timeout for a thread."""
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """bcrypt hash of password (rounds defaults to settings.bcrypt_rounds)."""
+    return bcrypt.hashpw(
+        password.encode('utf-8'),
+        bcrypt.gensalt(rounds or settings.bcrypt_rounds)
+    ).decode('utf-8')
+
+
+def check_password(password: str, hashed_password: str) -> bool:
+    """Whether password matches the bcrypt hash (False for malformed hashes)."""
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    except ValueError:
+        return False
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """Cost factor of a bcrypt hash ($2b$12$... -> 12), or None if it is not one."""
+    parts = hashed_password.split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str, rounds: Optional[int] = None) -> bool:
+    """Whether the hash was made with another cost than rounds (default settings.bcrypt_rounds)."""
+    return hash_rounds(hashed_password) != (rounds or settings.bcrypt_rounds)
+
+
+class PasswordHasher:
+    """Bounded thread pool for bcrypt checks and hashes."""
+
+    def __init__(self, max_workers: int = 2, queue_timeout: float = 5, rounds: int = 12):
+        if not MIN_ROUNDS <= rounds <= MAX_ROUNDS:
+            raise ValueError(f"bcrypt rounds must be between {MIN_ROUNDS} and {MAX_ROUNDS}, got {rounds}")
+        self.max_workers = max_workers
+        self.queue_timeout = queue_timeout
+        self.rounds = rounds
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._timeouts = 0
+
+    def _ensure_pool(self) -> Optional[ThreadPoolExecutor]:
+        with self._lock:
+            if self.max_workers > 0 and self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _run(self, fn: Callable, *args, deadline: float):
+        """Runs in a pool thread: skip the hash if it waited past its deadline."""
+        try:
+            if time.monotonic() > deadline:
+                with self._lock:
+                    self._timeouts += 1
+                raise PasswordQueueTimeout(
+                    f"Password check waited more than {self.queue_timeout:g}s for a hashing thread"
+                )
+            result = fn(*args)
+            with self._lock:
+                self._completed += 1
+            return result
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Queue fn(*args) on the hashing pool (runs it inline when max_workers is 0)."""
+        pool = self._ensure_pool()
+        with self._lock:
+            self._pending += 1
+        deadline = time.monotonic() + self.queue_timeout
+        if pool is not None:
+            return pool.submit(self._run, fn, *args, deadline=deadline)
+        future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(self._run(fn, *args, deadline=deadline))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """check_password on the pool; raises PasswordQueueTimeout when the pool is saturated."""
+        return await asyncio.wrap_future(self.submit(check_password, password, hashed_password))
+
+    async def hash(self, password: str) -> str:
+        """hash_password with the configured rounds on the pool."""
+        return await asyncio.wrap_future(self.submit(hash_password, password, self.rounds))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return needs_rehash(hashed_password, self.rounds)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'queue_timeout': self.queue_timeout,
+                'rounds': self.rounds,
+                'pending': self._pending,
+                'completed': self._completed,
+                'timeouts': self._timeouts,
+            }
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    queue_timeout=settings.password_hash_queue_timeout,
+    rounds=settings.bcrypt_rounds
+)
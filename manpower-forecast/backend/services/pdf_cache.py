@@ -0,0 +1,236 @@
+"""Rendered PDF cache.
+
+PDF exports are stored on disk under a content address: a SHA-256 of the
+export's filter parameters, a fingerprint of the rows they are drawn from
+and the freshness window. Repeat exports of unchanged data are read back
+from disk (the hash doubles as a strong ETag) instead of re-rendered.
+
+The fingerprint is the data version (bumped by every CRUD write, including
+calendars) plus the row count and latest change of the projects, phases
+and project subcontractors, so rows edited outside the API also miss.
+Single-project exports only fingerprint that project's rows (indexed
+lookups), so their key costs the same however many projects exist.
+
+The PDFs print a run date and the Gantt chart draws a today-line, so the
+renders use the start of the current freshness window (settings
+pdf_cache_freshness seconds, aligned to local midnight) as their "now"
+and the window is part of the key. Renders are byte-for-byte repeatable
+(ReportLab invariant mode), so equal keys always mean equal bytes.
+
+Files are evicted least recently used (by mtime, touched on every hit)
+once the directory exceeds max_bytes. Renders are spooled files, so the
+cache links (or copies) them in and hands out linked copies: every path a
+caller gets is its own to delete, whatever the cache evicts meanwhile.
+"""
+from typing import Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+import models
+import logger
+from config import settings
+from constants import RenderJobKind
+from services.forecast_cache import get_data_version
+
+# Part of every key; bump when the PDF layout changes so old renders are not served
+PDF_CACHE_FORMAT = 5
+
+
+def freshness_window(now: datetime, seconds: int) -> datetime:
+    """Start of the freshness window containing now (now itself when the window is 0)."""
+    if seconds <= 0:
+        return now
+    midnight = datetime.combine(now.date(), datetime.min.time())
+    elapsed = int((now - midnight).total_seconds())
+    return midnight + timedelta(seconds=elapsed - elapsed % seconds)
+
+
+def export_fingerprint(db: Session) -> Tuple:
+    """Data version plus (count, latest change) of projects, phases and project subcontractors."""
+    projects = select(func.count(models.Project.id), func.max(models.Project.updated_at))
+    phases = select(func.count(models.SchedulePhase.id), func.max(models.SchedulePhase.updated_at))
+    # Subcontractor rows are replaced rather than updated, so the newest id tracks changes
+    subcontractors = select(func.count(models.ProjectSubcontractor.id), func.max(models.ProjectSubcontractor.id))
+    fingerprint = [get_data_version(db)]
+    for query in (projects, phases, subcontractors):
+        fingerprint.extend(db.execute(query).one())
+    return tuple(fingerprint)
+
+
+def project_fingerprint(db: Session, project_id: int) -> Tuple:
+    """export_fingerprint of a single project's rows."""
+    project = select(func.count(models.Project.id), func.max(models.Project.updated_at)).where(
+        models.Project.id == project_id
+    )
+    phases = select(func.count(models.SchedulePhase.id), func.max(models.SchedulePhase.updated_at)).join(
+        models.ProjectSchedule, models.SchedulePhase.schedule_id == models.ProjectSchedule.id
+    ).where(models.ProjectSchedule.project_id == project_id)
+    subcontractors = select(func.count(models.ProjectSubcontractor.id), func.max(models.ProjectSubcontractor.id)).where(
+        models.ProjectSubcontractor.project_id == project_id
+    )
+    fingerprint = [get_data_version(db)]
+    for query in (project, phases, subcontractors):
+        fingerprint.extend(db.execute(query).one())
+    return tuple(fingerprint)
+
+
+def pdf_cache_key(db: Session, kind: str, params: Dict, as_of: datetime) -> str:
+    """Content address of an export: hex SHA-256 of kind, params, fingerprint and window."""
+    if kind == RenderJobKind.PROJECT:
+        fingerprint = project_fingerprint(db, params['project_id'])
+    else:
+        fingerprint = export_fingerprint(db)
+    payload = json.dumps(
+        [PDF_CACHE_FORMAT, kind, params, fingerprint, as_of],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class PdfCache:
+    """Directory of rendered PDFs named by key, with LRU eviction under a byte budget."""
+
+    def __init__(self, directory: Optional[str], max_bytes: int = 256 * 1024 * 1024,
+                 freshness_seconds: int = 900):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.freshness_seconds = freshness_seconds
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        # A zero freshness window puts the exact time in every key, so nothing would hit
+        return bool(self.directory) and self.max_bytes > 0 and self.freshness_seconds > 0
+
+    def window(self, now: Optional[datetime] = None) -> datetime:
+        """The "now" renders should use: start of the current freshness window."""
+        return freshness_window(now or datetime.now(), self.freshness_seconds)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def checkout(self, key: str, directory: Optional[str] = None) -> Optional[str]:
+        """
+        Path of a private copy (hard link when possible) of the cached PDF
+        for key, created in directory (default temp dir); None on a miss.
+        The caller deletes it.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        fd, copy_path = tempfile.mkstemp(dir=directory, suffix='.pdf')
+        os.close(fd)
+        try:
+            _link_or_copy(path, copy_path)
+            os.utime(path)  # Most recently used
+        except OSError as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Ignoring unreadable PDF cache file {path}: {e}")
+            os.remove(copy_path)
+            copy_path = None
+        with self._lock:
+            if copy_path is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return copy_path
+
+    def put_file(self, key: str, path: str) -> None:
+        """Store the PDF at path under key (linked or copied; path stays the caller's)."""
+        if not self.enabled or os.path.getsize(path) > self.max_bytes:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            _link_or_copy(path, tmp_path)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not write PDF cache file: {e}")
+            os.remove(tmp_path)
+            return
+        self._evict()
+
+    def _files(self):
+        """(mtime, size, path) of every cached PDF."""
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.pdf'):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _evict(self) -> None:
+        """Remove least recently used files until the directory fits in max_bytes."""
+        with self._lock:
+            files = sorted(self._files())
+            total = sum(size for _, size, _ in files)
+            for _, size, path in files:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    self.evictions += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def clear(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            for _, _, path in self._files():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> Dict:
+        files = self._files() if self.enabled else []
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'files': len(files),
+                'bytes': sum(size for _, size, _ in files),
+                'max_bytes': self.max_bytes,
+                'freshness_seconds': self.freshness_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _link_or_copy(source: str, target: str) -> None:
+    """Replace target (a placeholder file) by a hard link to source, or a copy across filesystems."""
+    link_path = target + '.link'
+    try:
+        os.link(source, link_path)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        shutil.copyfile(source, target)
+        return
+    os.replace(link_path, target)
+
+
+pdf_cache = PdfCache(
+    directory=settings.pdf_cache_dir or None,
+    max_bytes=settings.pdf_cache_max_bytes,
+    freshness_seconds=settings.pdf_cache_freshness
+)
@@ -0,0 +1,182 @@
+"""Authenticated-principal cache.
+
+Every request authenticates its bearer token. Instead of decoding the JWT
+and loading the user on each request, the decoded claims and a snapshot
+of the user (Principal) are cached in-process under the SHA-256 of the
+token, for settings.principal_cache_ttl seconds and never past the
+token's expiry. Endpoints and permissions read the snapshot, so cached
+requests do no authentication SQL.
+
+Any committed insert, update or delete of a User (API, add_user.py or
+any other ORM write in a process that imported this module) clears the
+cache and touches the stamp file (settings.principal_cache_stamp); every
+process checks the stamp's mtime on lookup and clears its own cache when
+it changed, so a deactivated user or a role change takes effect in all
+API workers at their next request. Updates that only change
+hashed_password (re-hash at login, reset_password.py) keep the cache: a
+Principal does not hold the hash. Writes that bypass the ORM are picked
+up within the TTL.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+import hashlib
+import os
+import threading
+import time
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+import models
+import logger
+from config import settings
+from services.forecast_cache import ForecastCache
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Snapshot of the authenticated user (read like models.User: id, email, role, is_active)."""
+    id: int
+    email: str
+    full_name: Optional[str]
+    role: str
+    is_active: bool
+    expires_at: float  # Token expiry (epoch seconds)
+    claims: Dict = field(default_factory=dict, compare=False)
+
+    @classmethod
+    def from_user(cls, user: models.User, claims: Dict) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role or "viewer",
+            is_active=bool(user.is_active),
+            expires_at=float(claims.get("exp", 0)),
+            claims=dict(claims),
+        )
+
+
+def token_key(token: str) -> str:
+    """Cache key of a bearer token (the token itself is never stored)."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class PrincipalCache:
+    """Principals by token hash (LRU with TTL), cleared on user changes in any process."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60, stamp_path: Optional[str] = None):
+        self.stamp_path = stamp_path
+        self._entries = ForecastCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stamp = self._read_stamp()
+
+    @property
+    def enabled(self) -> bool:
+        return self._entries.max_entries > 0 and self._entries.ttl_seconds > 0
+
+    @property
+    def generation(self) -> int:
+        """Take before loading a user; put() drops the principal if the cache was cleared meanwhile."""
+        self._check_stamp()
+        return self._generation
+
+    def get(self, token: str) -> Optional[Principal]:
+        """Cached principal of token, or None (expired tokens are misses)."""
+        if not self.enabled:
+            return None
+        self._check_stamp()
+        principal = self._entries.get((token_key(token),))
+        if principal is None or principal.expires_at <= time.time():
+            return None
+        return principal
+
+    def put(self, token: str, principal: Principal, generation: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation == self._generation:
+                self._entries.put((token_key(token),), principal)
+
+    def clear(self) -> None:
+        """Forget every principal in this process."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def invalidate(self) -> None:
+        """Clear this process's cache and touch the stamp so other processes clear theirs."""
+        self.clear()
+        if not self.stamp_path:
+            return
+        try:
+            with open(self.stamp_path, "w") as f:
+                f.write(str(time.time_ns()))
+        except OSError as e:
+            logger.warning(f"Could not touch principal cache stamp {self.stamp_path}: {e}")
+        with self._lock:
+            self._stamp = self._read_stamp()
+
+    def stats(self) -> Dict:
+        return {**self._entries.stats(), 'generation': self._generation}
+
+    def _read_stamp(self) -> Optional[int]:
+        if not self.stamp_path:
+            return None
+        try:
+            return os.stat(self.stamp_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _check_stamp(self) -> None:
+        stamp = self._read_stamp()
+        if stamp != self._stamp:
+            with self._lock:
+                self._stamp = stamp
+                self._generation += 1
+                self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.principal_cache_size,
+    ttl_seconds=settings.principal_cache_ttl,
+    stamp_path=settings.principal_cache_stamp or None
+)
+
+
+def invalidate_principals() -> None:
+    """Drop cached principals everywhere (after changing users outside the ORM)."""
+    principal_cache.invalidate()
+
+
+# User columns a Principal does not snapshot (updating only these keeps the cache)
+_UNCACHED_USER_COLUMNS = {'hashed_password'}
+
+
+# User writes: flag the session at flush, invalidate once the transaction commits
+@event.listens_for(models.User, "after_insert")
+@event.listens_for(models.User, "after_delete")
+def _user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info["users_changed"] = True
+
+
+@event.listens_for(models.User, "after_update")
+def _user_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(
+        state.attrs[column.key].history.has_changes()
+        for column in mapper.column_attrs if column.key not in _UNCACHED_USER_COLUMNS
+    ):
+        _user_changed(mapper, connection, target)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("users_changed", False):
+        invalidate_principals()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop("users_changed", None)
@@ -0,0 +1,58 @@
+"""Stored project scheduled hours.
+
+projects.scheduled_hours holds the hours the forecast engine distributes
+over a project's active schedule(s): per phase, the per-working-day hours
+(quantized like calculate_phase_daily_manpower) times its working days on
+the project's work calendar. The CRUD write paths refresh it whenever a
+phase, schedule, project calendar or work calendar changes, so listing
+projects reads a column instead of walking schedules and phases.
+"""
+from typing import Iterable
+from decimal import Decimal
+from sqlalchemy.orm import Session, selectinload
+import models
+from services.manpower import get_phase_scheduled_hours
+from services.work_calendar import load_calendars
+
+
+def compute_project_hours(db: Session, project: models.Project) -> Decimal:
+    """Scheduled hours of a project's active schedules (engine working-day math)."""
+    work_calendar = load_calendars(db).for_project(project)
+    total = Decimal('0')
+    for schedule in project.schedules:
+        if schedule.is_active:
+            for phase in schedule.phases:
+                total += get_phase_scheduled_hours(phase, work_calendar)
+    return total.quantize(Decimal('0.01'))
+
+
+def refresh_project_hours(db: Session, project_ids: Iterable[int]) -> None:
+    """Recompute scheduled_hours for the given projects (caller commits)."""
+    project_ids = list(set(project_ids))
+    if not project_ids:
+        return
+    db.flush()
+    projects = db.query(models.Project).options(
+        selectinload(models.Project.schedules).selectinload(models.ProjectSchedule.phases)
+    ).filter(models.Project.id.in_(project_ids)).populate_existing().all()
+    for project in projects:
+        project.scheduled_hours = compute_project_hours(db, project)
+
+
+def backfill_project_hours(db: Session) -> int:
+    """
+    Recompute scheduled_hours for every project and commit.
+
+    Returns: Number of projects whose stored value changed
+    """
+    projects = db.query(models.Project).options(
+        selectinload(models.Project.schedules).selectinload(models.ProjectSchedule.phases)
+    ).all()
+    changed = 0
+    for project in projects:
+        hours = compute_project_hours(db, project)
+        if project.scheduled_hours is None or Decimal(str(project.scheduled_hours)) != hours:
+            project.scheduled_hours = hours
+            changed += 1
+    db.commit()
+    return changed
@@ -0,0 +1,294 @@
+"""Background render jobs (PDF exports).
+
+Rendering a company schedule is seconds of pure-Python ReportLab work, so
+it runs in a warm ProcessPoolExecutor instead of the request worker:
+
+- the pool is started once (spawn context, so workers hold no inherited
+  database connections or locks) and each worker runs an initializer that
+  preloads fonts and the logo before its first job,
+- at most max_workers jobs render at once and at most max_pending more
+  wait; submissions beyond that raise RenderQueueFull (HTTP 429),
+- finished jobs keep their result for result_ttl seconds so clients can
+  poll the status and then download the artifact; results are handed to
+  discard() (e.g. to delete a spooled file) when they expire or when a
+  render finishes after its caller timed out.
+
+Job records live in this API process; run a single worker process (or
+sticky sessions) when using the submit/poll endpoints.
+
+Batches (map_completed) keep as many renders in flight as the queue
+admits and wait for free slots instead of failing, so one bundle export
+shares the pool with interactive exports.
+
+max_workers = 0 renders in the calling thread (development and scripts).
+"""
+import time
+import uuid
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError, wait
+)
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
+from constants import RenderJobStatus
+
+
+BATCH_RETRY_SECONDS = 0.5  # Wait between submissions while the queue is full
+
+
+class RenderQueueFull(RuntimeError):
+    """Raised when every render worker is busy and the wait queue is full."""
+
+
+def _timed(fn: Callable, spec: Any):
+    """Run fn(spec) in a worker; returns (result, render seconds)."""
+    started = time.perf_counter()
+    result = fn(spec)
+    return result, time.perf_counter() - started
+
+
+def _noop() -> None:
+    """Submitted once per worker at start() so every worker is spawned and warmed."""
+
+
+class RenderJob:
+    """A submitted render and, once finished, its result or error."""
+
+    def __init__(self, label: str, filename: str, media_type: str):
+        self.id = uuid.uuid4().hex
+        self.label = label
+        self.filename = filename
+        self.media_type = media_type
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.render_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.result = None
+        self.future: Optional[Future] = None
+        self.etag: Optional[str] = None  # Set by callers that cache the result
+
+    @property
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    @property
+    def status(self) -> str:
+        if not self.done:
+            return RenderJobStatus.RUNNING if self.future.running() else RenderJobStatus.QUEUED
+        return RenderJobStatus.FAILED if self.error is not None else RenderJobStatus.DONE
+
+    def _finished(self, future: Future) -> None:
+        self.finished_at = datetime.now()
+        try:
+            self.result, self.render_seconds = future.result()
+        except BaseException as e:
+            self.error = str(e) or e.__class__.__name__
+
+    async def wait_async(self, timeout: float) -> bool:
+        """Wait up to timeout seconds without holding a thread (long-poll); True if done."""
+        if not self.done:
+            await asyncio.wait([asyncio.wrap_future(self.future)], timeout=timeout)
+        return self.done
+
+
+class RenderJobQueue:
+    """Bounded render queue over a warm process pool."""
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8, result_ttl: int = 600,
+                 initializer: Optional[Callable[[], None]] = None,
+                 discard: Optional[Callable[[Any], None]] = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.initializer = initializer
+        self.discard = discard
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, RenderJob] = {}
+        self._lock = threading.Lock()
+
+    def _ensure_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers > 0 and self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer
+            )
+        return self._pool
+
+    def start(self) -> None:
+        """Spawn and warm every worker now rather than on the first export."""
+        with self._lock:
+            pool = self._ensure_pool()
+            if pool is not None:
+                for _ in range(self.max_workers):
+                    pool.submit(_noop)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            for job in self._jobs.values():
+                self._discard(job.result)
+            self._jobs.clear()
+
+    def _discard(self, result: Any) -> None:
+        if self.discard is not None and result is not None:
+            try:
+                self.discard(result)
+            except Exception:
+                pass
+
+    def _discard_late(self, future: Future) -> None:
+        """Done callback for renders nobody is waiting for any more."""
+        if not future.cancelled() and future.exception() is None:
+            self._discard(future.result()[0])
+
+    def _prune(self) -> None:
+        """Drop finished jobs older than result_ttl (caller holds the lock)."""
+        now = datetime.now()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and (now - job.finished_at).total_seconds() > self.result_ttl
+        ]
+        for job_id in expired:
+            self._discard(self._jobs.pop(job_id).result)
+
+    def _run_inline(self, future: Future, fn: Callable, spec: Any) -> None:
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(_timed(fn, spec))
+        except Exception as e:
+            future.set_exception(e)
+
+    def submit(self, fn: Callable, spec: Any, label: str = "", filename: str = "",
+               media_type: str = "application/pdf") -> RenderJob:
+        """
+        Queue fn(spec) for rendering; fn and spec must be picklable.
+
+        Raises RenderQueueFull when max_workers + max_pending jobs are unfinished.
+        """
+        job = RenderJob(label, filename, media_type)
+        with self._lock:
+            self._prune()
+            unfinished = sum(1 for queued in self._jobs.values() if not queued.done)
+            if unfinished >= max(self.max_workers, 1) + self.max_pending:
+                raise RenderQueueFull(f"Render queue is full ({unfinished} jobs in progress)")
+            pool = self._ensure_pool()
+            if pool is not None:
+                try:
+                    job.future = pool.submit(_timed, fn, spec)
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed for memory); start a fresh pool once
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._pool = None
+                    job.future = self._ensure_pool().submit(_timed, fn, spec)
+            else:
+                job.future = Future()
+            job.future.add_done_callback(job._finished)
+            self._jobs[job.id] = job
+
+        if pool is None:
+            # No workers: the job holds its slot while this thread renders it
+            self._run_inline(job.future, fn, spec)
+        return job
+
+    def add_finished(self, result: Any, label: str = "", filename: str = "",
+                     media_type: str = "application/pdf") -> RenderJob:
+        """Record an already available result (e.g. a cache hit) as a finished job."""
+        job = RenderJob(label, filename, media_type)
+        job.future = Future()
+        job.future.set_running_or_notify_cancel()
+        job.future.set_result((result, 0.0))
+        job._finished(job.future)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        return job
+
+    def map_completed(self, fn: Callable, specs: List[Any], timeout: Optional[float] = None,
+                      labels: Optional[List[str]] = None) -> Iterator[Tuple[int, RenderJob]]:
+        """
+        Render every spec, yielding (index, finished job) in completion order.
+
+        Submits while the queue has room and otherwise waits for a slot
+        (at most timeout seconds without progress, then FutureTimeoutError).
+        Yielded results belong to the caller; if the iteration is abandoned,
+        unstarted renders are cancelled and late results discarded.
+        """
+        waiting = list(enumerate(specs))
+        waiting.reverse()
+        in_flight: Dict[Future, Tuple[int, RenderJob]] = {}
+        stalled_since = None
+        try:
+            while waiting or in_flight:
+                while waiting:
+                    index, spec = waiting[-1]
+                    try:
+                        job = self.submit(fn, spec, label=labels[index] if labels else "")
+                    except RenderQueueFull:
+                        break
+                    waiting.pop()
+                    in_flight[job.future] = (index, job)
+                if not in_flight:
+                    # Every slot is taken by other exports
+                    stalled_since = stalled_since or time.monotonic()
+                    if timeout is not None and time.monotonic() - stalled_since > timeout:
+                        raise FutureTimeoutError()
+                    time.sleep(BATCH_RETRY_SECONDS)
+                    continue
+                stalled_since = None
+                done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    raise FutureTimeoutError()
+                for future in done:
+                    index, job = in_flight.pop(future)
+                    with self._lock:
+                        self._jobs.pop(job.id, None)
+                    yield index, job
+        finally:
+            for future, (index, job) in in_flight.items():
+                future.cancel()
+                future.add_done_callback(self._discard_late)
+                self._forget(job)
+
+    def get(self, job_id: str) -> Optional[RenderJob]:
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def render(self, fn: Callable, spec: Any, timeout: Optional[float] = None, label: str = ""):
+        """Render through the pool and wait for the result (same limits as submit)."""
+        job = self.submit(fn, spec, label=label)
+        try:
+            return job.future.result(timeout)[0]
+        except FutureTimeoutError:
+            job.future.add_done_callback(self._discard_late)
+            raise
+        finally:
+            self._forget(job)
+
+    def _forget(self, job: RenderJob) -> None:
+        """
+        Drop a job nobody will poll once its render ends.
+
+        A render the caller stopped waiting for keeps running in its worker,
+        so it stays in _jobs (and counts against the queue bound) until then.
+        """
+        def forget(future: Future) -> None:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+        job.future.add_done_callback(forget)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._prune()
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            'workers': self.max_workers,
+            'max_pending': self.max_pending,
+            **{status: statuses.count(status) for status in RenderJobStatus.ALL},
+        }
@@ -0,0 +1,324 @@
+"""SQL-side forecast aggregation.
+
+Pushes working-day proration and week/month bucketing into one SQL query
+(SQLite and PostgreSQL) by joining phases against the calendar_days table,
+which holds one row per day per work calendar (the project's calendar, or
+the default one):
+
+- a phase's working-day count is a subtraction of two calendar lookups
+  (calendar_days.working_day_index at its end and start dates),
+- its per-day hours are computed in integer cents with the same half-even
+  rounding the Python engines use,
+- each working day of the phase inside the window is joined from the
+  calendar and grouped by (week, month, crew type, project).
+
+Only aggregated rows come back to Python, so no SchedulePhase objects are
+loaded and no schedule/project lazy loads happen.
+
+calendar_days is derived data kept up to date by the write paths (phase
+writes extend it, calendar and holiday writes rebuild it; see crud.py), so
+the forecast query never writes. rebuild_calendar_days.py fills it for an
+existing database.
+"""
+from typing import List, Dict, Optional
+from datetime import date, timedelta
+from sqlalchemy import func, select, case, cast, and_, or_, Integer
+from sqlalchemy.orm import Session, aliased
+import calendar
+import models
+from constants import ProjectStatus
+from services.manpower import cents_to_decimal
+from services.work_calendar import BusinessCalendar, CalendarSet, load_calendars
+
+
+# ============================================
+# Calendar table
+# ============================================
+
+def _calendar_rows(work_calendar: BusinessCalendar, start_date: date, end_date: date) -> List[Dict]:
+    """Build calendar_days rows of a work calendar for [start_date, end_date]."""
+    rows = []
+    index = work_calendar.working_days_before(start_date)
+    current = start_date
+    while current <= end_date:
+        is_working_day = 1 if work_calendar.is_working_day(current) else 0
+        rows.append({
+            'calendar_id': work_calendar.id,
+            'day': current,
+            'ordinal': current.toordinal(),
+            'is_working_day': is_working_day,
+            'working_day_index': index,
+            'week_start': current - timedelta(days=current.weekday()),
+            'month': current.strftime('%Y-%m'),
+        })
+        index += is_working_day
+        current += timedelta(days=1)
+    return rows
+
+
+class CalendarNotReady(RuntimeError):
+    """Raised when calendar_days does not cover the phases (run rebuild_calendar_days.py)."""
+
+
+def _missing_ranges(db: Session, calendars: CalendarSet, start_date: date, end_date: date) -> List[tuple]:
+    """(calendar, start, end) ranges calendar_days lacks to cover whole years of [start_date, end_date]."""
+    start_date = date(start_date.year, 1, 1)
+    end_date = date(end_date.year, 12, 31)
+
+    spans = {
+        calendar_id: (first, last)
+        for calendar_id, first, last in db.query(
+            models.CalendarDay.calendar_id, func.min(models.CalendarDay.day), func.max(models.CalendarDay.day)
+        ).group_by(models.CalendarDay.calendar_id)
+    }
+
+    missing = []
+    for work_calendar in calendars:
+        if work_calendar.id not in spans:
+            missing.append((work_calendar, start_date, end_date))
+            continue
+        first, last = spans[work_calendar.id]
+        if start_date < first:
+            missing.append((work_calendar, start_date, first - timedelta(days=1)))
+        if end_date > last:
+            missing.append((work_calendar, last + timedelta(days=1), end_date))
+    return missing
+
+
+def ensure_calendar(db: Session, calendars: CalendarSet, start_date: date, end_date: date) -> int:
+    """
+    Extend calendar_days over [start_date, end_date] for every work calendar (caller commits).
+
+    Each calendar's rows are kept contiguous and extended by whole years at
+    either edge. Called from the schedule and calendar write paths, so the
+    forecast query only reads. Returns the number of rows inserted.
+    """
+    inserted = 0
+    for work_calendar, range_start, range_end in _missing_ranges(db, calendars, start_date, end_date):
+        rows = _calendar_rows(work_calendar, range_start, range_end)
+        db.bulk_insert_mappings(models.CalendarDay, rows)
+        inserted += len(rows)
+    return inserted
+
+
+def _phase_span(db: Session) -> tuple:
+    """(first start date, last end date) of all phases, (None, None) without phases."""
+    return db.query(func.min(models.SchedulePhase.start_date), func.max(models.SchedulePhase.end_date)).one()
+
+
+def cover_phase(db: Session, phase: models.SchedulePhase) -> None:
+    """Extend calendar_days over a created / moved phase (caller commits)."""
+    if phase.start_date and phase.end_date:
+        ensure_calendar(db, load_calendars(db), min(phase.start_date, phase.end_date),
+                        max(phase.start_date, phase.end_date))
+
+
+def rebuild_calendar_days(db: Session, calendar_id: Optional[int] = None) -> int:
+    """
+    Rebuild calendar_days after a calendar or holiday change (caller commits).
+
+    calendar_id None (company holidays / default calendar changed) rebuilds
+    every calendar. Rows cover every phase; returns the number inserted.
+    """
+    delete_calendar_days(db, calendar_id)
+    first, last = _phase_span(db)
+    if first is None:
+        return 0
+    return ensure_calendar(db, load_calendars(db), first, last)
+
+
+def delete_calendar_days(db: Session, calendar_id: Optional[int] = None) -> None:
+    """Drop the calendar_days rows of a calendar (every calendar if calendar_id is None; caller commits)."""
+    query = db.query(models.CalendarDay)
+    if calendar_id is not None:
+        query = query.filter(models.CalendarDay.calendar_id == calendar_id)
+    query.delete(synchronize_session=False)
+
+
+# ============================================
+# Forecast query
+# ============================================
+
+def _aggregate_query(
+    calendars: CalendarSet,
+    start_date: date,
+    end_date: date,
+    project_ids: Optional[List[int]],
+    crew_type_ids: Optional[List[int]],
+    subcontractor_names: Optional[List[str]]
+):
+    """Build the single aggregation query (grouped by week, month, crew type, project)."""
+    phase = models.SchedulePhase
+    project = models.Project
+    cal_start = aliased(models.CalendarDay)
+    cal_end = aliased(models.CalendarDay)
+    cal = aliased(models.CalendarDay)
+
+    # Total man-hours in cents: estimated hours, else crew size * 8 * calendar days
+    calendar_days = cal_end.ordinal - cal_start.ordinal + 1
+    has_hours = and_(phase.estimated_man_hours.isnot(None), phase.estimated_man_hours != 0)
+    total_cents = case(
+        (has_hours, cast(func.round(phase.estimated_man_hours * 100), Integer)),
+        else_=cast(func.round(phase.crew_size * 800), Integer) * calendar_days
+    )
+    working_days = cal_end.working_day_index + cal_end.is_working_day - cal_start.working_day_index
+    # The project's calendar, else the default (also for unknown ids, as CalendarSet.get)
+    calendar_id = case(
+        (project.work_calendar_id.in_([work_calendar.id for work_calendar in calendars]), project.work_calendar_id),
+        else_=calendars.default.id
+    )
+
+    phases = select(
+        phase.id.label('phase_id'),
+        phase.start_date,
+        phase.end_date,
+        phase.crew_type_id,
+        calendar_id.label('calendar_id'),
+        project.id.label('project_id'),
+        project.name.label('project_name'),
+        total_cents.label('total_cents'),
+        working_days.label('working_days'),
+    ).join(
+        models.ProjectSchedule, models.ProjectSchedule.id == phase.schedule_id
+    ).join(
+        project, project.id == models.ProjectSchedule.project_id
+    ).join(
+        cal_start, and_(cal_start.calendar_id == calendar_id, cal_start.day == phase.start_date)
+    ).join(
+        cal_end, and_(cal_end.calendar_id == calendar_id, cal_end.day == phase.end_date)
+    ).where(
+        project.status.in_(ProjectStatus.SCHEDULABLE),
+        phase.start_date <= end_date,
+        phase.end_date >= start_date,
+        or_(has_hours, and_(phase.crew_size.isnot(None), phase.crew_size != 0))
+    )
+
+    if project_ids:
+        phases = phases.where(project.id.in_(project_ids))
+
+    if crew_type_ids:
+        phases = phases.where(phase.crew_type_id.in_(crew_type_ids))
+
+    if subcontractor_names:
+        subquery = select(models.ProjectSubcontractor.project_id).where(
+            models.ProjectSubcontractor.subcontractor_name.in_(subcontractor_names)
+        ).distinct()
+        phases = phases.where(project.id.in_(subquery))
+
+    phases = phases.subquery('phases')
+
+    # Per-day cents with half-even rounding (matches Decimal.quantize)
+    quotient = phases.c.total_cents // phases.c.working_days
+    remainder = phases.c.total_cents - quotient * phases.c.working_days
+    daily_cents = quotient + case(
+        (2 * remainder > phases.c.working_days, 1),
+        (and_(2 * remainder == phases.c.working_days, quotient % 2 == 1), 1),
+        else_=0
+    )
+
+    return select(
+        cal.week_start,
+        cal.month,
+        phases.c.crew_type_id,
+        phases.c.project_id,
+        phases.c.project_name,
+        func.sum(daily_cents),
+    ).join(
+        cal, and_(
+            cal.calendar_id == phases.c.calendar_id,
+            cal.day >= phases.c.start_date,
+            cal.day <= phases.c.end_date,
+            cal.day >= start_date,
+            cal.day <= end_date,
+            cal.is_working_day == 1
+        )
+    ).where(
+        phases.c.working_days > 0
+    ).group_by(
+        cal.week_start, cal.month, phases.c.crew_type_id, phases.c.project_id, phases.c.project_name
+    )
+
+
+def _bucket_entries(buckets: Dict) -> List[tuple]:
+    """Sorted (key, cents, crew breakdown) from {key: [cents, {crew: cents}]}."""
+    return [
+        (key, cents_to_decimal(cents), {k: cents_to_decimal(v) for k, v in crews.items()})
+        for key, (cents, crews) in sorted(buckets.items())
+    ]
+
+
+def generate_forecast_sql(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    granularity: str = 'weekly',
+    project_ids: Optional[List[int]] = None,
+    crew_type_ids: Optional[List[int]] = None,
+    subcontractor_names: Optional[List[str]] = None
+) -> Dict:
+    """
+    Generate company-wide forecast with SQL-side aggregation.
+
+    Returns the same payload as services.manpower.generate_forecast. Read
+    only: raises CalendarNotReady if calendar_days does not cover every
+    phase (an existing database before rebuild_calendar_days.py).
+    """
+    calendars = load_calendars(db)
+    first, last = _phase_span(db)
+    if first is not None and _missing_ranges(db, calendars, first, last):
+        raise CalendarNotReady("calendar_days does not cover every phase; run rebuild_calendar_days.py")
+
+    weeks = {}
+    months = {}
+    project_totals = {}
+    project_names = {}
+
+    rows = db.execute(_aggregate_query(
+        calendars,
+        start_date, end_date, project_ids, crew_type_ids, subcontractor_names
+    )).all()
+
+    for week_start, month, crew_type_id, project_id, project_name, cents in rows:
+        for buckets, key in ((weeks, week_start), (months, month)):
+            entry = buckets.setdefault(key, [0, {}])
+            entry[0] += cents
+            if crew_type_id:
+                entry[1][crew_type_id] = entry[1].get(crew_type_id, 0) + cents
+        project_totals[project_id] = project_totals.get(project_id, 0) + cents
+        project_names[project_id] = project_name
+
+    weekly_forecast = []
+    monthly_forecast = []
+
+    if granularity in ['weekly', 'monthly']:
+        for week_start, hours, crew_breakdown in _bucket_entries(weeks):
+            year, week_num, _ = week_start.isocalendar()
+            weekly_forecast.append({
+                'week': f"{year}-W{week_num:02d}",
+                'week_start': week_start,
+                'man_hours': hours,
+                'crew_breakdown': crew_breakdown
+            })
+
+    if granularity == 'monthly':
+        for month, hours, crew_breakdown in _bucket_entries(months):
+            year, month_num = map(int, month.split('-'))
+            monthly_forecast.append({
+                'month': month,
+                'month_name': f"{calendar.month_name[month_num]} {year}",
+                'man_hours': hours,
+                'crew_breakdown': crew_breakdown
+            })
+
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'total_man_hours': float(cents_to_decimal(sum(project_totals.values()))),
+        'project_count': len(project_totals),
+        'weekly_forecast': weekly_forecast,
+        'monthly_forecast': monthly_forecast,
+        'projects_included': [
+            {'id': project_id, 'name': project_names[project_id], 'man_hours': float(cents_to_decimal(cents))}
+            for project_id, cents in sorted(project_totals.items(), key=lambda x: (-x[1], x[0]))
+        ]
+    }
@@ -0,0 +1,93 @@
+"""Subcontractor labor reports.
+
+One report feeds both the JSON endpoint (api/subcontractor_reports.py) and
+the PDF export (api/export_pdf.py). The assignments, their projects and
+the active schedules' phases are read in a single outer-joined query
+(projects without phases in the range still appear), and phase hours are
+the forecast engine's scheduled hours (per-working-day hours times the
+working days on the project's work calendar), so the report adds up to
+what the forecast shows for the same phases.
+
+Phases carry no labor type, so a project assigned to the subcontractor
+for several labor types is listed once with its labor types joined and
+its hours counted once.
+
+Reports are cached in-process per (subcontractor, date range, data
+version), like the company forecast; cached reports are shared between
+callers and must not be mutated.
+"""
+from typing import Dict, Optional
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.orm import Session
+import crud
+from config import settings
+from services.forecast_cache import ForecastCache, get_data_version
+from services.manpower import get_phase_scheduled_hours
+from services.work_calendar import load_calendars
+
+report_cache = ForecastCache(
+    max_entries=settings.forecast_cache_size,
+    ttl_seconds=settings.forecast_cache_ttl
+)
+
+
+def build_subcontractor_report(db: Session, subcontractor_name: str,
+                               start_date: Optional[date] = None,
+                               end_date: Optional[date] = None) -> Dict:
+    """Projects, phases and scheduled hours of a subcontractor (uncached)."""
+    calendars = load_calendars(db)
+    projects = {}
+    phase_ids = set()
+
+    rows = crud.get_subcontractor_phases(db, subcontractor_name, start_date, end_date)
+    for labor_type, project, phase in rows:
+        info = projects.get(project.id)
+        if info is None:
+            info = projects[project.id] = {
+                "project_id": project.id,
+                "project_name": project.name,
+                "project_number": project.project_number,
+                "labor_types": [],
+                "work_calendar_id": project.work_calendar_id,
+                "phases": [],
+                "total_project_hours": Decimal('0'),
+            }
+        if labor_type not in info["labor_types"]:
+            info["labor_types"].append(labor_type)
+        # Each phase comes once per labor type assigned to the project
+        if phase is None or phase.id in phase_ids:
+            continue
+        phase_ids.add(phase.id)
+
+        phase_hours = get_phase_scheduled_hours(phase, calendars.for_project(project))
+        info["total_project_hours"] += phase_hours
+        info["phases"].append({
+            "phase_name": phase.phase_name,
+            "start_date": phase.start_date,
+            "end_date": phase.end_date,
+            "man_hours": phase_hours
+        })
+
+    total_man_hours = Decimal('0')
+    projects_info = []
+    for info in projects.values():
+        info["labor_type"] = ", ".join(sorted(info.pop("labor_types")))
+        total_man_hours += info["total_project_hours"]
+        projects_info.append(info)
+
+    return {
+        "subcontractor_name": subcontractor_name,
+        "total_man_hours": total_man_hours,
+        "projects": projects_info
+    }
+
+
+def get_subcontractor_report(db: Session, subcontractor_name: str,
+                             start_date: Optional[date] = None,
+                             end_date: Optional[date] = None) -> Dict:
+    """Subcontractor report (cached per subcontractor, date range and data version)."""
+    key = (subcontractor_name, start_date, end_date, get_data_version(db))
+    return report_cache.get_or_compute(key, lambda: build_subcontractor_report(
+        db, subcontractor_name, start_date, end_date
+    ))
@@ -0,0 +1,168 @@
+"""Time-phased subcontractor utilization.
+
+Weekly hours and implied headcount of every subcontractor, by labor type,
+over a horizon of whole ISO weeks. Everything is computed in one pass:
+
+1. the phases of every project with a subcontractor assignment are reduced
+   to arrays and accumulated per project and day with the vectorized
+   forecast engine's difference arrays (masked with each project's work
+   calendar), then summed into weeks: a (projects x weeks) matrix of cents,
+2. the ProjectSubcontractor rows become an (assignments x projects)
+   weight matrix, so hours per (subcontractor, labor type) and week are a
+   single matrix product.
+
+Phases carry no labor type, so a project's hours go to each subcontractor
+assigned to it, split evenly between that subcontractor's labor types on
+the project, so each subcontractor counts it once. Implied
+headcount is weekly hours / (HOURS_PER_DAY * working days in the week on
+the default work calendar); assigned headcount sums ProjectSubcontractor
+headcount over the projects with load that week.
+"""
+from typing import Dict, Iterator, List, Optional
+from datetime import date, timedelta
+import numpy as np
+from sqlalchemy.orm import Session
+import crud
+from constants import HOURS_PER_DAY, DAYS_PER_WEEK
+from services.forecast_cache import get_data_version
+from services.manpower_vectorized import build_phase_arrays, clip_to_window, masked_load, window_buckets
+from services.subcontractor_report import report_cache
+from services.work_calendar import load_calendars
+
+DEFAULT_HORIZON_WEEKS = 52
+MAX_HORIZON_WEEKS = 104
+
+
+def horizon(start_date: date, weeks: int) -> tuple:
+    """(Monday on or before start_date, Sunday ending the last of weeks whole weeks)."""
+    monday = start_date - timedelta(days=start_date.weekday())
+    return monday, monday + timedelta(days=DAYS_PER_WEEK * weeks - 1)
+
+
+def _cents_to_hours(cents: np.ndarray) -> List[float]:
+    return (np.rint(cents) / 100).tolist()
+
+
+def _headcount(cents: np.ndarray, working_days: np.ndarray) -> List[float]:
+    """Implied headcount per week (0 in weeks without working days)."""
+    capacity = working_days * HOURS_PER_DAY * 100
+    headcount = np.divide(cents, capacity, out=np.zeros(cents.shape), where=capacity > 0)
+    return np.round(headcount, 2).tolist()
+
+
+def build_utilization(db: Session, start_date: date, weeks: int = DEFAULT_HORIZON_WEEKS,
+                      subcontractor_names: Optional[List[str]] = None) -> Dict:
+    """Weekly hours and headcount per subcontractor and labor type (uncached)."""
+    start_date, end_date = horizon(start_date, weeks)
+    num_days = (end_date - start_date).days + 1
+    calendars = load_calendars(db)
+
+    assignments = crud.get_subcontractor_assignments(db, subcontractor_names)
+    names = sorted({a.subcontractor_name for a in assignments})
+    phases = crud.get_active_phases_in_date_range(
+        db, start_date, end_date, subcontractor_names=names
+    ) if names else []
+
+    # Default-calendar working days per week (headcount denominator)
+    default_mask = window_buckets(start_date, num_days, [calendars.default])['working_mask'][0]
+    working_days = default_mask.reshape(weeks, DAYS_PER_WEEK).sum(axis=1)
+
+    # (projects x weeks) load in cents
+    arrays = build_phase_arrays(phases, calendars)
+    window = clip_to_window(arrays, start_date, end_date)
+    active = window['active']
+    project_ids = sorted(set(arrays['project_id'][active].tolist()))
+    project_columns = {project_id: i for i, project_id in enumerate(project_ids)}
+    project_weekly = np.zeros((len(project_ids), weeks), dtype=np.int64)
+    if project_ids:
+        mask = window_buckets(start_date, num_days, arrays['calendars'])['working_mask']
+        rows = np.array([project_columns[p] for p in arrays['project_id'][active].tolist()], dtype=np.int64)
+        project_daily = masked_load(
+            arrays['daily_cents'][active], window['offset_start'][active], window['offset_end'][active],
+            num_days, arrays['calendar_index'][active], mask, rows=rows, num_rows=len(project_ids)
+        )
+        project_weekly = project_daily.reshape(len(project_ids), weeks, DAYS_PER_WEEK).sum(axis=2)
+
+    # (assignments x projects) hour shares and headcounts
+    keys = sorted({(a.subcontractor_name, a.labor_type) for a in assignments})
+    key_rows = {key: i for i, key in enumerate(keys)}
+    labor_type_counts = {}
+    for a in assignments:
+        if a.project_id in project_columns:
+            labor_type_counts.setdefault((a.subcontractor_name, a.project_id), set()).add(a.labor_type)
+    shares = np.zeros((len(keys), len(project_ids)))
+    headcounts = np.zeros((len(keys), len(project_ids)))
+    for a in assignments:
+        column = project_columns.get(a.project_id)
+        if column is None:
+            continue
+        row = key_rows[(a.subcontractor_name, a.labor_type)]
+        shares[row, column] = 1 / len(labor_type_counts[(a.subcontractor_name, a.project_id)])
+        headcounts[row, column] += a.headcount or 0
+
+    hours = shares @ project_weekly
+    assigned = headcounts @ (project_weekly > 0)
+
+    subcontractors = []
+    for name in names:
+        rows = [key_rows[key] for key in keys if key[0] == name]
+        cents = np.rint(hours[rows]).sum(axis=0)
+        subcontractors.append({
+            'subcontractor_name': name,
+            'total_man_hours': round(float(np.rint(hours[rows]).sum()) / 100, 2),
+            'peak_headcount': max(_headcount(cents, working_days), default=0.0),
+            'weekly_hours': _cents_to_hours(cents),
+            'weekly_headcount': _headcount(cents, working_days),
+            'assigned_headcount': assigned[rows].sum(axis=0).tolist(),
+            'labor_types': [
+                {
+                    'labor_type': keys[row][1],
+                    'total_man_hours': round(float(np.rint(hours[row]).sum()) / 100, 2),
+                    'weekly_hours': _cents_to_hours(hours[row]),
+                    'weekly_headcount': _headcount(np.rint(hours[row]), working_days),
+                    'assigned_headcount': assigned[row].tolist(),
+                }
+                for row in rows
+            ],
+        })
+
+    week_starts = [start_date + timedelta(days=DAYS_PER_WEEK * i) for i in range(weeks)]
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'weeks': [
+            {
+                'week': "{}-W{:02d}".format(*week_start.isocalendar()[:2]),
+                'week_start': week_start,
+                'working_days': int(days),
+            }
+            for week_start, days in zip(week_starts, working_days)
+        ],
+        'subcontractors': subcontractors,
+    }
+
+
+def get_utilization(db: Session, start_date: date, weeks: int = DEFAULT_HORIZON_WEEKS,
+                    subcontractor_names: Optional[List[str]] = None) -> Dict:
+    """Subcontractor utilization (cached per horizon, subcontractors and data version)."""
+    names = tuple(sorted(set(subcontractor_names))) if subcontractor_names else None
+    key = ('utilization', horizon(start_date, weeks), names, get_data_version(db))
+    return report_cache.get_or_compute(key, lambda: build_utilization(
+        db, start_date, weeks, subcontractor_names
+    ))
+
+
+def utilization_rows(utilization: Dict) -> Iterator[list]:
+    """Header plus one row per subcontractor, labor type and week (CSV / XLSX)."""
+    yield ['Subcontractor', 'Labor Type', 'Week', 'Week Start', 'Working Days',
+           'Man Hours', 'Headcount', 'Assigned Headcount']
+    for sub in utilization['subcontractors']:
+        for labor in sub['labor_types']:
+            for week, hours, headcount, assigned in zip(
+                utilization['weeks'], labor['weekly_hours'],
+                labor['weekly_headcount'], labor['assigned_headcount']
+            ):
+                yield [
+                    sub['subcontractor_name'], labor['labor_type'], week['week'], week['week_start'],
+                    week['working_days'], hours, headcount, assigned
+                ]
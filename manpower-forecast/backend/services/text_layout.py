@@ -0,0 +1,97 @@
+"""Text measurement and fitting for the PDF exports.
+
+ReportLab's stringWidth re-encodes the text and looks every glyph up on
+each call, and the row layout calls it many times per row (name wrapping,
+tag badges, truncation). Here each font gets a glyph width table (integer
+widths in 1/1000 em, filled on first use per character), so a width is a
+sum of dict lookups. It is the same sum ReportLab computes, so results are
+identical.
+
+Truncation binary-searches the prefix widths instead of re-measuring the
+text once per dropped character. Fitting results are memoized on
+(text, font, size, width); the cache lives for the process, so warm
+render workers reuse it across exports.
+"""
+from typing import Dict, Tuple
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from reportlab.pdfbase import pdfmetrics
+
+ELLIPSIS = '..'
+LAYOUT_CACHE_SIZE = 8192
+
+
+class _GlyphWidths(dict):
+    """Character -> width in 1/1000 em for one font (measured on first use)."""
+
+    def __init__(self, font_name: str):
+        super().__init__()
+        self.font_name = font_name
+
+    def __missing__(self, char: str) -> int:
+        width = round(pdfmetrics.stringWidth(char, self.font_name, 1000))
+        self[char] = width
+        return width
+
+
+_glyph_tables: Dict[str, _GlyphWidths] = {}
+
+
+def glyph_widths(font_name: str) -> _GlyphWidths:
+    table = _glyph_tables.get(font_name)
+    if table is None:
+        table = _glyph_tables.setdefault(font_name, _GlyphWidths(font_name))
+    return table
+
+
+def string_width(text: str, font_name: str, font_size: float) -> float:
+    """Width of text in points (same value as canvas.stringWidth)."""
+    table = glyph_widths(font_name)
+    return sum(map(table.__getitem__, text)) * 0.001 * font_size
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def truncate(text: str, font_name: str, font_size: float, max_width: float) -> str:
+    """
+    text if it fits in max_width, else its longest prefix (at least one
+    character) that fits with '..' appended.
+    """
+    if string_width(text, font_name, font_size) <= max_width:
+        return text
+    table = glyph_widths(font_name)
+    # Prefix widths are non-decreasing, so the longest fitting prefix is a bisection
+    budget = max_width / (0.001 * font_size) - sum(map(table.__getitem__, ELLIPSIS))
+    prefix_widths = list(accumulate(map(table.__getitem__, text)))
+    length = max(bisect_right(prefix_widths, budget), 1)
+    # Float guard: settle on the exact width formula at the boundary
+    while length > 1 and string_width(text[:length] + ELLIPSIS, font_name, font_size) > max_width:
+        length -= 1
+    while length < len(text) and string_width(text[:length + 1] + ELLIPSIS, font_name, font_size) <= max_width:
+        length += 1
+    return text[:length] + ELLIPSIS
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def wrap_two_lines(text: str, font_name: str, font_size: float, max_width: float) -> Tuple[str, str]:
+    """
+    Split text into (line1, line2): words are added to line 1 while they
+    fit and every word that does not fit goes to line 2 (unbounded, see
+    truncate).
+    """
+    line1 = ""
+    line2_words = []
+    for word in text.split():
+        test = (line1 + " " + word) if line1 else word
+        if string_width(test, font_name, font_size) <= max_width:
+            line1 = test
+        else:
+            line2_words.append(word)
+    return line1, " ".join(line2_words)
+
+
+def clear_layout_cache() -> None:
+    """Forget memoized layouts and glyph tables (e.g. after registering fonts)."""
+    truncate.cache_clear()
+    wrap_two_lines.cache_clear()
+    _glyph_tables.clear()
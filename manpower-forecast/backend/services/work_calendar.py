@@ -0,0 +1,197 @@
+"""Work calendars (working weekdays + holidays).
+
+A BusinessCalendar answers "is this a working day" and "how many working
+days are in [A, B]" in O(log holidays): working_days_before(day) is a
+closed-form weekmask count minus a bisect over the sorted holiday list, so
+counting working days between two dates is a subtraction of two lookups.
+
+Calendars come from the work_calendars / calendar_holidays tables:
+
+- each project may point at a calendar (e.g. a 6-day week for out-of-town
+  jobs); projects without one use the default calendar,
+- holidays with no calendar are company holidays and apply to every
+  calendar that includes company holidays,
+- with no rows at all, the standard Mon-Fri calendar without holidays is
+  used (the original behaviour).
+"""
+from typing import List, Dict, Optional, Iterable
+from datetime import date, timedelta
+from bisect import bisect_left
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+import models
+
+STANDARD_WEEKMASK = "1111100"  # Mon..Sun, 1 = working day
+STANDARD_CALENDAR_ID = 0  # Key of the built-in calendar (no work_calendars row)
+
+_SESSION_KEY = 'work_calendars'
+
+
+def validate_weekmask(weekmask: str) -> str:
+    """Check a 7-character Mon..Sun mask of 0/1 with at least one working day."""
+    if len(weekmask) != 7 or set(weekmask) - {'0', '1'} or '1' not in weekmask:
+        raise ValueError("weekmask must be 7 characters of 0/1 (Mon..Sun) with at least one working day")
+    return weekmask
+
+
+class BusinessCalendar:
+    """Working weekdays plus holidays, with O(log holidays) working-day counts."""
+
+    def __init__(self, weekmask: str = STANDARD_WEEKMASK, holidays: Iterable[date] = (),
+                 calendar_id: int = STANDARD_CALENDAR_ID, name: str = "Standard (Mon-Fri)"):
+        self.id = calendar_id
+        self.name = name
+        self.weekmask = validate_weekmask(weekmask)
+        self._mask = [int(c) for c in weekmask]
+        # _week_prefix[k] = working weekdays among the first k days of a week
+        self._week_prefix = [0]
+        for flag in self._mask:
+            self._week_prefix.append(self._week_prefix[-1] + flag)
+        self.days_per_week = self._week_prefix[-1]
+        # Only holidays that fall on working weekdays change the counts
+        self.holidays = sorted({
+            h.toordinal() for h in holidays if self._mask[h.weekday()]
+        })
+        self._holiday_set = set(self.holidays)
+        self._busdaycalendar = None
+
+    def is_working_day(self, day: date) -> bool:
+        return bool(self._mask[day.weekday()]) and day.toordinal() not in self._holiday_set
+
+    def working_days_before(self, day: date) -> int:
+        """Number of working days strictly before day, counted from 0001-01-01 (a Monday)."""
+        ordinal = day.toordinal()
+        days = ordinal - 1
+        weekdays = (days // 7) * self.days_per_week + self._week_prefix[days % 7]
+        return weekdays - bisect_left(self.holidays, ordinal)
+
+    def count_working_days(self, start_date: date, end_date: date) -> int:
+        """Working days in [start_date, end_date] (inclusive)."""
+        if end_date < start_date:
+            return 0
+        return self.working_days_before(end_date + timedelta(days=1)) - self.working_days_before(start_date)
+
+    def working_days(self, start_date: date, end_date: date) -> List[date]:
+        """List the working days in [start_date, end_date] (inclusive)."""
+        days = []
+        current = start_date
+        while current <= end_date:
+            if self.is_working_day(current):
+                days.append(current)
+            current += timedelta(days=1)
+        return days
+
+    def busdaycalendar(self):
+        """numpy.busdaycalendar equivalent of this calendar (built once)."""
+        if self._busdaycalendar is None:
+            import numpy as np
+            self._busdaycalendar = np.busdaycalendar(
+                weekmask=self.weekmask,
+                holidays=[date.fromordinal(h) for h in self.holidays]
+            )
+        return self._busdaycalendar
+
+    def __getstate__(self):
+        # Calendars are pickled into render workers; the numpy calendar is rebuilt on demand
+        state = self.__dict__.copy()
+        state['_busdaycalendar'] = None
+        return state
+
+    def __repr__(self):
+        return f"BusinessCalendar(id={self.id}, weekmask={self.weekmask!r}, holidays={len(self.holidays)})"
+
+
+STANDARD_CALENDAR = BusinessCalendar()
+
+
+class CalendarSet:
+    """Calendars by id plus the default used for projects without one."""
+
+    def __init__(self, calendars: Optional[Dict[int, BusinessCalendar]] = None,
+                 default: BusinessCalendar = STANDARD_CALENDAR):
+        self.calendars = dict(calendars or {})
+        self.default = default
+        self.calendars.setdefault(default.id, default)
+
+    def get(self, calendar_id: Optional[int]) -> BusinessCalendar:
+        """Calendar by id (default calendar for None or unknown ids)."""
+        if calendar_id is None:
+            return self.default
+        return self.calendars.get(calendar_id, self.default)
+
+    def for_project(self, project: models.Project) -> BusinessCalendar:
+        return self.get(project.work_calendar_id)
+
+    def for_phase(self, phase: models.SchedulePhase) -> BusinessCalendar:
+        return self.for_project(phase.schedule.project)
+
+    def __iter__(self):
+        return iter(self.calendars.values())
+
+
+STANDARD_CALENDARS = CalendarSet()
+
+
+def build_calendars(db: Session) -> CalendarSet:
+    """Load every work calendar and its holidays from the database."""
+    calendar_rows = db.query(models.WorkCalendar).all()
+    if not calendar_rows and not db.query(models.CalendarHoliday.id).first():
+        return STANDARD_CALENDARS
+
+    company_holidays = []
+    calendar_holidays = {}
+    for holiday in db.query(models.CalendarHoliday).all():
+        if holiday.calendar_id is None:
+            company_holidays.append(holiday.holiday_date)
+        else:
+            calendar_holidays.setdefault(holiday.calendar_id, []).append(holiday.holiday_date)
+
+    calendars = {}
+    default = BusinessCalendar(holidays=company_holidays)
+    for row in calendar_rows:
+        holidays = list(calendar_holidays.get(row.id, []))
+        if row.include_company_holidays:
+            holidays += company_holidays
+        calendars[row.id] = BusinessCalendar(row.weekmask, holidays, calendar_id=row.id, name=row.name)
+        if row.is_default:
+            default = calendars[row.id]
+    return CalendarSet(calendars, default)
+
+
+def load_calendars(db: Optional[Session]) -> CalendarSet:
+    """
+    Calendars for this session (loaded once per session, e.g. per request).
+
+    Returns the standard Mon-Fri calendars when there is no session.
+    """
+    if db is None:
+        return STANDARD_CALENDARS
+    calendars = db.info.get(_SESSION_KEY)
+    if calendars is None:
+        calendars = build_calendars(db)
+        db.info[_SESSION_KEY] = calendars
+    return calendars
+
+
+def project_ids_on_calendar(db: Session, calendar_id: Optional[int] = None) -> List[int]:
+    """
+    IDs of the projects scheduled on a work calendar.
+
+    calendar_id None (company holidays / default calendar changed) returns
+    every project; the default calendar includes projects without one.
+    """
+    query = db.query(models.Project.id)
+    if calendar_id is not None:
+        if load_calendars(db).default.id == calendar_id:
+            query = query.filter(or_(
+                models.Project.work_calendar_id == calendar_id,
+                models.Project.work_calendar_id.is_(None)
+            ))
+        else:
+            query = query.filter(models.Project.work_calendar_id == calendar_id)
+    return [project_id for (project_id,) in query.all()]
+
+
+def invalidate_calendars(db: Session) -> None:
+    """Drop the session's cached calendars (after calendar or holiday writes)."""
+    db.info.pop(_SESSION_KEY, None)
@@ -15,7 +15,9 @@ import type {
   CrewType,
   CrewTypeCreate,
   ManpowerForecast,
-  ForecastFilters
+  ForecastFilters,
+  GanttFilters,
+  GanttTimeline
 } from './types';
 import { API_BASE_URL, STORAGE_KEYS } from './config';
 
@@ -186,6 +188,26 @@ export const exportApi = {
   }
 };
 
+// ============================================
+// Gantt
+// ============================================
+
+export const ganttApi = {
+  /** Rows offset..offset+limit of the company Gantt (sorted by project name). */
+  rows: (filters: GanttFilters, offset: number, limit: number) => {
+    const params: any = { ...filters, offset, limit };
+
+    if (filters.project_ids && filters.project_ids.length > 0) {
+      params.project_ids = filters.project_ids.join(',');
+    }
+    if (filters.subcontractor_names && filters.subcontractor_names.length > 0) {
+      params.subcontractor_names = filters.subcontractor_names.join(',');
+    }
+
+    return api.get<GanttTimeline>('/api/gantt/', { params });
+  },
+};
+
 // ============================================
 // Subcontractor Reports
 // ============================================
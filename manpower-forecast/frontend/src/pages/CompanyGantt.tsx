@@ -1,55 +1,126 @@
-import { useState, useEffect, useMemo } from 'react'
-import { projectsApi } from '../api'
-import type { Project } from '../types'
+import { useState, useEffect, useMemo, useCallback, useRef } from 'react'
+import { ganttApi } from '../api'
+import type { GanttColumns, GanttFilters } from '../types'
 import { format, eachMonthOfInterval, differenceInDays, addMonths, startOfMonth, endOfMonth, parseISO } from 'date-fns'
 
+const ROW_HEIGHT = 64 // px, matches h-16
+const PAGE_SIZE = 100 // rows per /api/gantt request
+const OVERSCAN = 10 // rows rendered above and below the viewport
+
+// Trade tags sent by the API -> badge
+const TAG_BADGES: Record<string, { label: string; className: string }> = {
+    AWS: { label: 'AWS', className: 'bg-purple-100 text-purple-800 border border-purple-200' },
+    M: { label: 'M', className: 'bg-orange-100 text-orange-800' },
+    E: { label: 'E', className: 'bg-yellow-100 text-yellow-800' },
+    V: { label: 'VESDA', className: 'bg-pink-100 text-pink-800' },
+}
+
+interface GanttRow {
+    project_id: number
+    name: string
+    project_number: string | null
+    status: string
+    start_date: string
+    end_date: string
+    bar_start: string
+    bar_end: string
+    duration: number
+    tags: string[]
+}
+
+function toRows(columns: GanttColumns): GanttRow[] {
+    return columns.project_id.map((projectId, i) => ({
+        project_id: projectId,
+        name: columns.name[i],
+        project_number: columns.project_number[i],
+        status: columns.status[i],
+        start_date: columns.start_date[i],
+        end_date: columns.end_date[i],
+        bar_start: columns.bar_start[i],
+        bar_end: columns.bar_end[i],
+        duration: columns.duration[i],
+        tags: columns.tags[i],
+    }))
+}
+
 export default function CompanyGantt() {
-    const [projects, setProjects] = useState<Project[]>([])
+    const [timeline, setTimeline] = useState<{ start: Date; end: Date; totalRows: number } | null>(null)
+    const [rows, setRows] = useState<Map<number, GanttRow>>(new Map()) // row index -> row
     const [loading, setLoading] = useState(true)
     const [filterStatus, setFilterStatus] = useState<string>('all') // all, active, prospective
     const [filterType, setFilterType] = useState<string>('all') // all, mechanical, electrical, vesda
     const [awsFilter, setAwsFilter] = useState<'all' | 'aws' | 'standard'>('all')
+    const [scrollTop, setScrollTop] = useState(0)
+    const [viewportHeight, setViewportHeight] = useState(0)
+    const bodyRef = useRef<HTMLDivElement>(null)
+    const requestedPages = useRef<Set<number>>(new Set())
+    const generation = useRef(0) // Bumped on filter change so late responses are dropped
 
-    useEffect(() => {
-        loadProjects()
-    }, [])
+    const filters = useMemo<GanttFilters>(() => ({
+        status: filterStatus === 'all' ? undefined : filterStatus as GanttFilters['status'],
+        trade: filterType === 'all' ? undefined : filterType as GanttFilters['trade'],
+        aws: awsFilter === 'all' ? undefined : awsFilter,
+    }), [filterStatus, filterType, awsFilter])
 
-    const loadProjects = async () => {
+    const loadPage = useCallback(async (page: number) => {
+        if (requestedPages.current.has(page)) return
+        requestedPages.current.add(page)
+        const current = generation.current
         try {
-            setLoading(true)
-            const response = await projectsApi.list()
-            setProjects(response.data)
+            const response = await ganttApi.rows(filters, page * PAGE_SIZE, PAGE_SIZE)
+            if (current !== generation.current) return
+            const { timeline_start, timeline_end, total_rows, columns } = response.data
+            setTimeline({ start: parseISO(timeline_start), end: parseISO(timeline_end), totalRows: total_rows })
+            setRows(previous => {
+                const next = new Map(previous)
+                toRows(columns).forEach((row, i) => next.set(page * PAGE_SIZE + i, row))
+                return next
+            })
         } catch (error) {
-            console.error('Failed to load projects:', error)
+            requestedPages.current.delete(page)
+            console.error('Failed to load Gantt rows:', error)
         } finally {
-            setLoading(false)
+            if (current === generation.current) setLoading(false)
         }
-    }
-
-    // Filter projects
-    const filteredProjects = useMemo(() => {
-        return projects.filter(p => {
-            // Filter out projects with no dates
-            if (!p.start_date || !p.end_date) return false
+    }, [filters])
 
-            if (filterStatus !== 'all' && p.status !== filterStatus) return false
+    // Filters changed: start over from the first page
+    useEffect(() => {
+        generation.current += 1
+        requestedPages.current = new Set()
+        setRows(new Map())
+        setTimeline(null)
+        setLoading(true)
+        setScrollTop(0)
+        if (bodyRef.current) bodyRef.current.scrollTop = 0
+        loadPage(0)
+    }, [loadPage])
 
-            // Filter by type
-            if (filterType === 'mechanical' && !p.is_mechanical) return false
-            if (filterType === 'electrical' && !p.is_electrical) return false
-            if (filterType === 'vesda' && !p.is_vesda) return false
+    // Track the viewport height of the scrollable body
+    useEffect(() => {
+        const body = bodyRef.current
+        if (!body) return
+        const update = () => setViewportHeight(body.clientHeight)
+        update()
+        window.addEventListener('resize', update)
+        return () => window.removeEventListener('resize', update)
+    }, [])
 
-            // Filter by AWS
-            if (awsFilter === 'aws' && !p.is_aws) return false
-            if (awsFilter === 'standard' && p.is_aws) return false
+    // Rows to render: the viewport plus overscan
+    const totalRows = timeline?.totalRows ?? 0
+    const firstRow = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN)
+    const lastRow = Math.min(totalRows, Math.ceil((scrollTop + viewportHeight) / ROW_HEIGHT) + OVERSCAN)
 
-            return true
-        })
-    }, [projects, filterStatus, filterType, awsFilter])
+    // Fetch the pages behind them
+    useEffect(() => {
+        for (let page = Math.floor(firstRow / PAGE_SIZE); page * PAGE_SIZE < lastRow; page++) {
+            loadPage(page)
+        }
+    }, [firstRow, lastRow, loadPage])
 
-    // Calculate timeline range
+    // Timeline range (the server's covers every matching row, not just the loaded ones)
     const { minDate, maxDate, months } = useMemo(() => {
-        if (filteredProjects.length === 0) {
+        if (!timeline || timeline.totalRows === 0) {
             const now = new Date()
             return {
                 minDate: startOfMonth(now),
@@ -58,23 +129,11 @@ export default function CompanyGantt() {
             }
         }
 
-        let min = parseISO(filteredProjects[0].start_date!)
-        let max = parseISO(filteredProjects[0].end_date!)
-
-        filteredProjects.forEach(p => {
-            const start = parseISO(p.start_date!)
-            const end = parseISO(p.end_date!)
-            if (start < min) min = start
-            if (end > max) max = end
-        })
-
-        // Add some buffer
-        min = startOfMonth(min)
-        max = endOfMonth(max)
-
+        const min = startOfMonth(timeline.start)
+        const max = endOfMonth(timeline.end)
         const monthsArr = eachMonthOfInterval({ start: min, end: max })
         return { minDate: min, maxDate: max, months: monthsArr }
-    }, [filteredProjects])
+    }, [timeline])
 
     // Chart Dimensions
     const MONTH_WIDTH = 100 // px
@@ -96,7 +155,10 @@ export default function CompanyGantt() {
         }
     }
 
-    if (loading) return <div className="text-center py-12">Loading chart...</div>
+    const visibleRows: number[] = []
+    for (let index = firstRow; index < lastRow; index++) {
+        visibleRows.push(index)
+    }
 
     return (
         <div className="space-y-6">
@@ -183,64 +245,86 @@ export default function CompanyGantt() {
                     </div>
                 </div>
 
-                {/* Scrollable Body */}
-                <div className="flex-1 overflow-y-auto overflow-x-hidden relative">
-                    {filteredProjects.length === 0 ? (
+                {/* Scrollable Body (only the rows in view are rendered) */}
+                <div
+                    ref={bodyRef}
+                    className="flex-1 overflow-y-auto overflow-x-hidden relative"
+                    onScroll={e => setScrollTop(e.currentTarget.scrollTop)}
+                >
+                    {loading ? (
+                        <div className="text-center py-12">Loading chart...</div>
+                    ) : totalRows === 0 ? (
                         <div className="p-8 text-center text-gray-500">No projects found for the selected filter with valid dates.</div>
                     ) : (
-                        filteredProjects.map((project, index) => (
-                            <div key={project.id} className={`flex border-b border-gray-100 hover:bg-gray-50 transition-colors ${index % 2 === 0 ? 'bg-white' : 'bg-gray-50/50'}`}>
-                                {/* Left Column (Stickyish visual effect handled by structure) */}
-                                <div className="w-64 flex-none p-4 border-r border-gray-200 bg-inherit flex flex-col justify-center relative z-10">
-                                    <div className="font-medium text-gray-900 truncate" title={project.name}>{project.name}</div>
-                                    <div className="flex items-center space-x-2 mt-1">
-                                        <span className="text-xs text-gray-500 font-mono">{project.project_number || 'No #'}</span>
-                                        <div className="flex space-x-1">
-                                            {project.is_aws && <span className="text-[10px] uppercase bg-purple-100 text-purple-800 px-1 rounded border border-purple-200">AWS</span>}
-                                            {project.is_mechanical && <span className="text-[10px] uppercase bg-orange-100 text-orange-800 px-1 rounded">M</span>}
-                                            {project.is_electrical && <span className="text-[10px] uppercase bg-yellow-100 text-yellow-800 px-1 rounded">E</span>}
-                                            {project.is_vesda && <span className="text-[10px] uppercase bg-pink-100 text-pink-800 px-1 rounded">VESDA</span>}
+                        <div className="relative" style={{ height: totalRows * ROW_HEIGHT }}>
+                            {visibleRows.map(index => {
+                                const project = rows.get(index)
+                                return (
+                                    <div
+                                        key={index}
+                                        className={`absolute inset-x-0 flex border-b border-gray-100 hover:bg-gray-50 transition-colors ${index % 2 === 0 ? 'bg-white' : 'bg-gray-50/50'}`}
+                                        style={{ top: index * ROW_HEIGHT, height: ROW_HEIGHT }}
+                                    >
+                                        {/* Left Column (Stickyish visual effect handled by structure) */}
+                                        <div className="w-64 flex-none p-4 border-r border-gray-200 bg-inherit flex flex-col justify-center relative z-10">
+                                            {project ? (
+                                                <>
+                                                    <div className="font-medium text-gray-900 truncate" title={project.name}>{project.name}</div>
+                                                    <div className="flex items-center space-x-2 mt-1">
+                                                        <span className="text-xs text-gray-500 font-mono">{project.project_number || 'No #'}</span>
+                                                        <div className="flex space-x-1">
+                                                            {project.tags.map(tag => (
+                                                                <span key={tag} className={`text-[10px] uppercase px-1 rounded ${TAG_BADGES[tag]?.className ?? 'bg-gray-100 text-gray-800'}`}>
+                                                                    {TAG_BADGES[tag]?.label ?? tag}
+                                                                </span>
+                                                            ))}
+                                                        </div>
+                                                    </div>
+                                                </>
+                                            ) : (
+                                                <div className="h-4 w-40 bg-gray-100 rounded animate-pulse" />
+                                            )}
                                         </div>
-                                    </div>
-                                </div>
-
-                                {/* Gantt Bar Area */}
-                                <div className="flex-1 relative h-16 bg-inherit">
-                                    {/* Grid Lines Overlay */}
-                                    <div className="absolute inset-0 flex pointer-events-none">
-                                        {months.map(month => (
-                                            <div
-                                                key={`grid-${month.toString()}`}
-                                                className="flex-none border-r border-gray-100 h-full"
-                                                style={{ width: `${100 / months.length}%` }}
-                                            />
-                                        ))}
-                                    </div>
 
-                                    {/* The Bar */}
-                                    <div className="absolute inset-x-0 h-full flex items-center px-2 pointer-events-none">
-                                        {project.start_date && project.end_date && (
-                                            <div
-                                                className={`h-8 rounded-lg shadow-sm border border-opacity-20 flex items-center px-3 relative group transition-all hover:h-10 hover:shadow-md cursor-pointer pointer-events-auto ${project.status === 'active'
-                                                    ? 'bg-blue-100 border-blue-300'
-                                                    : 'bg-purple-100 border-purple-300'
-                                                    }`}
-                                                style={getPositionStyle(project.start_date, project.end_date)}
-                                                title={`${project.name}: ${project.start_date} to ${project.end_date}`}
-                                            >
-                                                <div className={`h-full absolute left-0 top-0 rounded-l-lg ${project.status === 'active' ? 'bg-blue-500 w-1.5' : 'bg-purple-500 w-1.5'
-                                                    }`}
-                                                />
-                                                <span className={`text-xs font-semibold whitespace-nowrap overflow-hidden text-ellipsis ml-2 ${project.status === 'active' ? 'text-blue-800' : 'text-purple-800'
-                                                    }`}>
-                                                    {project.name} ({differenceInDays(parseISO(project.end_date), parseISO(project.start_date))} days)
-                                                </span>
+                                        {/* Gantt Bar Area */}
+                                        <div className="flex-1 relative h-full bg-inherit">
+                                            {/* Grid Lines Overlay */}
+                                            <div className="absolute inset-0 flex pointer-events-none">
+                                                {months.map(month => (
+                                                    <div
+                                                        key={`grid-${month.toString()}`}
+                                                        className="flex-none border-r border-gray-100 h-full"
+                                                        style={{ width: `${100 / months.length}%` }}
+                                                    />
+                                                ))}
                                             </div>
-                                        )}
+
+                                            {/* The Bar */}
+                                            {project && (
+                                                <div className="absolute inset-x-0 h-full flex items-center px-2 pointer-events-none">
+                                                    <div
+                                                        className={`h-8 rounded-lg shadow-sm border border-opacity-20 flex items-center px-3 relative group transition-all hover:h-10 hover:shadow-md cursor-pointer pointer-events-auto ${project.status === 'active'
+                                                            ? 'bg-blue-100 border-blue-300'
+                                                            : 'bg-purple-100 border-purple-300'
+                                                            }`}
+                                                        style={getPositionStyle(project.bar_start, project.bar_end)}
+                                                        title={`${project.name}: ${project.start_date} to ${project.end_date}`}
+                                                    >
+                                                        <div className={`h-full absolute left-0 top-0 rounded-l-lg ${project.status === 'active' ? 'bg-blue-500 w-1.5' : 'bg-purple-500 w-1.5'
+                                                            }`}
+                                                        />
+                                                        <span className={`text-xs font-semibold whitespace-nowrap overflow-hidden text-ellipsis ml-2 ${project.status === 'active' ? 'text-blue-800' : 'text-purple-800'
+                                                            }`}>
+                                                            {project.name} ({project.duration} days)
+                                                        </span>
+                                                    </div>
+                                                </div>
+                                            )}
+                                        </div>
                                     </div>
-                                </div>
-                            </div>
-                        ))
+                                )
+                            })}
+                        </div>
                     )}
                 </div>
             </div>
@@ -267,6 +267,51 @@ export interface ForecastFilters {
   granularity?: 'weekly' | 'monthly' | 'daily';
 }
 
+// ============================================
+// Gantt
+// ============================================
+
+/** One array per column; the n-th entry of every array belongs to the n-th row. */
+export interface GanttColumns {
+  project_id: number[];
+  name: string[];
+  project_number: (string | null)[];
+  status: string[];
+  start_date: string[];
+  end_date: string[];
+  bar_start: string[];  // start_date / end_date clipped to the date window
+  bar_end: string[];
+  duration: number[];
+  bfpe_sprinkler_headcount: number[];
+  bfpe_vesda_headcount: number[];
+  bfpe_electrical_headcount: number[];
+  sprinkler_sub: string[];
+  vesda_sub: string[];
+  electrical_sub: string[];
+  tags: string[][];  // AWS, M, E, V
+  is_out_of_town: boolean[];
+}
+
+export interface GanttTimeline {
+  as_of: string;
+  timeline_start: string;
+  timeline_end: string;
+  total_rows: number;
+  offset: number;
+  limit: number;
+  columns: GanttColumns;
+}
+
+export interface GanttFilters {
+  status?: 'active' | 'prospective';
+  trade?: 'mechanical' | 'electrical' | 'vesda';
+  aws?: 'aws' | 'standard';
+  project_ids?: number[];
+  subcontractor_names?: string[];
+  start_date?: string;
+  end_date?: string;
+}
+
 // ============================================
 // API Error Types
 // ============================================